@@ -0,0 +1,27 @@
+"""add volunteer created_at id index
+
+Revision ID: 3c5e1f7a9b2d
+Revises: a879d6c0610f
+Create Date: 2026-10-17 09:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c5e1f7a9b2d'
+down_revision: Union[str, None] = 'a879d6c0610f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Backs keyset pagination on GET /volunteers/ (ORDER BY created_at, id)
+    op.create_index('ix_volunteer_created_at_id', 'volunteer', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_volunteer_created_at_id', table_name='volunteer')
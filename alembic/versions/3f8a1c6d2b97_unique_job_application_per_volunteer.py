@@ -0,0 +1,36 @@
+"""unique job application per volunteer
+
+Revision ID: 3f8a1c6d2b97
+Revises: e41b9d7c3a05
+Create Date: 2026-10-17 16:20:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a1c6d2b97'
+down_revision: Union[str, None] = 'e41b9d7c3a05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # job_application is created by create_all; a fresh database gets the index from the model
+    if not sa.inspect(op.get_bind()).has_table('job_application'):
+        return
+    # Keep the first application of every duplicated pair. The derived table lets
+    # MySQL delete from the table the subquery reads.
+    op.execute(
+        "DELETE FROM job_application WHERE id NOT IN ("
+        "SELECT id FROM (SELECT MIN(id) AS id FROM job_application GROUP BY job_id, volunteer_id) AS first_application)"
+    )
+    op.create_index('ix_job_application_job_id_volunteer_id', 'job_application', ['job_id', 'volunteer_id'], unique=True)
+
+
+def downgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table('job_application'):
+        op.drop_index('ix_job_application_job_id_volunteer_id', table_name='job_application')
@@ -0,0 +1,29 @@
+"""add volunteer fulltext index
+
+Revision ID: 6d2f8a4c1e90
+Revises: 3c5e1f7a9b2d
+Create Date: 2026-10-17 10:41:07.215634
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d2f8a4c1e90'
+down_revision: Union[str, None] = '3c5e1f7a9b2d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Backs the `q` search on /volunteers/ and /volunteer/search (MATCH ... AGAINST)
+    if op.get_bind().dialect.name == 'mysql':
+        op.create_index('ix_volunteer_name_email_fulltext', 'volunteer', ['name', 'email'], unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'mysql':
+        op.drop_index('ix_volunteer_name_email_fulltext', table_name='volunteer')
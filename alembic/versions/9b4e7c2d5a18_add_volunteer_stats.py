@@ -0,0 +1,36 @@
+"""add volunteer_stats summary table
+
+Revision ID: 9b4e7c2d5a18
+Revises: 6d2f8a4c1e90
+Create Date: 2026-10-17 11:58:44.870312
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4e7c2d5a18'
+down_revision: Union[str, None] = '6d2f8a4c1e90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('volunteer_stats',
+        sa.Column('dimension', sa.String(length=20), nullable=False),
+        sa.Column('key_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('dimension', 'key_id')
+    )
+    # Seed the counters so the dashboard is correct right after the upgrade
+    op.execute("INSERT INTO volunteer_stats (dimension, key_id, count) SELECT 'total', 0, COUNT(*) FROM volunteer")
+    op.execute("INSERT INTO volunteer_stats (dimension, key_id, count) SELECT 'status', COALESCE(status_id, 0), COUNT(*) FROM volunteer GROUP BY COALESCE(status_id, 0)")
+    op.execute("INSERT INTO volunteer_stats (dimension, key_id, count) SELECT 'squad', COALESCE(squad_id, 0), COUNT(*) FROM volunteer GROUP BY COALESCE(squad_id, 0)")
+    op.execute("INSERT INTO volunteer_stats (dimension, key_id, count) SELECT 'type', COALESCE(volunteer_type_id, 0), COUNT(*) FROM volunteer GROUP BY COALESCE(volunteer_type_id, 0)")
+
+
+def downgrade() -> None:
+    op.drop_table('volunteer_stats')
@@ -0,0 +1,26 @@
+"""add token_version to user
+
+Revision ID: e41b9d7c3a05
+Revises: c2a7f4d81b36
+Create Date: 2026-10-17 14:02:51.338170
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41b9d7c3a05'
+down_revision: Union[str, None] = 'c2a7f4d81b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
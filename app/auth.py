@@ -8,8 +8,9 @@ from passlib.context import CryptContext
 from app.database import get_db, SessionLocal
 from datetime import datetime, timedelta
 from app.settings import settings
-from app.schemas import UserAuth, TokenData
+from app.schemas import UserAuth, TokenData, Principal
 from app.utils import get_user_by_email
+from app import cache, models
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -40,7 +41,43 @@ def create_access_token(data: dict, expires_delta: Union[timedelta, None] = None
     encoded_jwt = jwt.encode(data, settings.JWT_SECRETE_KEY, algorithm=settings.PASSWORD_HASH_ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def create_user_access_token(user) -> str:
+    # uid/role/tv let get_current_user authorize without loading the user
+    return create_access_token(data={
+        "sub": user.email,
+        "uid": user.id,
+        "role": user.role.value,
+        "tv": user.token_version or 0,
+    })
+
+def _principal_key(db: Session, user_id: int):
+    return (str(db.get_bind().url), user_id)
+
+def get_principal(db: Session, user_id: int):
+    """
+    Returns the user's Principal from cache.principal_cache, reading only the
+    columns it needs from the users table on a miss.
+    """
+    key = _principal_key(db, user_id)
+    principal = cache.principal_cache.get(key)
+    if principal is None:
+        row = db.query(
+            models.User.id, models.User.email, models.User.role, models.User.is_active, models.User.token_version
+        ).filter(models.User.id == user_id).first()
+        if row is None:
+            return None
+        principal = Principal(
+            id=row.id, email=row.email, role=row.role,
+            is_active=bool(row.is_active), token_version=row.token_version or 0,
+        )
+        cache.principal_cache.set(key, principal)
+    return principal
+
+def forget_principal(db: Session, user_id: int):
+    """Call after committing a token_version bump so this process sees it immediately."""
+    cache.principal_cache.delete(_principal_key(db, user_id))
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -59,16 +96,27 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     if token_data.username is None:
         raise credentials_exception
 
+    if "uid" in payload and "tv" in payload:
+        principal = get_principal(db, payload["uid"])
+        # A role change or password reset bumps token_version and revokes older tokens
+        if principal is None or principal.token_version != payload["tv"]:
+            raise credentials_exception
+        return principal
+
+    # Tokens issued before uid/tv were added carry only the email
     user = get_user_by_email(db, token_data.username) #type:ignore
     if user is None:
         raise credentials_exception
 
-    return user
+    principal = get_principal(db, user.id)
+    if principal is None:
+        raise credentials_exception
+    return principal
 
 from app import schemas
 from app.models import UserRole
 
-def get_current_active_user(current_user: schemas.User = Depends(get_current_user)):
+def get_current_active_user(current_user: Principal = Depends(get_current_user)) -> Principal:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
@@ -77,7 +125,7 @@ class RoleChecker:
     def __init__(self, allowed_roles: list[UserRole]):
         self.allowed_roles = allowed_roles
 
-    def __call__(self, user: schemas.User = Depends(get_current_active_user)):
+    def __call__(self, user: Principal = Depends(get_current_active_user)) -> Principal:
         if user.role not in self.allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
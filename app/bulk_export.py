@@ -0,0 +1,64 @@
+"""
+Streaming volunteer export as CSV or NDJSON.
+
+The rows come from crud.volunteer_export_statement, a flat column projection,
+EXPORT_BATCH_SIZE rows at a time: each batch is its own LIMIT query starting
+after the (created_at, id) of the last row sent. mysql-connector buffers a
+whole result set on the client, so a single query would hold every volunteer
+in memory; with one query per batch only the current batch is, whatever the
+number of volunteers.
+
+The CSV header uses the VolunteerCreate field names, so an export can be fed
+back to app.bulk_import.
+"""
+import csv
+import io
+import json
+
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.bulk_import import CSV, NDJSON, FORMATS
+from app.settings import settings
+
+MEDIA_TYPES = {CSV: "text/csv; charset=utf-8", NDJSON: "application/x-ndjson"}
+
+COLUMNS = [column.key for column in crud.VOLUNTEER_EXPORT_COLUMNS]
+
+
+def _csv_chunk(rows) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(value.isoformat() if hasattr(value, "isoformat") else value for value in row)
+    return buffer.getvalue()
+
+
+def _ndjson_chunk(rows) -> str:
+    return "".join(json.dumps(row._asdict(), default=str) + "\n" for row in rows)
+
+
+def export_volunteers(session_factory, format: str = CSV, batch_size: int = None, **filters):
+    """
+    Yields the export as encoded chunks, one per batch of rows. Opens its own
+    session from session_factory, since the body is sent after the request's
+    dependencies are closed. filters are those of crud.volunteer_export_statement.
+    """
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    write = _ndjson_chunk if format == NDJSON else _csv_chunk
+    if format == CSV:
+        yield _csv_chunk([COLUMNS]).encode()
+
+    db: Session = session_factory()
+    try:
+        after = None
+        while True:
+            rows = db.execute(crud.volunteer_export_statement(db, after=after, limit=batch_size, **filters)).all()
+            if not rows:
+                break
+            yield write(rows).encode()
+            if len(rows) < batch_size:
+                break
+            after = (rows[-1].created_at, rows[-1].id)
+    finally:
+        db.close()
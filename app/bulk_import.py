@@ -0,0 +1,227 @@
+"""
+Bulk volunteer import from CSV or NDJSON.
+
+Rows are read as a stream and written CHUNK at a time. Each row is validated
+with schemas.VolunteerCreate; emails already registered (one IN query per
+chunk) or repeated in the file are skipped. A chunk is written in one
+transaction with one executemany per table: volunteer, volunteer_vertical,
+volunteer_status_history and email_outbox. Welcome emails are only queued, the
+mailer worker sends them.
+
+CSV files need a header row with the VolunteerCreate field names; vertical_ids
+is a list of ids separated by ";" (e.g. "1;3"). NDJSON files have one JSON
+object per line.
+
+Import a file from the command line with: python -m app.bulk_import volunteers.csv
+"""
+import argparse
+import csv
+import json
+import re
+from collections import Counter
+
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app import cache, mailer, models, schemas, stats
+from app.settings import settings
+
+CSV = "csv"
+NDJSON = "ndjson"
+FORMATS = (CSV, NDJSON)
+
+# Only the first errors are listed in the report; the counters cover every row
+MAX_REPORTED_ERRORS = 100
+
+
+def detect_format(filename: str) -> str:
+    return NDJSON if filename and filename.lower().endswith((".ndjson", ".jsonl")) else CSV
+
+
+def read_csv(lines):
+    """Yields (line number, row dict, error) for every record of a CSV stream."""
+    reader = csv.DictReader(lines)
+    for row in reader:
+        # Empty cells mean "not given"; cells past the header land under None
+        data = {key: value for key, value in row.items() if key is not None and value not in ("", None)}
+        yield reader.line_num, data, None
+
+
+def read_ndjson(lines):
+    """Yields (line number, row dict, error) for every non-blank line of an NDJSON stream."""
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(data, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        yield line_number, data, None
+
+
+def read_rows(lines, format: str):
+    return read_ndjson(lines) if format == NDJSON else read_csv(lines)
+
+
+def _parse_row(data: dict) -> schemas.VolunteerCreate:
+    vertical_ids = data.get("vertical_ids")
+    if isinstance(vertical_ids, str):
+        data = {**data, "vertical_ids": [part for part in re.split(r"[;,\s]+", vertical_ids) if part]}
+    volunteer = schemas.VolunteerCreate(**data)
+    if volunteer.jobtitle_id <= 0:
+        raise ValueError("We need jobtitle_id")
+    return volunteer
+
+
+def _describe(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors())
+    return str(error)
+
+
+def _email_key(email: str) -> str:
+    # POST /volunteer finds existing emails with SQL equality, which ignores case under MySQL
+    return email.strip().lower()
+
+
+class VolunteerImporter:
+    """
+    Imports volunteers into db chunk by chunk, committing after each chunk.
+    run() returns a report with received, created, duplicates, invalid and errors.
+    """
+
+    def __init__(self, db: Session, send_welcome_email: bool = True, chunk_size: int = None):
+        self.db = db
+        self.send_welcome_email = send_welcome_email
+        self.chunk_size = chunk_size or settings.BULK_IMPORT_CHUNK_SIZE
+        self.report = {"received": 0, "created": 0, "duplicates": 0, "invalid": 0, "errors": []}
+        self._seen_emails = set()
+        self._chunk = []
+
+        self.status_id = cache.well_known_ids.status_id(db, "INTERESTED")
+        if not self.status_id:
+            raise ValueError("Default status 'INTERESTED' not found.")
+        self.type_id = cache.well_known_ids.type_id(db, "Junior")
+        # Unknown vertical ids are dropped, as in crud.create_volunteer
+        self.vertical_ids = set(db.scalars(select(models.Vertical.id)))
+
+    def run(self, rows) -> dict:
+        for line_number, data, error in rows:
+            self.add(line_number, data, error)
+        self.flush()
+        return self.report
+
+    def add(self, line_number: int, data: dict, error: str = None):
+        self.report["received"] += 1
+        if error is None:
+            try:
+                volunteer = _parse_row(data)
+            except (ValidationError, ValueError) as e:
+                error = _describe(e)
+        if error is not None:
+            self._reject(line_number, data, error)
+            return
+        if _email_key(volunteer.email) in self._seen_emails:
+            self.report["duplicates"] += 1
+            return
+        self._seen_emails.add(_email_key(volunteer.email))
+        self._chunk.append(volunteer)
+        if len(self._chunk) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        chunk, self._chunk = self._chunk, []
+        if not chunk:
+            return
+        email = models.Volunteer.email
+        if self.db.get_bind().dialect.name != "mysql":
+            # MySQL's default collation already compares case-insensitively, and keeps the index
+            email = func.lower(email)
+        registered = {_email_key(e) for e in self.db.scalars(
+            select(models.Volunteer.email).where(email.in_({_email_key(v.email) for v in chunk}))
+        )}
+        new = [v for v in chunk if _email_key(v.email) not in registered]
+        self.report["duplicates"] += len(chunk) - len(new)
+        if new:
+            self._insert(new)
+            self.db.commit()
+            self.report["created"] += len(new)
+
+    def _insert(self, volunteers: list[schemas.VolunteerCreate]):
+        rows = []
+        for volunteer in volunteers:
+            row = volunteer.model_dump(exclude={"vertical_ids"})
+            row["volunteer_type_id"] = row["volunteer_type_id"] or self.type_id
+            row["status_id"] = self.status_id
+            rows.append(row)
+        self.db.execute(insert(models.Volunteer.__table__), rows)
+
+        ids = dict(self.db.execute(
+            select(models.Volunteer.email, models.Volunteer.id)
+            .where(models.Volunteer.email.in_([v.email for v in volunteers]))
+        ).all())
+
+        memberships = [
+            {"volunteer_id": ids[v.email], "vertical_id": vertical_id}
+            for v in volunteers
+            for vertical_id in set(v.vertical_ids or []) & self.vertical_ids
+        ]
+        if memberships:
+            self.db.execute(insert(models.volunteer_vertical_association), memberships)
+        self.db.execute(insert(models.VolunteerStatusHistory.__table__), [
+            {"volunteer_id": ids[v.email], "status_id": self.status_id} for v in volunteers
+        ])
+
+        # Core inserts skip the mapper events that maintain volunteer_stats
+        connection = self.db.connection()
+        stats.bump(connection, stats.TOTAL, 0, len(rows))
+        for dimension, attr in stats.DIMENSIONS.items():
+            for key_id, count in Counter(row[attr] for row in rows).items():
+                stats.bump(connection, dimension, key_id, count)
+
+        if self.send_welcome_email:
+            mailer.enqueue_many(self.db, "welcome", [
+                (v.email, v.name, f"welcome:{ids[v.email]}") for v in volunteers
+            ])
+
+    def _reject(self, line_number: int, data: dict, error: str):
+        self.report["invalid"] += 1
+        if len(self.report["errors"]) < MAX_REPORTED_ERRORS:
+            email = data.get("email") if isinstance(data, dict) else None
+            self.report["errors"].append({"line": line_number, "email": email, "error": error})
+
+
+def import_volunteers(db: Session, lines, format: str = CSV, send_welcome_email: bool = True, chunk_size: int = None) -> dict:
+    return VolunteerImporter(db, send_welcome_email, chunk_size).run(read_rows(lines, format))
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Import volunteers from a CSV or NDJSON file")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=FORMATS, help="defaults to the file extension (.ndjson/.jsonl or CSV)")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--no-welcome-email", action="store_true", help="do not queue welcome emails")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        with open(args.path, newline="", encoding="utf-8-sig") as f:
+            report = import_volunteers(
+                db, f, args.format or detect_format(args.path),
+                send_welcome_email=not args.no_welcome_email, chunk_size=args.chunk_size,
+            )
+    finally:
+        db.close()
+    print(
+        f"{report['received']} rows read: {report['created']} created, "
+        f"{report['duplicates']} duplicates, {report['invalid']} invalid"
+    )
+    for error in report["errors"]:
+        print(f"  line {error['line']}: {error['error']}")
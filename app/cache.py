@@ -0,0 +1,223 @@
+"""
+Small in-process caches for data that is read far more often than it changes.
+
+reference_cache holds the serialized responses of the lookup endpoints
+(/jobtitles/, /volunteer-statuses/, /volunteer-types/, /verticals/). Writers
+invalidate their namespace after committing; the TTL bounds staleness for
+changes made by other processes.
+
+principal_cache remembers each user's token_version, role and active flag
+for a short TTL so authenticated requests do not read the users table.
+
+well_known_ids maps the status and type names the write paths refer to
+("INTERESTED", "ACTIVE", "Junior") to their ids, so signups and status changes
+do not look them up on every call.
+
+profile_cache holds serialized /volunteers/{id}/public responses keyed by the
+volunteer's entry in volunteer_versions. Every committed flush that touches a
+volunteer (its own columns, verticals, mentorships, or a feedback, badge,
+certificate or status change pointing at it) bumps that entry, so a page
+built from older data is never served again. A profile read from the replica
+within DB_REPLICA_STICKY_SECONDS of a bump is not cached, since the replica
+may not have the change yet. Changes elsewhere that show up on a profile (a
+squad's other members, a vertical's name) wait for the TTL.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import Base
+from app.settings import settings
+
+
+class TTLCache:
+    """Thread-safe mapping with per-entry TTL and least-recently-used eviction."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate(self, namespace):
+        """Drops every entry whose key is a tuple starting with namespace."""
+        with self._lock:
+            for key in [k for k in self._entries if isinstance(k, tuple) and k and k[0] == namespace]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+class WellKnownIds:
+    """
+    name -> id registry for volunteer statuses and types, loaded with one query
+    per table the first time a database is used and reloaded when a name is
+    missing or after create_volunteer_status/create_volunteer_type.
+    """
+
+    def __init__(self):
+        self._by_database = {}
+        self._lock = threading.Lock()
+
+    def status_id(self, db: Session, name: str):
+        return self._lookup(db, "status", name)
+
+    def type_id(self, db: Session, name: str):
+        return self._lookup(db, "type", name)
+
+    def load(self, db: Session):
+        ids = {
+            "status": dict(db.query(models.VolunteerStatus.name, models.VolunteerStatus.id).all()),
+            "type": dict(db.query(models.VolunteerType.name, models.VolunteerType.id).all()),
+        }
+        with self._lock:
+            self._by_database[str(db.get_bind().url)] = ids
+        return ids
+
+    def invalidate(self):
+        with self._lock:
+            self._by_database.clear()
+
+    def _lookup(self, db: Session, kind: str, name: str):
+        ids = self._by_database.get(str(db.get_bind().url))
+        if ids is None or name not in ids[kind]:
+            # A name we have not seen may have been added since the last load
+            ids = self.load(db)
+        return ids[kind].get(name)
+
+
+class VersionCounter:
+    """Version number per key; bumping a key orphans every cache entry built for an older version."""
+
+    def __init__(self):
+        self._versions = {}
+        self._bumped_at = {}
+        self._lock = threading.Lock()
+
+    def get(self, key) -> int:
+        return self._versions.get(key, 0)
+
+    def bump(self, *keys):
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                self._versions[key] = self._versions.get(key, 0) + 1
+                self._bumped_at[key] = now
+
+    def bumped_within(self, key, seconds: float) -> bool:
+        """True if key was bumped less than seconds ago."""
+        bumped_at = self._bumped_at.get(key)
+        return bumped_at is not None and time.monotonic() - bumped_at < seconds
+
+    def clear(self):
+        with self._lock:
+            self._versions.clear()
+            self._bumped_at.clear()
+
+
+well_known_ids = WellKnownIds()
+
+reference_cache = TTLCache(
+    maxsize=settings.REFERENCE_CACHE_MAXSIZE,
+    ttl=settings.REFERENCE_CACHE_TTL_SECONDS,
+)
+
+# (database, user id) -> schemas.Principal with the user's current token_version
+principal_cache = TTLCache(maxsize=10000, ttl=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+profile_cache = TTLCache(
+    maxsize=settings.PROFILE_CACHE_MAXSIZE,
+    ttl=settings.PROFILE_CACHE_TTL_SECONDS,
+)
+
+# volunteer id -> version of its public profile
+volunteer_versions = VersionCounter()
+
+# Rows that appear on the profile of the volunteer their volunteer_id points at
+_PROFILE_CHILDREN = (models.Feedback, models.Badge, models.Certificate, models.VolunteerStatusHistory)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_touched_volunteers(session, flush_context):
+    touched = session.info.setdefault("touched_volunteers", set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        state = inspect(obj)
+        # state.dict holds what is loaded; reading attributes could hit a deleted row
+        if isinstance(obj, models.Volunteer):
+            touched.add(state.dict.get("id"))
+            # A mentorship is listed on both profiles
+            for relation in ("mentors", "mentees"):
+                history = state.attrs[relation].history
+                touched.update(other.id for other in chain(history.added, history.deleted))
+        elif isinstance(obj, _PROFILE_CHILDREN):
+            touched.add(state.dict.get("volunteer_id"))
+    touched.discard(None)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_touched_volunteers(session):
+    touched = session.info.pop("touched_volunteers", None)
+    if touched:
+        volunteer_versions.bump(*touched)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_touched_volunteers(session):
+    session.info.pop("touched_volunteers", None)
+
+
+# Recreating the schema (tests, fresh environments) makes every cached row meaningless
+@event.listens_for(Base.metadata, "after_create")
+@event.listens_for(Base.metadata, "after_drop")
+def _clear_caches_on_schema_change(target, connection, **kw):
+    reference_cache.clear()
+    principal_cache.clear()
+    profile_cache.clear()
+    volunteer_versions.clear()
+    well_known_ids.invalidate()
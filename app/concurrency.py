@@ -0,0 +1,39 @@
+"""
+Bounded thread pool for blocking work called from async route handlers.
+
+An async handler runs on the event loop, so a bcrypt hash (~250 ms of CPU) or
+a synchronous SQLAlchemy round trip inside it stalls every other request on
+the worker. Such calls go through run_blocking instead, which runs them on a
+dedicated pool of BLOCKING_EXECUTOR_WORKERS threads. The pool is separate from
+the one Starlette uses for plain `def` routes, so a login burst queues here
+instead of starving them; bcrypt releases the GIL, so the loop keeps serving.
+"""
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from app.settings import settings
+
+_executor = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.BLOCKING_EXECUTOR_WORKERS, thread_name_prefix="blocking")
+    return _executor
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Awaits func(*args, **kwargs) run on the blocking pool, with the caller's context variables."""
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(get_executor(), call)
+
+
+def shutdown():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
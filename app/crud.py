@@ -1,9 +1,11 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, func
-from . import models, schemas
-from app.auth import get_password_hash
-from app.utils import generate_edit_token
+from sqlalchemy.orm import Session, joinedload, noload, selectinload
+from sqlalchemy import create_engine, Column, Integer, String, Boolean, func, and_, or_, false, table, column, literal_column, select, tuple_
+from sqlalchemy.dialects import mysql, sqlite
+from . import models, schemas, stats, cache, mailer
+from app.auth import get_password_hash, forget_principal
+from app.utils import generate_edit_token, decode_cursor
 from datetime import datetime, timedelta, timezone, date
+import re
 
 try:
     from zoneinfo import ZoneInfo
@@ -46,15 +48,126 @@ def create_user_item(db: Session, item: schemas.ItemCreate, user_id: int):
     db.refresh(db_item)
     return db_item
 
-def get_volunteers(db: Session, skip: int = 0, limit: int = 100, name: str = None, email: str = None, jobtitle_id: int = None, status_id: int = None, volunteer_type_id: int = None, squad_id: int = None, order: str = "desc"):
-    query = db.query(models.Volunteer).options(
+# Loader options for the full profile graph serialized by VolunteerPublic/Volunteer.
+# Many-to-one relations are joined, every collection is fetched with one batched
+# IN query, so a page costs a fixed number of queries whatever its size.
+def volunteer_profile_options():
+    return [
+        joinedload(models.Volunteer.jobtitle),
+        joinedload(models.Volunteer.status),
+        joinedload(models.Volunteer.volunteer_type),
+        joinedload(models.Volunteer.squad).selectinload(models.Squad.volunteers).options(
+            joinedload(models.Volunteer.jobtitle),
+            joinedload(models.Volunteer.volunteer_type),
+            joinedload(models.Volunteer.status),
+        ),
+        joinedload(models.Volunteer.squad).selectinload(models.Squad.projects),
+        selectinload(models.Volunteer.verticals),
+        selectinload(models.Volunteer.status_history).joinedload(models.VolunteerStatusHistory.status),
+        selectinload(models.Volunteer.feedbacks).joinedload(models.Feedback.author).joinedload(models.User.volunteer),
+        selectinload(models.Volunteer.certificates),
+        selectinload(models.Volunteer.badges).joinedload(models.Badge.issuer).joinedload(models.User.volunteer),
+        selectinload(models.Volunteer.mentees),
+        selectinload(models.Volunteer.mentors),
+    ]
+
+# Loader options for list pages. Joining collections next to LIMIT/OFFSET multiplies
+# rows (verticals x status changes per volunteer), so they get batched IN queries.
+def volunteer_list_options():
+    return [
         joinedload(models.Volunteer.jobtitle),
         joinedload(models.Volunteer.status),
         joinedload(models.Volunteer.volunteer_type),
         joinedload(models.Volunteer.squad),
-        joinedload(models.Volunteer.verticals),
-        joinedload(models.Volunteer.status_history).joinedload(models.VolunteerStatusHistory.status)
-    )
+        selectinload(models.Volunteer.verticals),
+        selectinload(models.Volunteer.status_history).joinedload(models.VolunteerStatusHistory.status)
+    ]
+
+# Everything VolunteerInSquad serializes for a squad or vertical member
+def member_summary_options():
+    return [
+        joinedload(models.Volunteer.jobtitle),
+        joinedload(models.Volunteer.volunteer_type),
+        joinedload(models.Volunteer.status),
+    ]
+
+volunteer_fts = table("volunteer_fts", column("rowid"), column("rank"))
+
+def search_volunteers_full_text(db: Session, query, q: str):
+    # Every word becomes a prefix term and all of them must match ("mar sil" finds "Maria Silva").
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        return query.order_by(models.Volunteer.id.desc())
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        relevance = mysql.match(
+            models.Volunteer.name, models.Volunteer.email,
+            against=" ".join(f"+{term}*" for term in terms)
+        ).in_boolean_mode()
+        return query.filter(relevance > 0).order_by(relevance.desc(), models.Volunteer.id.desc())
+    if dialect == "sqlite":
+        # rank is FTS5's bm25 score: lower means more relevant
+        return query.join(volunteer_fts, volunteer_fts.c.rowid == models.Volunteer.id)\
+            .filter(literal_column("volunteer_fts").op("MATCH")(" ".join(f'"{term}"*' for term in terms)))\
+            .order_by(volunteer_fts.c.rank, models.Volunteer.id.desc())
+
+    for term in terms:
+        query = query.filter(or_(models.Volunteer.name.ilike(f"%{term}%"), models.Volunteer.email.ilike(f"%{term}%")))
+    return query.order_by(models.Volunteer.id.desc())
+
+def get_volunteers(db: Session, skip: int = 0, limit: int = 100, name: str = None, email: str = None, jobtitle_id: int = None, status_id: int = None, volunteer_type_id: int = None, squad_id: int = None, order: str = "desc", loader_options: list = None, cursor: str = None, q: str = None):
+    statement = volunteers_statement(db, skip=skip, limit=limit, name=name, email=email, jobtitle_id=jobtitle_id, status_id=status_id, volunteer_type_id=volunteer_type_id, squad_id=squad_id, order=order, loader_options=loader_options, cursor=cursor, q=q)
+    return db.scalars(statement).unique().all()
+
+# Builds the volunteer list SELECT; shared by get_volunteers and crud_async.get_volunteers.
+# db is only used to pick the dialect, so it may be a Session or an AsyncSession.
+def volunteers_statement(db, skip: int = 0, limit: int = 100, name: str = None, email: str = None, jobtitle_id: int = None, status_id: int = None, volunteer_type_id: int = None, squad_id: int = None, order: str = "desc", loader_options: list = None, cursor: str = None, q: str = None, vertical_id: int = None):
+    if loader_options is None:
+        loader_options = volunteer_list_options()
+    query = select(models.Volunteer).options(*loader_options)
+    query = filter_volunteers(query, name=name, email=email, jobtitle_id=jobtitle_id, status_id=status_id, volunteer_type_id=volunteer_type_id, squad_id=squad_id, vertical_id=vertical_id)
+
+    if q:
+        if cursor:
+            raise ValueError("cursor cannot be combined with q")
+        query = search_volunteers_full_text(db, query, q)
+        return query.offset(skip).limit(limit)
+
+    # Keyset pagination: (created_at, id) is unique and backed by ix_volunteer_created_at_id,
+    # so a cursor seeks straight to the next row instead of scanning past `skip` rows.
+    if cursor:
+        skip = 0
+    query = order_by_volunteer_keyset(db, query, order, after=decode_cursor(cursor) if cursor else None)
+    return query.offset(skip).limit(limit)
+
+# SQLite stores the server-default created_at as 'YYYY-MM-DD HH:MM:SS' but binds datetimes
+# as 'YYYY-MM-DD HH:MM:SS.ffffff', so the same instant compares as two different strings and
+# a cursor never matches its own row. There both sides are brought to one format first.
+SQLITE_KEYSET_TIMESTAMP = "%Y-%m-%d %H:%M:%f"
+
+def order_by_volunteer_keyset(db, query, order: str = "desc", after: tuple = None):
+    """
+    Orders query by (created_at, id) and, given the (created_at, id) of the last
+    row already seen, keeps only the rows after it in that order.
+    """
+    created_at = models.Volunteer.created_at
+    sqlite_timestamps = db.get_bind().dialect.name == "sqlite"
+    if sqlite_timestamps:
+        created_at = func.strftime(SQLITE_KEYSET_TIMESTAMP, created_at)
+
+    if after:
+        after_created_at, after_id = after
+        if sqlite_timestamps:
+            after_created_at = func.strftime(SQLITE_KEYSET_TIMESTAMP, after_created_at)
+        key, seen = tuple_(created_at, models.Volunteer.id), tuple_(after_created_at, after_id)
+        query = query.filter(key < seen if order == "desc" else key > seen)
+
+    if order == "desc":
+        return query.order_by(created_at.desc(), models.Volunteer.id.desc())
+    return query.order_by(created_at.asc(), models.Volunteer.id.asc())
+
+def filter_volunteers(query, name: str = None, email: str = None, jobtitle_id: int = None, status_id: int = None, volunteer_type_id: int = None, squad_id: int = None, vertical_id: int = None):
     if name:
         query = query.filter(models.Volunteer.name.ilike(f"%{name}%"))
     if email:
@@ -67,27 +180,53 @@ def get_volunteers(db: Session, skip: int = 0, limit: int = 100, name: str = Non
         query = query.filter(models.Volunteer.volunteer_type_id == volunteer_type_id)
     if squad_id:
         query = query.filter(models.Volunteer.squad_id == squad_id)
-
-    if order == "desc":
-        query = query.order_by(models.Volunteer.created_at.desc())
-    else:
-        query = query.order_by(models.Volunteer.created_at.asc())
-
-    return query.offset(skip).limit(limit).all()
+    if vertical_id:
+        query = query.join(models.volunteer_vertical_association, and_(
+            models.volunteer_vertical_association.c.volunteer_id == models.Volunteer.id,
+            models.volunteer_vertical_association.c.vertical_id == vertical_id,
+        ))
+    return query
+
+# Flat columns for the volunteer export: no ORM objects, the names come from outer joins
+VOLUNTEER_EXPORT_COLUMNS = [
+    models.Volunteer.id,
+    models.Volunteer.name,
+    models.Volunteer.email,
+    models.Volunteer.phone,
+    models.Volunteer.linkedin,
+    models.Volunteer.github,
+    models.Volunteer.discord,
+    models.Volunteer.jobtitle_id,
+    models.JobTitle.title.label("jobtitle"),
+    models.Volunteer.status_id,
+    models.VolunteerStatus.name.label("status"),
+    models.Volunteer.volunteer_type_id,
+    models.VolunteerType.name.label("volunteer_type"),
+    models.Volunteer.squad_id,
+    models.Squad.name.label("squad"),
+    models.Volunteer.is_active,
+    models.Volunteer.is_apoiase_supporter,
+    models.Volunteer.created_at,
+]
+
+def volunteer_export_statement(db, name: str = None, email: str = None, jobtitle_id: int = None, status_id: int = None, volunteer_type_id: int = None, squad_id: int = None, order: str = "desc", q: str = None, after: tuple = None, limit: int = None):
+    query = select(*VOLUNTEER_EXPORT_COLUMNS).select_from(models.Volunteer)\
+        .outerjoin(models.JobTitle, models.JobTitle.id == models.Volunteer.jobtitle_id)\
+        .outerjoin(models.VolunteerStatus, models.VolunteerStatus.id == models.Volunteer.status_id)\
+        .outerjoin(models.VolunteerType, models.VolunteerType.id == models.Volunteer.volunteer_type_id)\
+        .outerjoin(models.Squad, models.Squad.id == models.Volunteer.squad_id)
+    query = filter_volunteers(query, name=name, email=email, jobtitle_id=jobtitle_id, status_id=status_id, volunteer_type_id=volunteer_type_id, squad_id=squad_id)
+    if q:
+        # Relevance cannot be paged by keyset: the export keeps the search filter
+        # but lists the matches in (created_at, id) order
+        query = search_volunteers_full_text(db, query, q).order_by(None)
+    return order_by_volunteer_keyset(db, query, order, after=after).limit(limit)
 
 def get_volunteer_by_id(db: Session, volunteer_id: int):
+    # Joining every collection in one statement returns the product of their sizes;
+    # the profile options fetch each one with its own IN query instead.
     return db.query(models.Volunteer).options(
-        joinedload(models.Volunteer.jobtitle),
-        joinedload(models.Volunteer.status),
-        joinedload(models.Volunteer.volunteer_type),
-        joinedload(models.Volunteer.squad),
-        joinedload(models.Volunteer.verticals),
-        joinedload(models.Volunteer.status_history).joinedload(models.VolunteerStatusHistory.status),
-        joinedload(models.Volunteer.feedbacks).joinedload(models.Feedback.author).joinedload(models.User.volunteer),
-        joinedload(models.Volunteer.certificates),
-        joinedload(models.Volunteer.badges).joinedload(models.Badge.issuer).joinedload(models.User.volunteer),
-        joinedload(models.Volunteer.mentees),
-        joinedload(models.Volunteer.mentors)
+        *volunteer_profile_options()
     ).filter(models.Volunteer.id == volunteer_id).first()
 
 def get_volunteer_by_email(db: Session, email: str):
@@ -102,17 +241,22 @@ def get_volunteer_by_email(db: Session, email: str):
         )\
         .filter(models.Volunteer.email == email).first()
 
-def create_volunteer(db: Session, volunteer: schemas.VolunteerCreate, jobtitle_id: int):
+def create_volunteer(db: Session, volunteer: schemas.VolunteerCreate, jobtitle_id: int, send_welcome_email: bool = False):
+    """
+    Creates the volunteer, its verticals and its first status history row in a
+    single flush and commits once, so a half-created volunteer is never visible.
+    With send_welcome_email the welcome email is queued in the same transaction.
+    """
     # Get default status "INTERESTED"
-    default_status = db.query(models.VolunteerStatus).filter(models.VolunteerStatus.name == "INTERESTED").first()
-    if not default_status:
+    default_status_id = cache.well_known_ids.status_id(db, "INTERESTED")
+    if not default_status_id:
         raise ValueError("Default status 'INTERESTED' not found.")
 
     # Get default volunteer type "Junior" if not provided
     if not volunteer.volunteer_type_id:
-        default_type = db.query(models.VolunteerType).filter(models.VolunteerType.name == "Junior").first()
-        if default_type:
-            volunteer.volunteer_type_id = default_type.id
+        default_type_id = cache.well_known_ids.type_id(db, "Junior")
+        if default_type_id:
+            volunteer.volunteer_type_id = default_type_id
 
     # Extract vertical_ids before creating the model
     vertical_ids = volunteer.vertical_ids or []
@@ -123,27 +267,25 @@ def create_volunteer(db: Session, volunteer: schemas.VolunteerCreate, jobtitle_i
          db_volunteer.jobtitle_id = jobtitle_id
 
     if not db_volunteer.status_id:
-        db_volunteer.status_id = default_status.id
-
-    db.add(db_volunteer)
-    db.commit()
-    db.refresh(db_volunteer)
+        db_volunteer.status_id = default_status_id
 
     # Add verticals if provided
     if vertical_ids:
-        verticals = db.query(models.Vertical).filter(models.Vertical.id.in_(vertical_ids)).all()
-        db_volunteer.verticals = verticals
-        db.commit()
-        db.refresh(db_volunteer)
+        db_volunteer.verticals = db.query(models.Vertical).filter(models.Vertical.id.in_(vertical_ids)).all()
 
-    # Add initial status to history
-    status_history_entry = models.VolunteerStatusHistory(
-        volunteer_id=db_volunteer.id,
-        status_id=db_volunteer.status_id
-    )
-    db.add(status_history_entry)
+    # Add initial status to history; the flush fills in volunteer_id
+    db_volunteer.status_history.append(models.VolunteerStatusHistory(status_id=db_volunteer.status_id))
+
+    db.add(db_volunteer)
+    # The unit of work inserts the volunteer, then its vertical and history rows.
+    # No refresh: commit expires the instance and the caller's first read reloads it.
+    db.flush()
+    if send_welcome_email:
+        mailer.enqueue(
+            db, "welcome", db_volunteer.email, db_volunteer.name,
+            idempotency_key=f"welcome:{db_volunteer.id}",
+        )
     db.commit()
-    db.refresh(db_volunteer)
     return db_volunteer
 
 def get_jobtitles(db: Session, skip: int = 0, limit: int = 100):
@@ -151,31 +293,57 @@ def get_jobtitles(db: Session, skip: int = 0, limit: int = 100):
 
 
 # Squad CRUD
-def get_squads(db: Session, skip: int = 0, limit: int = 100):
-    squads = db.query(models.Squad).options(
-        joinedload(models.Squad.volunteers).joinedload(models.Volunteer.jobtitle),
-        joinedload(models.Squad.volunteers).joinedload(models.Volunteer.volunteer_type),
-        joinedload(models.Squad.volunteers).joinedload(models.Volunteer.status),
+def squad_options():
+    return [
+        joinedload(models.Squad.volunteers).options(*member_summary_options()),
         joinedload(models.Squad.projects)
-    ).offset(skip).limit(limit).all()
-    
+    ]
+
+def set_squad_counts(squads):
     for squad in squads:
         squad.members_count = len(squad.volunteers)
         squad.projects_count = len(squad.projects)
-        
     return squads
 
+# Builds the squad list SELECT; shared by get_squads and crud_async.get_squads. Rows are
+# (squad, members_count, projects_count), counted by GROUP BY subqueries so the members
+# are only loaded with include_members (GET /squads/{id}/members pages through them).
+def squads_statement(skip: int = 0, limit: int = 100, include_members: bool = False):
+    members = select(
+        models.Volunteer.squad_id, func.count(models.Volunteer.id).label("members_count")
+    ).where(models.Volunteer.squad_id.is_not(None)).group_by(models.Volunteer.squad_id).subquery()
+    projects = select(
+        models.project_squad_association.c.squad_id, func.count().label("projects_count")
+    ).group_by(models.project_squad_association.c.squad_id).subquery()
+    if include_members:
+        members_option = selectinload(models.Squad.volunteers).options(*member_summary_options())
+    else:
+        members_option = noload(models.Squad.volunteers)
+    return select(
+        models.Squad,
+        func.coalesce(members.c.members_count, 0),
+        func.coalesce(projects.c.projects_count, 0),
+    ).outerjoin(members, members.c.squad_id == models.Squad.id)\
+        .outerjoin(projects, projects.c.squad_id == models.Squad.id)\
+        .options(members_option, selectinload(models.Squad.projects))\
+        .order_by(models.Squad.id).offset(skip).limit(limit)
+
+def set_aggregated_squad_counts(rows):
+    squads = []
+    for squad, members_count, projects_count in rows:
+        squad.members_count = members_count
+        squad.projects_count = projects_count
+        squads.append(squad)
+    return squads
+
+def get_squads(db: Session, skip: int = 0, limit: int = 100, include_members: bool = False):
+    return set_aggregated_squad_counts(db.execute(squads_statement(skip, limit, include_members)))
+
 def get_squad(db: Session, squad_id: int):
-    squad = db.query(models.Squad).options(
-        joinedload(models.Squad.volunteers).joinedload(models.Volunteer.jobtitle),
-        joinedload(models.Squad.volunteers).joinedload(models.Volunteer.volunteer_type),
-        joinedload(models.Squad.volunteers).joinedload(models.Volunteer.status),
-        joinedload(models.Squad.projects)
-    ).filter(models.Squad.id == squad_id).first()
+    squad = db.query(models.Squad).options(*squad_options()).filter(models.Squad.id == squad_id).first()
     
     if squad:
-        squad.members_count = len(squad.volunteers)
-        squad.projects_count = len(squad.projects)
+        set_squad_counts([squad])
         
     return squad
 
@@ -227,6 +395,8 @@ def create_volunteer_status(db: Session, status: schemas.VolunteerStatusCreate):
     db_status = models.VolunteerStatus(name=status.name, description=status.description)
     db.add(db_status)
     db.commit()
+    cache.reference_cache.invalidate("volunteer_statuses")
+    cache.well_known_ids.invalidate()
     db.refresh(db_status)
     return db_status
 
@@ -247,14 +417,18 @@ def update_volunteer_status(db: Session, volunteer_id: int, new_status_id: int):
         db_volunteer.status_id = new_status_id
 
         # Check if new status is ACTIVE and if invite hasn't been sent yet
-        active_status = db.query(models.VolunteerStatus).filter(models.VolunteerStatus.name == "ACTIVE").first()
-        if active_status and new_status_id == active_status.id:
+        if new_status_id == cache.well_known_ids.status_id(db, "ACTIVE"):
             if not db_volunteer.discord_invite_sent:
-                from app.utils import send_discord_invite_email
-                send_discord_invite_email(db_volunteer.email, db_volunteer.name)
+                # Queued in the same transaction as the status change
+                mailer.enqueue(
+                    db, "discord_invite", db_volunteer.email, db_volunteer.name,
+                    idempotency_key=f"discord_invite:{db_volunteer.id}",
+                )
                 db_volunteer.discord_invite_sent = True
 
         db.commit()
+        # /verticals/ only lists ACTIVE volunteers
+        cache.reference_cache.invalidate("verticals")
         db.refresh(db_volunteer)
     return db_volunteer
 
@@ -266,6 +440,8 @@ def create_volunteer_type(db: Session, type_data: schemas.VolunteerTypeBase):
     db_type = models.VolunteerType(name=type_data.name, description=type_data.description)
     db.add(db_type)
     db.commit()
+    cache.reference_cache.invalidate("volunteer_types")
+    cache.well_known_ids.invalidate()
     db.refresh(db_type)
     return db_type
 
@@ -299,31 +475,57 @@ def update_volunteer_jobtitle(db: Session, volunteer_id: int, new_jobtitle_id: i
     if db_volunteer.jobtitle_id != new_jobtitle_id:
         db_volunteer.jobtitle_id = new_jobtitle_id
         db.commit()
+        cache.reference_cache.invalidate("verticals")
         db.refresh(db_volunteer)
     return db_volunteer
 
 
 # Vertical CRUD
+def active_volunteers_criteria(db: Session):
+    active_status_id = cache.well_known_ids.status_id(db, "ACTIVE")
+    if active_status_id is None:
+        return false()
+    return models.Volunteer.status_id == active_status_id
+
+
+# Builds the vertical SELECT with each vertical's active volunteer count, taken from one
+# grouped query over volunteer_vertical; shared by get_verticals and crud_async.get_verticals.
+# The volunteers themselves are paged by GET /verticals/{id}/volunteers.
+def verticals_statement(active_criteria):
+    counts = select(
+        models.volunteer_vertical_association.c.vertical_id, func.count().label("active_volunteers_count")
+    ).join(models.Volunteer, models.Volunteer.id == models.volunteer_vertical_association.c.volunteer_id)\
+        .where(active_criteria)\
+        .group_by(models.volunteer_vertical_association.c.vertical_id).subquery()
+    return select(models.Vertical, func.coalesce(counts.c.active_volunteers_count, 0))\
+        .outerjoin(counts, counts.c.vertical_id == models.Vertical.id)\
+        .order_by(models.Vertical.id)
+
+
+def set_vertical_counts(rows):
+    verticals = []
+    for vertical, active_volunteers_count in rows:
+        vertical.active_volunteers_count = active_volunteers_count
+        verticals.append(vertical)
+    return verticals
+
+
 def get_verticals(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Vertical).options(
-        joinedload(models.Vertical.volunteers.and_(
-            models.Volunteer.status.has(models.VolunteerStatus.name == "ACTIVE")
-        )).joinedload(models.Volunteer.jobtitle)
-    ).offset(skip).limit(limit).all()
+    statement = verticals_statement(active_volunteers_criteria(db)).offset(skip).limit(limit)
+    return set_vertical_counts(db.execute(statement))
 
 
 def get_vertical(db: Session, vertical_id: int):
-    return db.query(models.Vertical).options(
-        joinedload(models.Vertical.volunteers.and_(
-            models.Volunteer.status.has(models.VolunteerStatus.name == "ACTIVE")
-        )).joinedload(models.Volunteer.jobtitle)
-    ).filter(models.Vertical.id == vertical_id).first()
+    statement = verticals_statement(active_volunteers_criteria(db)).where(models.Vertical.id == vertical_id)
+    verticals = set_vertical_counts(db.execute(statement))
+    return verticals[0] if verticals else None
 
 
 def create_vertical(db: Session, vertical: schemas.VerticalCreate):
     db_vertical = models.Vertical(name=vertical.name, description=vertical.description)
     db.add(db_vertical)
     db.commit()
+    cache.reference_cache.invalidate("verticals")
     db.refresh(db_vertical)
     return db_vertical
 
@@ -335,6 +537,7 @@ def update_vertical(db: Session, vertical_id: int, vertical: schemas.VerticalUpd
     for key, value in vertical.dict(exclude_unset=True).items():
         setattr(db_vertical, key, value)
     db.commit()
+    cache.reference_cache.invalidate("verticals")
     db.refresh(db_vertical)
     return db_vertical
 
@@ -344,6 +547,7 @@ def delete_vertical(db: Session, vertical_id: int):
     if db_vertical:
         db.delete(db_vertical)
         db.commit()
+        cache.reference_cache.invalidate("verticals")
     return db_vertical
 
 
@@ -355,6 +559,7 @@ def add_volunteer_to_vertical(db: Session, volunteer_id: int, vertical_id: int):
     if db_vertical not in db_volunteer.verticals:
         db_volunteer.verticals.append(db_vertical)
         db.commit()
+        cache.reference_cache.invalidate("verticals")
         db.refresh(db_volunteer)
     return db_volunteer
 
@@ -367,6 +572,7 @@ def remove_volunteer_from_vertical(db: Session, volunteer_id: int, vertical_id:
     if db_vertical in db_volunteer.verticals:
         db_volunteer.verticals.remove(db_vertical)
         db.commit()
+        cache.reference_cache.invalidate("verticals")
         db.refresh(db_volunteer)
     return db_volunteer
 
@@ -379,43 +585,39 @@ def update_volunteer_verticals(db: Session, volunteer_id: int, vertical_ids: lis
     verticals = db.query(models.Vertical).filter(models.Vertical.id.in_(vertical_ids)).all()
     db_volunteer.verticals = verticals
     db.commit()
+    cache.reference_cache.invalidate("verticals")
     db.refresh(db_volunteer)
     return db_volunteer
 
 
 def get_dashboard_stats(db: Session):
+    # Counts come from the incrementally maintained volunteer_stats table (see app/stats.py)
+    counts = stats.get_volunteer_counts(db)
+    if (stats.TOTAL, 0) not in counts:
+        if db.info.get("read_only"):
+            # A replica cannot store the counters; count directly until the primary has them
+            counts = stats.count_volunteers(db)
+        else:
+            # First hit on a fresh table: build the counters once
+            stats.reconcile_volunteer_stats(db)
+            counts = stats.get_volunteer_counts(db)
+
+    def named_counts(dimension, model, name_column):
+        names = dict(db.query(model.id, name_column).all())
+        return [
+            (names[key_id], count)
+            for (dim, key_id), count in counts.items()
+            if dim == dimension and count > 0 and key_id in names
+        ]
+
     # 1. Group by status
-    status_counts = db.query(
-        models.VolunteerStatus.name, func.count(models.Volunteer.id)
-    ).join(
-        models.Volunteer, models.Volunteer.status_id == models.VolunteerStatus.id
-    ).group_by(
-        models.VolunteerStatus.name
-    ).all()
-    
-    stats_by_status = [{"status": name, "count": count} for name, count in status_counts]
-    
-    # 2. Group by squad
-    squad_counts = db.query(
-        models.Squad.name, func.count(models.Volunteer.id)
-    ).join(
-        models.Volunteer, models.Volunteer.squad_id == models.Squad.id
-    ).group_by(
-        models.Squad.name
-    ).all()
+    stats_by_status = [{"status": name, "count": count} for name, count in named_counts("status", models.VolunteerStatus, models.VolunteerStatus.name)]
 
-    stats_by_squad = [{"squad": name, "count": count} for name, count in squad_counts]
+    # 2. Group by squad
+    stats_by_squad = [{"squad": name, "count": count} for name, count in named_counts("squad", models.Squad, models.Squad.name)]
 
     # 3. Group by volunteer type
-    type_counts = db.query(
-        models.VolunteerType.name, func.count(models.Volunteer.id)
-    ).join(
-        models.Volunteer, models.Volunteer.volunteer_type_id == models.VolunteerType.id
-    ).group_by(
-        models.VolunteerType.name
-    ).all()
-
-    stats_by_type = [{"volunteer_type": name, "count": count} for name, count in type_counts]
+    stats_by_type = [{"volunteer_type": name, "count": count} for name, count in named_counts("type", models.VolunteerType, models.VolunteerType.name)]
 
     # 4. Registered today (Brasilia)
     try:
@@ -436,7 +638,7 @@ def get_dashboard_stats(db: Session):
     ).count()
 
     # 4. Total volunteers
-    total_volunteers = db.query(models.Volunteer).count()
+    total_volunteers = counts[(stats.TOTAL, 0)]
     
     return {
         "total_volunteers_by_status": stats_by_status,
@@ -470,7 +672,10 @@ def reset_password(db: Session, token: str, new_password: str):
     user.hashed_password = get_password_hash(new_password)
     user.reset_token = None
     user.reset_token_expires_at = None
+    # Sign out every session that was issued with the old password
+    user.token_version = (user.token_version or 0) + 1
     db.commit()
+    forget_principal(db, user.id)
     return True
 
 def create_volunteer_edit_token(db: Session, email: str):
@@ -540,6 +745,7 @@ def update_volunteer_profile_by_token(db: Session, token: str, profile_data: sch
     volunteer.daily_edits_count += 1
 
     db.commit()
+    cache.reference_cache.invalidate("verticals")
     db.refresh(volunteer)
     return volunteer, None
 
@@ -562,8 +768,24 @@ def create_project(db: Session, project: schemas.ProjectCreate):
     return db_project
 
 
+def set_squad_member_counts(db: Session, squads):
+    """Sets members_count on squads with one grouped query instead of loading the members."""
+    squads = list(squads)
+    counts = dict(db.execute(
+        select(models.Volunteer.squad_id, func.count(models.Volunteer.id))
+        .where(models.Volunteer.squad_id.in_({squad.id for squad in squads}))
+        .group_by(models.Volunteer.squad_id)
+    ).all()) if squads else {}
+    for squad in squads:
+        squad.members_count = counts.get(squad.id, 0)
+    return squads
+
 def get_projects(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Project).options(joinedload(models.Project.squads)).offset(skip).limit(limit).all()
+    # Three queries whatever the page size: projects, their squads, and the squads' member counts
+    projects = db.query(models.Project).options(selectinload(models.Project.squads))\
+        .order_by(models.Project.id).offset(skip).limit(limit).all()
+    set_squad_member_counts(db, {squad for project in projects for squad in project.squads})
+    return projects
 
 
 def get_project(db: Session, project_id: int):
@@ -624,10 +846,19 @@ def create_job_opening(db: Session, job: schemas.JobOpeningCreate, user_id: int)
 
 
 def get_job_openings(db: Session, skip: int = 0, limit: int = 100, active_only: bool = False):
-    query = db.query(models.JobOpening)
+    # Counted by one grouped subquery; the applications themselves are never loaded
+    counts = select(
+        models.JobApplication.job_id, func.count(models.JobApplication.id).label("applications_count")
+    ).group_by(models.JobApplication.job_id).subquery()
+    query = db.query(models.JobOpening, func.coalesce(counts.c.applications_count, 0))\
+        .outerjoin(counts, counts.c.job_id == models.JobOpening.id)
     if active_only:
         query = query.filter(models.JobOpening.is_active == True)
-    return query.order_by(models.JobOpening.created_at.desc()).offset(skip).limit(limit).all()
+    jobs = []
+    for job, applications_count in query.order_by(models.JobOpening.created_at.desc(), models.JobOpening.id.desc()).offset(skip).limit(limit):
+        job.applications_count = applications_count
+        jobs.append(job)
+    return jobs
 
 
 def get_job_opening(db: Session, job_id: int):
@@ -657,25 +888,44 @@ def delete_job_opening(db: Session, job_id: int):
 
 # JobApplication CRUD
 def create_job_application(db: Session, application: schemas.JobApplicationCreate):
-    # Check if already applied
-    existing = db.query(models.JobApplication).filter(
-        models.JobApplication.job_id == application.job_id,
-        models.JobApplication.volunteer_id == application.volunteer_id
-    ).first()
-    
-    if existing:
-        return existing # Or raise error
-
-    db_application = models.JobApplication(**application.dict())
-    db.add(db_application)
+    """
+    Applies in one statement and returns the application, the existing one when
+    the volunteer already applied. The unique (job_id, volunteer_id) index makes
+    concurrent requests for the same pair end up with a single row.
+    """
+    job_application = models.JobApplication.__table__
+    values = {"job_id": application.job_id, "volunteer_id": application.volunteer_id}
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        # LAST_INSERT_ID(id) makes a duplicate report the existing row's id
+        result = db.execute(
+            mysql.insert(job_application).values(**values).on_duplicate_key_update(id=func.last_insert_id(job_application.c.id))
+        )
+        application_id = result.lastrowid
+    elif dialect == "sqlite":
+        # A no-op update instead of DO NOTHING so RETURNING also yields the existing row
+        stmt = sqlite.insert(job_application).values(**values)
+        application_id = db.execute(
+            stmt.on_conflict_do_update(index_elements=["job_id", "volunteer_id"], set_={"job_id": stmt.excluded.job_id})
+            .returning(job_application.c.id)
+        ).scalar_one()
+    else:
+        existing = db.query(models.JobApplication).filter_by(**values).first()
+        if existing:
+            return existing
+        application_id = db.execute(job_application.insert().values(**values)).inserted_primary_key[0]
     db.commit()
-    db.refresh(db_application)
-    return db_application
+    return db.get(models.JobApplication, application_id)
 
 
 def get_job_applications(db: Session, job_id: int, skip: int = 0, limit: int = 100):
+    # Each application embeds the applicant's full profile: load it per page with IN queries
     return db.query(models.JobApplication).filter(models.JobApplication.job_id == job_id)\
-        .options(joinedload(models.JobApplication.volunteer))\
+        .options(
+            joinedload(models.JobApplication.job),
+            selectinload(models.JobApplication.volunteer).options(*volunteer_profile_options())
+        )\
+        .order_by(models.JobApplication.id)\
         .offset(skip).limit(limit).all()
 
 
@@ -0,0 +1,64 @@
+"""
+AsyncSession versions of the hot read paths (volunteer list and profile, squads,
+verticals and dashboard stats), used by the routes that run on the event loop.
+
+Statements and loader options come from app.crud, so both paths return the same
+rows. Everything a response model serializes is eager loaded: the response is
+built after the session's greenlet has returned, where a lazy load would fail.
+"""
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app import crud, models
+
+
+# VolunteerList nests the full Squad, whose members and projects the sync route loads lazily
+def volunteer_list_options():
+    squad = joinedload(models.Volunteer.squad)
+    return crud.volunteer_list_options() + [
+        squad.selectinload(models.Squad.volunteers).options(*crud.member_summary_options()),
+        squad.selectinload(models.Squad.projects),
+    ]
+
+
+async def get_volunteers(db: AsyncSession, **filters):
+    """Same arguments and ValueError for a cursor combined with q as crud.get_volunteers."""
+    filters.setdefault("loader_options", volunteer_list_options())
+    result = await db.scalars(crud.volunteers_statement(db, **filters))
+    return result.unique().all()
+
+
+async def get_volunteer_by_id(db: AsyncSession, volunteer_id: int):
+    result = await db.scalars(
+        select(models.Volunteer)
+        .options(*crud.volunteer_profile_options())
+        .filter(models.Volunteer.id == volunteer_id)
+    )
+    return result.unique().first()
+
+
+async def get_squads(db: AsyncSession, skip: int = 0, limit: int = 100, include_members: bool = False):
+    result = await db.execute(crud.squads_statement(skip, limit, include_members))
+    return crud.set_aggregated_squad_counts(result)
+
+
+async def get_verticals(db: AsyncSession, skip: int = 0, limit: int = 100):
+    # The ACTIVE status id comes from the shared registry, which works on a sync Session
+    active_criteria = await db.run_sync(crud.active_volunteers_criteria)
+    result = await db.execute(crud.verticals_statement(active_criteria).offset(skip).limit(limit))
+    return crud.set_vertical_counts(result)
+
+
+async def get_vertical_volunteers(db: AsyncSession, vertical_id: int, **filters):
+    """A page of the vertical's ACTIVE volunteers; filters as in crud.get_volunteers."""
+    active_criteria = await db.run_sync(crud.active_volunteers_criteria)
+    filters.setdefault("loader_options", crud.member_summary_options())
+    result = await db.scalars(crud.volunteers_statement(db, vertical_id=vertical_id, **filters).where(active_criteria))
+    return result.unique().all()
+
+
+async def get_dashboard_stats(db: AsyncSession):
+    # The counters in app/stats.py (and their first-hit reconcile) are written against
+    # a sync Session; run_sync drives them over this session's async connection.
+    return await db.run_sync(crud.get_dashboard_stats)
@@ -1,9 +1,16 @@
 import os
+import time
+from typing import Optional
 
+from fastapi import Depends, Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 from .settings import settings
+from .db_pool import TimedAsyncQueuePool, TimedQueuePool
 
 
 SQLALCHEMY_DATABASE_URL = (
@@ -11,9 +18,34 @@ SQLALCHEMY_DATABASE_URL = (
     f"@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_DATABASE}"
 )
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+def _create_pooled_engine(url):
+    return create_engine(
+        url,
+        poolclass=TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        # Recycle before MySQL's wait_timeout closes idle connections on the server side
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+engine = _create_pooled_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional read replica, same credentials and database as the primary
+replica_engine = None
+ReplicaSessionLocal = None
+if settings.DB_REPLICA_HOST:
+    replica_engine = _create_pooled_engine(make_url(SQLALCHEMY_DATABASE_URL).set(
+        host=settings.DB_REPLICA_HOST,
+        port=settings.DB_REPLICA_PORT or settings.DB_PORT,
+    ))
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
+# Set after a successful write; until it expires that client reads from the primary
+READ_PRIMARY_COOKIE = "stars_read_primary"
+
 Base = declarative_base()
 metadata = Base.metadata
 
@@ -23,4 +55,109 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def get_replica_db():
+    if ReplicaSessionLocal is None:
+        yield None
+        return
+    db = ReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def reads_from_primary(request: Request) -> bool:
+    """True while the client's read-your-writes window from READ_PRIMARY_COOKIE is open."""
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+# Dependency for read-only endpoints: the replica when one is configured, the primary
+# for clients that have just written (replication lag would hide their own changes).
+def get_db_readonly(request: Request, db: Session = Depends(get_db), replica: Optional[Session] = Depends(get_replica_db)):
+    if replica is None or reads_from_primary(request):
+        return db
+    replica.info["read_only"] = True
+    return replica
+
+
+# Async drivers used for the same database when a route runs on the event loop
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+_async_engines = {}
+
+
+def get_async_engine(url):
+    """Returns the AsyncEngine for the database behind a sync URL, creating it on first use."""
+    url = make_url(url)
+    key = url.render_as_string(hide_password=False)
+    async_engine = _async_engines.get(key)
+    if async_engine is None:
+        backend = url.get_backend_name()
+        if backend not in ASYNC_DRIVERS:
+            raise ValueError(f"No async driver configured for {backend}")
+        async_url = url.set(drivername=ASYNC_DRIVERS[backend])
+        if backend == "sqlite":
+            # SQLite connections are cheap to open and must not be shared across event loops
+            async_engine = create_async_engine(async_url, poolclass=NullPool)
+        else:
+            # Own pool next to the sync engine's, sized for the few routes on the event loop
+            async_engine = create_async_engine(
+                async_url,
+                poolclass=TimedAsyncQueuePool,
+                pool_size=settings.DB_ASYNC_POOL_SIZE,
+                max_overflow=settings.DB_ASYNC_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+                pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+                pool_pre_ping=settings.DB_POOL_PRE_PING,
+            )
+        _async_engines[key] = async_engine
+    return async_engine
+
+
+async def dispose_async_engines():
+    # dispose() only closes pooled connections; the engines stay usable
+    for async_engine in _async_engines.values():
+        await async_engine.dispose()
+
+
+# Sessions for the routes that run on the event loop, on the same databases as
+# SessionLocal and ReplicaSessionLocal. The engines only connect on first use.
+async_engine = get_async_engine(SQLALCHEMY_DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+async_replica_engine = None
+AsyncReplicaSessionLocal = None
+if replica_engine is not None:
+    async_replica_engine = get_async_engine(replica_engine.url)
+    AsyncReplicaSessionLocal = async_sessionmaker(async_replica_engine, expire_on_commit=False)
+
+
+# Async dependencies. They never touch the sync ones, so an async route does not
+# hop to the threadpool just to build its session.
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_replica_db():
+    if AsyncReplicaSessionLocal is None:
+        yield None
+        return
+    async with AsyncReplicaSessionLocal() as db:
+        yield db
+
+
+async def get_async_db_readonly(request: Request, db: AsyncSession = Depends(get_async_db), replica: Optional[AsyncSession] = Depends(get_async_replica_db)):
+    """get_db_readonly for routes on the event loop."""
+    if replica is None or reads_from_primary(request):
+        return db
+    replica.info["read_only"] = True
+    return replica
@@ -1,32 +1,248 @@
+"""
+APOIA.se backer lookups.
+
+check_apoiase_status answers for one volunteer; sync_apoiase_supporters walks
+every volunteer in id order, checks a batch at a time over one keep-alive
+AsyncClient (bounded by a semaphore and a requests-per-second limiter) and
+writes each batch's changes with a single UPDATE.
+
+start_apoiase_sync runs one in the background for the admin endpoint, at most
+one per process at a time, and apoiase_sync_status reports on the last run.
+
+Run a full sync from the command line with: python -m app.integrations
+"""
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
 import httpx
+from sqlalchemy import case, update
+
+from app import cache, models
 from app.settings import settings
 
+APOIASE_BASE_URL = "https://api.apoia.se"
+
+_client = None
+_client_loop = None
+
+
+def apoiase_credentials_set() -> bool:
+    return bool(settings.APOIASE_API_KEY and settings.APOIASE_API_SECRET)
+
+
+def new_apoiase_client(transport: httpx.AsyncBaseTransport = None) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=APOIASE_BASE_URL,
+        headers={
+            "Accept": "*/*",
+            "Content-Type": "application/json",
+            "x-api-key": settings.APOIASE_API_KEY,
+            "Authorization": f"Bearer {settings.APOIASE_API_SECRET}"
+        },
+        timeout=settings.APOIASE_TIMEOUT_SECONDS,
+        limits=httpx.Limits(
+            max_connections=settings.APOIASE_SYNC_CONCURRENCY,
+            max_keepalive_connections=settings.APOIASE_SYNC_CONCURRENCY,
+        ),
+        transport=transport,
+    )
+
+
+def get_apoiase_client() -> httpx.AsyncClient:
+    """Returns the process-wide client, recreating it if the event loop changed."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = new_apoiase_client()
+        _client_loop = loop
+    return _client
+
+
+async def close_apoiase_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def fetch_backer_status(client: httpx.AsyncClient, email: str) -> Optional[bool]:
+    """Returns isBacker for the email, or None when APOIA.se could not answer."""
+    # Normalize email to lowercase for case-insensitive matching
+    email = email.lower()
+    try:
+        response = await client.get(f"/backers/charges/{email}")
+        if response.status_code == 200:
+            data = response.json()
+            # Response format: {"isPaidThisMonth":false,"isBacker":false}
+            return bool(data.get("isBacker", False))
+        print(f"APOIA.se API returned status {response.status_code}: {response.text}")
+    except Exception as e:
+        print(f"Error checking APOIA.se status: {e}")
+    return None
+
+
 async def check_apoiase_status(email: str) -> bool:
-    if not settings.APOIASE_API_KEY or not settings.APOIASE_API_SECRET:
+    if not apoiase_credentials_set():
         print("APOIA.se credentials not set.")
         return False
-    
-    # Normalize email to lowercase for case-insensitive matching
-    email = email.lower()
-    url = f"https://api.apoia.se/backers/charges/{email}"
-    headers = {
-        "Accept": "*/*",
-        "Content-Type": "application/json",
-        "x-api-key": settings.APOIASE_API_KEY,
-        "Authorization": f"Bearer {settings.APOIASE_API_SECRET}"
-    }
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, headers=headers)
-            if response.status_code == 200:
-                data = response.json()
-                # Response format: {"isPaidThisMonth":false,"isBacker":false}
-                return data.get("isBacker", False)
-            else:
-                print(f"APOIA.se API returned status {response.status_code}: {response.text}")
-        except Exception as e:
-            print(f"Error checking APOIA.se status: {e}")
-            return False
-            
-    return False
+
+    return bool(await fetch_backer_status(get_apoiase_client(), email))
+
+
+class RateLimiter:
+    """Spaces out acquisitions so at most rate_per_second start each second."""
+
+    def __init__(self, rate_per_second: float):
+        self.interval = 1 / rate_per_second if rate_per_second > 0 else 0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _load_batch(session_factory, after_id: int, batch_size: int):
+    db = session_factory()
+    try:
+        return db.query(models.Volunteer.id, models.Volunteer.email, models.Volunteer.is_apoiase_supporter)\
+            .filter(models.Volunteer.id > after_id)\
+            .order_by(models.Volunteer.id)\
+            .limit(batch_size)\
+            .all()
+    finally:
+        db.close()
+
+
+def _write_batch(session_factory, changes: dict):
+    volunteer_table = models.Volunteer.__table__
+    db = session_factory()
+    try:
+        db.execute(
+            update(volunteer_table)
+            .where(volunteer_table.c.id.in_(list(changes)))
+            .values(is_apoiase_supporter=case(changes, value=volunteer_table.c.id))
+        )
+        db.commit()
+    finally:
+        db.close()
+    # The bulk UPDATE skips the ORM flush that normally bumps these
+    cache.volunteer_versions.bump(*changes)
+
+
+async def sync_apoiase_supporters(
+    session_factory,
+    client: httpx.AsyncClient = None,
+    batch_size: int = None,
+    concurrency: int = None,
+    rate_per_second: float = None,
+) -> dict:
+    """
+    Refreshes is_apoiase_supporter for every volunteer and returns a report with
+    checked, supporters, updated, errors, seconds and per_second. Volunteers
+    whose lookup fails keep their current flag.
+    """
+    batch_size = batch_size or settings.APOIASE_SYNC_BATCH_SIZE
+    semaphore = asyncio.Semaphore(concurrency or settings.APOIASE_SYNC_CONCURRENCY)
+    limiter = RateLimiter(settings.APOIASE_SYNC_RATE_PER_SECOND if rate_per_second is None else rate_per_second)
+    owns_client = client is None
+    client = client or new_apoiase_client()
+
+    async def lookup(email):
+        async with semaphore:
+            await limiter.wait()
+            return await fetch_backer_status(client, email)
+
+    report = {"checked": 0, "supporters": 0, "updated": 0, "errors": 0}
+    started = time.perf_counter()
+    last_id = 0
+    try:
+        while True:
+            rows = await asyncio.to_thread(_load_batch, session_factory, last_id, batch_size)
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            results = await asyncio.gather(*(lookup(row.email) for row in rows))
+            changes = {}
+            for row, is_backer in zip(rows, results):
+                report["checked"] += 1
+                if is_backer is None:
+                    report["errors"] += 1
+                    continue
+                report["supporters"] += int(is_backer)
+                if bool(row.is_apoiase_supporter) != is_backer:
+                    changes[row.id] = is_backer
+            if changes:
+                await asyncio.to_thread(_write_batch, session_factory, changes)
+                report["updated"] += len(changes)
+    finally:
+        if owns_client:
+            await client.aclose()
+
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    report["per_second"] = round(report["checked"] / report["seconds"], 1) if report["seconds"] else 0.0
+    return report
+
+
+# Held while a background sync runs; a second admin request is refused instead of
+# starting another full pass against APOIA.se.
+_sync_lock = threading.Lock()
+_sync_task = None
+_sync_status = {"running": False, "started_at": None, "finished_at": None, "report": None, "error": None}
+
+
+def start_apoiase_sync(session_factory, client: httpx.AsyncClient = None) -> bool:
+    """
+    Starts sync_apoiase_supporters as a task on the running loop and returns
+    True, or returns False when a sync is already running in this process.
+    """
+    global _sync_task
+    if not _sync_lock.acquire(blocking=False):
+        return False
+    _sync_status.update(running=True, started_at=datetime.now(timezone.utc), finished_at=None, error=None)
+    _sync_task = asyncio.create_task(_run_background_sync(session_factory, client))
+    return True
+
+
+async def _run_background_sync(session_factory, client):
+    try:
+        _sync_status["report"] = await sync_apoiase_supporters(session_factory, client=client)
+    except Exception as e:
+        print(f"APOIA.se sync failed: {e}")
+        _sync_status["error"] = str(e)
+    finally:
+        _sync_status.update(running=False, finished_at=datetime.now(timezone.utc))
+        _sync_lock.release()
+
+
+def apoiase_sync_status() -> dict:
+    """Whether a background sync is running, when the last one started and finished, and its report."""
+    return dict(_sync_status)
+
+
+async def stop_apoiase_sync():
+    if _sync_task is not None and not _sync_task.done():
+        _sync_task.cancel()
+        await asyncio.gather(_sync_task, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    if not apoiase_credentials_set():
+        raise SystemExit("APOIASE_API_KEY and APOIASE_API_SECRET must be set")
+    report = asyncio.run(sync_apoiase_supporters(SessionLocal))
+    print(
+        f"{report['checked']} volunteers checked in {report['seconds']}s ({report['per_second']}/s): "
+        f"{report['supporters']} supporters, {report['updated']} updated, {report['errors']} errors"
+    )
@@ -0,0 +1,77 @@
+"""
+Process-wide Brevo client.
+
+sib_api_v3_sdk.ApiClient owns a urllib3 PoolManager, so building one per email
+paid for a new pool and TLS handshake on every send. get_emails_api() creates
+it once, on first use, and every sender in app.utils goes through send() or
+send_batch() with the configured pool size and timeouts.
+"""
+import os
+import threading
+
+import sib_api_v3_sdk
+
+from app.settings import settings
+
+DEFAULT_HEADERS = {"charset": "iso-8859-1"}
+# Brevo accepts at most this many messageVersions in one request
+MAX_MESSAGE_VERSIONS = 1000
+
+_api = None
+_lock = threading.Lock()
+
+
+def get_emails_api():
+    global _api
+    if _api is None:
+        with _lock:
+            if _api is None:
+                configuration = sib_api_v3_sdk.Configuration()
+                configuration.api_key["api-key"] = os.getenv("BREVO_API_KEY")
+                configuration.connection_pool_maxsize = settings.BREVO_POOL_MAXSIZE
+                _api = sib_api_v3_sdk.TransactionalEmailsApi(sib_api_v3_sdk.ApiClient(configuration))
+    return _api
+
+
+def reset():
+    """Drops the shared client, e.g. after rotating BREVO_API_KEY."""
+    global _api
+    with _lock:
+        _api = None
+
+
+def request_timeout():
+    return (settings.BREVO_CONNECT_TIMEOUT_SECONDS, settings.BREVO_READ_TIMEOUT_SECONDS)
+
+
+def send(email: str, name: str, template_id: int, params: dict, headers: dict = None):
+    send_smtp_email = sib_api_v3_sdk.SendSmtpEmail(
+        to=[{"email": email, "name": name}],
+        template_id=template_id,
+        params=params,
+        headers=headers or DEFAULT_HEADERS,
+    )
+    return get_emails_api().send_transac_email(send_smtp_email, _request_timeout=request_timeout())
+
+
+def send_batch(template_id: int, recipients: list[dict], headers: dict = None):
+    """
+    Sends one template to many recipients, each dict holding email, name and
+    params, as messageVersions of as few requests as possible.
+    """
+    responses = []
+    for start in range(0, len(recipients), MAX_MESSAGE_VERSIONS):
+        versions = [
+            sib_api_v3_sdk.SendSmtpEmailMessageVersions(
+                to=[{"email": recipient["email"], "name": recipient["name"]}],
+                params=recipient.get("params"),
+            )
+            for recipient in recipients[start:start + MAX_MESSAGE_VERSIONS]
+        ]
+        send_smtp_email = sib_api_v3_sdk.SendSmtpEmail(
+            template_id=template_id,
+            message_versions=versions,
+            headers=headers or DEFAULT_HEADERS,
+        )
+        responses.append(get_emails_api().send_transac_email(send_smtp_email, _request_timeout=request_timeout()))
+    return responses
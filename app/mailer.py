@@ -0,0 +1,258 @@
+"""
+Transactional email outbox.
+
+Request handlers call enqueue() and commit; the email_outbox row is the only
+thing written on the request path. A worker (started by the app lifespan, or
+standalone with `python -m app.mailer`) claims due rows, hands them to a
+transport and retries failures with exponential backoff until
+MAILER_MAX_ATTEMPTS is reached.
+
+Every row carries an idempotency key, so enqueueing the same email twice (a
+retried request, a double click) only sends it once.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app import models, utils
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+
+# How long a claimed row stays invisible to other workers while it is being sent
+CLAIM_SECONDS = 300
+MAX_BACKOFF_SECONDS = 3600
+
+
+class MailDeliveryError(Exception):
+    pass
+
+
+class BrevoTransport:
+    """Delivers outbox rows through the Brevo senders in app.utils."""
+
+    senders = {
+        "welcome": lambda email, name, params: utils.send_welcome_email(email, name),
+        "edit_link": lambda email, name, params: utils.send_edit_link_email(email, name, params["link"]),
+        "password_reset": lambda email, name, params: utils.send_password_reset_email(email, name, params["link"]),
+        "discord_invite": lambda email, name, params: utils.send_discord_invite_email(email, name),
+    }
+
+    # Kinds that can be delivered as messageVersions of a single request
+    batch_kinds = ("welcome",)
+
+    def send(self, message: models.EmailOutbox):
+        sender = self.senders.get(message.kind)
+        if sender is None:
+            raise MailDeliveryError(f"Unknown email kind: {message.kind}")
+        params = json.loads(message.params) if message.params else {}
+        if not sender(message.recipient_email, message.recipient_name, params):
+            raise MailDeliveryError(f"Brevo rejected {message.kind} email to {message.recipient_email}")
+
+    def send_batch(self, kind: str, messages: list[models.EmailOutbox]):
+        recipients = [(message.recipient_email, message.recipient_name) for message in messages]
+        if not utils.send_welcome_emails(recipients):
+            raise MailDeliveryError(f"Brevo rejected a batch of {len(messages)} {kind} emails")
+
+
+class FakeTransport:
+    """Records messages instead of sending them; fails the first fail_times sends."""
+
+    def __init__(self, fail_times: int = 0, batch_kinds: tuple = ()):
+        self.fail_times = fail_times
+        self.batch_kinds = batch_kinds
+        self.sent = []
+        self.batches = []
+
+    def send(self, message: models.EmailOutbox):
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            raise MailDeliveryError("fake transport failure")
+        params = json.loads(message.params) if message.params else {}
+        self.sent.append((message.kind, message.recipient_email, params))
+
+    def send_batch(self, kind: str, messages: list[models.EmailOutbox]):
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            raise MailDeliveryError("fake transport failure")
+        self.batches.append((kind, [message.recipient_email for message in messages]))
+        for message in messages:
+            self.send(message)
+
+
+def get_transport():
+    if settings.MAILER_TRANSPORT == "fake":
+        return FakeTransport()
+    return BrevoTransport()
+
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+def enqueue(db: Session, kind: str, email: str, name: str, idempotency_key: str, params: dict = None):
+    """
+    Adds an email to the outbox in the caller's transaction; the caller commits.
+    Returns the existing row when idempotency_key was already enqueued.
+    """
+    existing = db.query(models.EmailOutbox).filter(models.EmailOutbox.idempotency_key == idempotency_key).first()
+    if existing:
+        return existing
+    message = models.EmailOutbox(
+        kind=kind,
+        recipient_email=email,
+        recipient_name=name,
+        params=json.dumps(params) if params else None,
+        idempotency_key=idempotency_key,
+        status=PENDING,
+        attempts=0,
+        next_attempt_at=_utcnow(),
+    )
+    db.add(message)
+    return message
+
+
+def enqueue_many(db: Session, kind: str, recipients: list[tuple]):
+    """
+    Queues (email, name, idempotency_key) recipients with one executemany INSERT
+    in the caller's transaction. Meant for rows that were just created, whose keys
+    cannot have been enqueued yet; the caller commits.
+    """
+    if not recipients:
+        return
+    now = _utcnow()
+    db.execute(insert(models.EmailOutbox.__table__), [
+        {
+            "kind": kind,
+            "recipient_email": email,
+            "recipient_name": name,
+            "params": None,
+            "idempotency_key": idempotency_key,
+            "status": PENDING,
+            "attempts": 0,
+            "next_attempt_at": now,
+        }
+        for email, name, idempotency_key in recipients
+    ])
+
+
+def backoff_seconds(attempts: int) -> int:
+    return min(settings.MAILER_BACKOFF_SECONDS * 2 ** (attempts - 1), MAX_BACKOFF_SECONDS)
+
+
+def _record_result(message: models.EmailOutbox, error: Exception = None):
+    if error is None:
+        message.status = SENT
+        message.sent_at = _utcnow()
+        message.last_error = None
+        return
+    message.last_error = str(error)
+    if message.attempts >= settings.MAILER_MAX_ATTEMPTS:
+        message.status = FAILED
+        logger.error(f"Giving up on {message.kind} email {message.id} after {message.attempts} attempts: {error}")
+    else:
+        message.next_attempt_at = _utcnow() + timedelta(seconds=backoff_seconds(message.attempts))
+        logger.warning(f"{message.kind} email {message.id} failed (attempt {message.attempts}), retrying later: {error}")
+
+
+def deliver_pending(db: Session, transport, batch_size: int = 50) -> int:
+    """Sends up to batch_size due emails and returns how many were delivered."""
+    now = _utcnow()
+    due_ids = [
+        message_id for (message_id,) in db.query(models.EmailOutbox.id)
+        .filter(models.EmailOutbox.status == PENDING, models.EmailOutbox.next_attempt_at <= now)
+        .order_by(models.EmailOutbox.id)
+        .limit(batch_size)
+        .all()
+    ]
+
+    # Claim the rows first so a second worker skips them while we send
+    claimed_ids = []
+    for message_id in due_ids:
+        claimed = db.query(models.EmailOutbox).filter(
+            models.EmailOutbox.id == message_id,
+            models.EmailOutbox.status == PENDING,
+            models.EmailOutbox.next_attempt_at <= now,
+        ).update({
+            models.EmailOutbox.next_attempt_at: now + timedelta(seconds=CLAIM_SECONDS),
+            models.EmailOutbox.attempts: models.EmailOutbox.attempts + 1,
+        }, synchronize_session=False)
+        db.commit()
+        if claimed:
+            claimed_ids.append(message_id)
+    if not claimed_ids:
+        return 0
+
+    messages = db.query(models.EmailOutbox).filter(models.EmailOutbox.id.in_(claimed_ids)).order_by(models.EmailOutbox.id).all()
+    delivered = 0
+    batches = {}
+    for message in messages:
+        if message.kind in getattr(transport, "batch_kinds", ()):
+            batches.setdefault(message.kind, []).append(message)
+            continue
+        try:
+            transport.send(message)
+        except Exception as e:
+            _record_result(message, e)
+        else:
+            _record_result(message)
+            delivered += 1
+        db.commit()
+
+    # Same-template emails (e.g. welcomes after a bulk import) go out in one request
+    for kind, batch in batches.items():
+        try:
+            transport.send_batch(kind, batch)
+        except Exception as e:
+            for message in batch:
+                _record_result(message, e)
+        else:
+            for message in batch:
+                _record_result(message)
+            delivered += len(batch)
+        db.commit()
+
+    return delivered
+
+
+def _deliver_with_new_session(session_factory, transport):
+    db = session_factory()
+    try:
+        return deliver_pending(db, transport)
+    finally:
+        db.close()
+
+
+async def deliver_periodically(session_factory, transport, interval_seconds: int):
+    while True:
+        try:
+            await asyncio.to_thread(_deliver_with_new_session, session_factory, transport)
+        except Exception as e:
+            logger.error(f"email outbox delivery failed: {e}")
+        await asyncio.sleep(interval_seconds)
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Deliver emails queued in email_outbox")
+    parser.add_argument("--once", action="store_true", help="deliver the due emails and exit")
+    args = parser.parse_args()
+
+    transport = get_transport()
+    while True:
+        delivered = _deliver_with_new_session(SessionLocal, transport)
+        if args.once:
+            print(f"{delivered} email(s) delivered")
+            break
+        time.sleep(max(settings.MAILER_POLL_INTERVAL_SECONDS, 1))
@@ -1,35 +1,88 @@
 from __future__ import print_function
 
+import io
 import os
-from fastapi import Depends, FastAPI, HTTPException, status, Query
-from sqlalchemy.orm import Session
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException, status, Query, Request, Response, UploadFile
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 
-import sib_api_v3_sdk # type:ignore
-from sib_api_v3_sdk.rest import ApiException  # type:ignore
-from pprint import pprint
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 
 from app import crud, models, schemas
-from app.database import SessionLocal, engine
+from app.database import SessionLocal, engine, replica_engine, async_engine, async_replica_engine
 
 from app.settings import settings
-from app.auth import oauth2_scheme, authenticate_user, create_access_token, get_current_user, get_current_active_user, admin_only, head_or_admin, mentor_or_above
-from typing import Annotated, Optional
+from app.auth import oauth2_scheme, authenticate_user, create_access_token, create_user_access_token, forget_principal, get_current_user, get_current_active_user, admin_only, head_or_admin, mentor_or_above
+from typing import Annotated, Optional, Union
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi import Depends, FastAPI
 from datetime import datetime, timedelta, timezone
-from app.database import get_db
-from app import utils, integrations
+from app.database import get_db, get_db_readonly, get_async_db, get_async_db_readonly, dispose_async_engines, READ_PRIMARY_COOKIE
+from app import utils, integrations, stats, cache, mailer, db_pool, crud_async, bulk_import, bulk_export, concurrency
 
 models.Base.metadata.create_all(bind=engine)
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the status/type id registry so the first signup does not pay for it
+    db = SessionLocal()
+    try:
+        cache.well_known_ids.load(db)
+    except Exception as e:
+        print(f"Could not preload status/type ids: {e}")
+    finally:
+        db.close()
+
+    background_tasks = []
+    if settings.STATS_RECONCILE_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(
+            stats.reconcile_periodically(SessionLocal, settings.STATS_RECONCILE_INTERVAL_SECONDS)
+        ))
+    if settings.MAILER_POLL_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(
+            mailer.deliver_periodically(SessionLocal, mailer.get_transport(), settings.MAILER_POLL_INTERVAL_SECONDS)
+        ))
+    yield
+    for task in background_tasks:
+        task.cancel()
+    await integrations.stop_apoiase_sync()
+    await integrations.close_apoiase_client()
+    await dispose_async_engines()
+    concurrency.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    # Writers read from the primary for a while so replica lag cannot hide their change
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400 and settings.DB_REPLICA_STICKY_SECONDS > 0:
+        response.set_cookie(
+            READ_PRIMARY_COOKIE, str(time.time() + settings.DB_REPLICA_STICKY_SECONDS),
+            max_age=settings.DB_REPLICA_STICKY_SECONDS, httponly=True, samesite="lax",
+        )
+    return response
 
 @app.get("/health", summary="Health Check", description="Retorna o status da aplicação para monitoramento.")
 async def health_check():
     return {"status": "ok"}
 
+@app.get("/metrics/db-pool", summary="Métricas do pool de conexões", description="Retorna a ocupação do pool de conexões com o banco e o tempo de espera por uma conexão, para dimensionar o pool.")
+def db_pool_metrics():
+    status = db_pool.pool_status(engine)
+    # The routes on the event loop check out from their own pool on the same database
+    status["async"] = db_pool.pool_status(async_engine)
+    if replica_engine is not None:
+        status["replica"] = {**db_pool.pool_status(replica_engine), "async": db_pool.pool_status(async_replica_engine)}
+    return status
+
 origins = [
     "http://localhost",
     "http://localhost:5173",
@@ -43,11 +96,57 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+
+def cached_reference_response(request: Request, namespace: str, db: Session, item_schema, load, skip: int, limit: int):
+    """
+    Serves a lookup list from cache.reference_cache, answering 304 when the
+    client already holds the current ETag. db must be the primary: writers
+    invalidate right after committing, and a lagging replica would refill the
+    entry with the old list for the whole TTL.
+    """
+    key = (namespace, str(db.get_bind().url), skip, limit)
+    entry = cache.reference_cache.get(key)
+    if entry is None:
+        entry = cache_reference_body(key, item_schema, load())
+    return reference_response(request, entry)
+
+
+async def cached_reference_response_async(request: Request, namespace: str, db: AsyncSession, item_schema, load, skip: int, limit: int):
+    """cached_reference_response for routes on an AsyncSession; load is awaited on a miss."""
+    key = (namespace, str(db.get_bind().url), skip, limit)
+    entry = cache.reference_cache.get(key)
+    if entry is None:
+        entry = cache_reference_body(key, item_schema, await load())
+    return reference_response(request, entry)
+
+
+def cache_reference_body(key, item_schema, rows):
+    adapter = TypeAdapter(list[item_schema])
+    body = adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+    entry = (body, cache.make_etag(body))
+    cache.reference_cache.set(key, entry)
+    return entry
+
+
+def reference_response(request: Request, entry):
+    return etag_response(request, entry, f"public, max-age={settings.REFERENCE_CACHE_MAX_AGE_SECONDS}, must-revalidate")
+
+
+def etag_response(request: Request, entry, cache_control: str):
+    """Answers 304 when If-None-Match already names the entry's ETag, else sends its body."""
+    body, etag = entry
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if cache.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 @app.post("/token", response_model=schemas.Token, summary="Login para obter token de acesso", description="Autentica um usuário com email e senha e retorna um token JWT para acesso a rotas protegidas.")
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, form_data.username, form_data.password)
+    # The user lookup and the bcrypt check run off the event loop
+    user = await concurrency.run_blocking(authenticate_user, db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -59,38 +158,49 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
         raise ValueError("ACCESS_TOKEN_EXPIRE_MINUTES cannot be None")
 
     access_token_expires = timedelta(minutes=float(settings.JWT_EXPIRE_MINUTES))
-    access_token = create_access_token(
-        data={"sub": user.email}
-    )
+    access_token = create_user_access_token(user)
     return {"access_token": access_token, "token_type": "bearer", "role": user.role}
 
 
 @app.post("/request-password-reset", summary="Solicitar reset de senha", description="Gera um token de reset de senha e envia para o email do usuário.")
 async def request_password_reset(request: schemas.PasswordResetRequest, db: Session = Depends(get_db)):
-    user = crud.create_password_reset_token(db, request.email)
+    await concurrency.run_blocking(queue_password_reset, db, request.email)
+    return {"message": "Se o e-mail estiver cadastrado, um link de reset será enviado."}
+
+
+def queue_password_reset(db: Session, email: str):
+    user = crud.create_password_reset_token(db, email)
     if not user:
-        return {"message": "Se o e-mail estiver cadastrado, um link de reset será enviado."}
-    
+        return
+
     frontend_url = os.getenv("FRONTEND_URL", "https://stars.soujunior.tech")
     reset_link = f"{frontend_url}/reset-password?token={user.reset_token}"
-    
+
     user_name = user.volunteer.name if user.volunteer else "Usuário"
-    
-    utils.send_password_reset_email(user.email, user_name, reset_link)
-    return {"message": "Se o e-mail estiver cadastrado, um link de reset será enviado."}
+
+    mailer.enqueue(
+        db, "password_reset", user.email, user_name,
+        idempotency_key=f"password_reset:{user.id}:{user.reset_token}",
+        params={"link": reset_link},
+    )
+    db.commit()
 
 
 @app.post("/reset-password", summary="Redefinir senha", description="Redefine a senha do usuário usando o token recebido por email.")
 async def reset_password(data: schemas.PasswordReset, db: Session = Depends(get_db)):
-    success = crud.reset_password(db, data.token, data.new_password)
+    success = await concurrency.run_blocking(crud.reset_password, db, data.token, data.new_password)
     if not success:
         raise HTTPException(status_code=400, detail="Token inválido ou expirado.")
     return {"message": "Senha redefinida com sucesso."}
 
 
 @app.get("/users/me/", response_model=schemas.User, summary="Obter usuário autenticado", description="Retorna os detalhes do usuário atualmente autenticado.")
-async def read_users_me(current_user: schemas.User = Depends(get_current_active_user)):
-    return current_user
+def read_users_me(current_user: schemas.Principal = Depends(get_current_active_user), db: Session = Depends(get_db)):
+    # The principal only carries id/role; the response needs the full user with items and volunteer
+    db_user = utils.get_user(db, user_id=current_user.id)
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return db_user
 
 
 @app.post("/users/", response_model=schemas.User)
@@ -104,13 +214,13 @@ def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
 
 
 @app.get("/users/", response_model=list[schemas.User], summary="Listar usuários", description="Retorna uma lista de todos os usuários. Requer autenticação.")
-def read_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: schemas.User = Depends(admin_only)):
+def read_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: schemas.Principal = Depends(admin_only)):
     users = utils.get_users(db, skip=skip, limit=limit)
     return users
 
 
 @app.get("/users/{user_id}", response_model=schemas.User, summary="Obter usuário por ID", description="Retorna os detalhes de um usuário específico pelo seu ID. Requer autenticação.")
-def read_user(user_id: int, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_active_user)):
+def read_user(user_id: int, db: Session = Depends(get_db), current_user: schemas.Principal = Depends(get_current_active_user)):
     db_user = utils.get_user(db, user_id=user_id)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
@@ -122,21 +232,24 @@ def update_user_role(
     user_id: int, 
     role: schemas.UserRole, 
     db: Session = Depends(get_db), 
-    current_user: schemas.User = Depends(admin_only)
+    current_user: schemas.Principal = Depends(admin_only)
 ):
     db_user = utils.get_user(db, user_id=user_id)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     
-    db_user.role = role
-    db.commit()
+    if db_user.role != role:
+        db_user.role = role
+        db_user.token_version = (db_user.token_version or 0) + 1
+        db.commit()
+        forget_principal(db, db_user.id)
     db.refresh(db_user)
     return db_user
 
 
 @app.post("/users/{user_id}/items/", response_model=schemas.Item, summary="Criar item para usuário", description="Cria um novo item associado a um usuário específico. Requer autenticação.")
 def create_item_for_user(
-    user_id: int, item: schemas.ItemCreate, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_active_user)
+    user_id: int, item: schemas.ItemCreate, db: Session = Depends(get_db), current_user: schemas.Principal = Depends(get_current_active_user)
 ):
     return crud.create_user_item(db=db, item=item, user_id=user_id)
 
@@ -149,7 +262,8 @@ def read_items(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
 
 # volunteer
 @app.get("/volunteers/", response_model=list[schemas.VolunteerList], summary="Listar voluntários", description="Retorna uma lista de voluntários com opções de filtro por nome, email, cargo, status e squad.")
-def get_volunteers(
+async def get_volunteers(
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
     name: Optional[str] = None, 
@@ -159,15 +273,50 @@ def get_volunteers(
     volunteer_type_id: Optional[int] = None,
     squad_id: Optional[int] = None,
     order: str = Query("desc", enum=["asc", "desc"], description="Ordenação por data de criação"),
-    db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(mentor_or_above)
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado em X-Next-Cursor (paginação por keyset; ignora skip)"),
+    q: Optional[str] = Query(None, description="Busca textual por prefixo em nome e email, ordenada por relevância"),
+    db: AsyncSession = Depends(get_async_db_readonly),
+    current_user: schemas.Principal = Depends(mentor_or_above)
 ):
-    db_volunteers = crud.get_volunteers(db, skip=skip, limit=limit, name=name, email=email, jobtitle_id=jobtitle_id, status_id=status_id, volunteer_type_id=volunteer_type_id, squad_id=squad_id, order=order)
+    try:
+        db_volunteers = await crud_async.get_volunteers(db, skip=skip, limit=limit, name=name, email=email, jobtitle_id=jobtitle_id, status_id=status_id, volunteer_type_id=volunteer_type_id, squad_id=squad_id, order=order, cursor=cursor, q=q)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if db_volunteers is None:
         raise HTTPException(status_code=404, detail="Volunteer not found")
+    if db_volunteers and len(db_volunteers) == limit and not q:
+        last = db_volunteers[-1]
+        response.headers["X-Next-Cursor"] = utils.encode_cursor(last.created_at, last.id)
     return db_volunteers
 
 
+@app.get("/volunteers/export", summary="Exportar voluntários", description="Exporta os voluntários em CSV ou NDJSON, enviando as linhas aos poucos. Aceita os mesmos filtros da listagem. Apenas administradores.")
+def export_volunteers(
+    format: str = Query(bulk_export.CSV, enum=list(bulk_export.FORMATS), description="Formato do arquivo"),
+    name: Optional[str] = None,
+    email: Optional[str] = Query(None, description="Filtrar por email (busca parcial)"),
+    jobtitle_id: Optional[int] = None,
+    status_id: Optional[int] = None,
+    volunteer_type_id: Optional[int] = None,
+    squad_id: Optional[int] = None,
+    order: str = Query("desc", enum=["asc", "desc"], description="Ordenação por data de criação"),
+    q: Optional[str] = Query(None, description="Busca textual por prefixo em nome e email; o resultado segue a ordenação por data de criação"),
+    db: Session = Depends(get_db_readonly),
+    current_user: schemas.Principal = Depends(admin_only)
+):
+    if format not in bulk_export.FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(bulk_export.FORMATS)}")
+    # The body is streamed after this session is closed, so the export opens its own on the same database
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
+    body = bulk_export.export_volunteers(
+        session_factory, format, name=name, email=email, jobtitle_id=jobtitle_id, status_id=status_id,
+        volunteer_type_id=volunteer_type_id, squad_id=squad_id, order=order, q=q,
+    )
+    return StreamingResponse(body, media_type=bulk_export.MEDIA_TYPES[format], headers={
+        "Content-Disposition": f'attachment; filename="volunteers.{format}"',
+    })
+
+
 # volunteer public search
 @app.get("/volunteer/search", response_model=list[schemas.VolunteerPublic])
 def search_volunteers_public(
@@ -175,12 +324,15 @@ def search_volunteers_public(
     limit: int = 100, 
     email: Optional[str] = Query(None, description="Filtrar por email (busca parcial)"),
     jobtitle_id: Optional[int] = Query(None, description="Filtrar por cargo"),
-    db: Session = Depends(get_db)
+    q: Optional[str] = Query(None, description="Busca textual por prefixo em nome e email, ordenada por relevância"),
+    db: Session = Depends(get_db_readonly)
 ):
     db_volunteers = crud.get_volunteers(
         db, skip=skip, limit=limit, 
         email=email, 
-        jobtitle_id=jobtitle_id
+        jobtitle_id=jobtitle_id,
+        q=q,
+        loader_options=crud.volunteer_profile_options()
     )
     return db_volunteers
 
@@ -195,20 +347,18 @@ def create_volunteer(volunteer: schemas.VolunteerCreate, db: Session = Depends(g
     if volunteer.jobtitle_id <= 0:
         raise HTTPException(status_code=400, detail="We need jobtitle_id")
 
-    vol = crud.create_volunteer(
-        db=db, volunteer=volunteer, jobtitle_id=volunteer.jobtitle_id
+    return crud.create_volunteer(
+        db=db, volunteer=volunteer, jobtitle_id=volunteer.jobtitle_id, send_welcome_email=True
     )
-    send_email(volunteer.email, volunteer.name)
-    return vol
 
 
 @app.get("/volunteers/{volunteer_id}", response_model=schemas.Volunteer)
-def get_volunteer_by_id(
+async def get_volunteer_by_id(
     volunteer_id: int, 
-    db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(mentor_or_above)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.Principal = Depends(mentor_or_above)
 ):
-    db_volunteer = crud.get_volunteer_by_id(db, volunteer_id=volunteer_id)
+    db_volunteer = await crud_async.get_volunteer_by_id(db, volunteer_id=volunteer_id)
     if db_volunteer is None:
         raise HTTPException(status_code=404, detail="Volunteer not found")
     return db_volunteer
@@ -216,12 +366,23 @@ def get_volunteer_by_id(
 
 @app.get("/volunteers/{volunteer_id}/public", response_model=schemas.VolunteerPublic, summary="Obter perfil público do voluntário", description="Retorna os dados públicos do voluntário (sem telefone/email).")
 def get_volunteer_public_profile(
-    volunteer_id: int, db: Session = Depends(get_db)
+    volunteer_id: int, request: Request, db: Session = Depends(get_db_readonly)
 ):
-    db_volunteer = crud.get_volunteer_by_id(db, volunteer_id=volunteer_id)
-    if db_volunteer is None:
-        raise HTTPException(status_code=404, detail="Volunteer not found")
-    return db_volunteer
+    # Read the version before loading: a change committed meanwhile bumps it, orphaning this entry
+    key = ("volunteer_public", str(db.get_bind().url), volunteer_id, cache.volunteer_versions.get(volunteer_id))
+    entry = cache.profile_cache.get(key)
+    if entry is None:
+        db_volunteer = crud.get_volunteer_by_id(db, volunteer_id=volunteer_id)
+        if db_volunteer is None:
+            raise HTTPException(status_code=404, detail="Volunteer not found")
+        body = schemas.VolunteerPublic.model_validate(db_volunteer, from_attributes=True).model_dump_json().encode()
+        entry = (body, cache.make_etag(body))
+        # Right after a change the replica may still hold the old row; cached under the
+        # new version, that old page would be served until the TTL
+        if not (db.info.get("read_only") and cache.volunteer_versions.bumped_within(volunteer_id, settings.DB_REPLICA_STICKY_SECONDS)):
+            cache.profile_cache.set(key, entry)
+    # Shared links are revalidated on every visit; an unchanged profile costs a 304 and no query
+    return etag_response(request, entry, "public, no-cache")
 
 
 @app.post("/volunteers/request-edit-link", summary="Solicitar link de edição", description="Envia um link com token para o email do voluntário para edição de perfil.")
@@ -236,7 +397,12 @@ def request_edit_link(
     # Generate link (Hypothetical frontend URL)
     link = f"{settings.BASE_FRONTEND_URL}/volunteer/edit/{volunteer.edit_token}"
     
-    utils.send_edit_link_email(volunteer.email, volunteer.name, link)
+    mailer.enqueue(
+        db, "edit_link", volunteer.email, volunteer.name,
+        idempotency_key=f"edit_link:{volunteer.id}:{volunteer.edit_token}",
+        params={"link": link},
+    )
+    db.commit()
     return {"message": "Link de edição enviado para o e-mail."}
 
 
@@ -278,7 +444,7 @@ def update_volunteer_status(
     volunteer_id: int,
     new_status_id: int,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(head_or_admin)
+    current_user: schemas.Principal = Depends(head_or_admin)
 ):
     # Check if the new_status_id is valid
     db_status = db.query(models.VolunteerStatus).filter(models.VolunteerStatus.id == new_status_id).first()
@@ -296,7 +462,7 @@ def update_volunteer_squad(
     volunteer_id: int,
     new_squad_id: int,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(head_or_admin)
+    current_user: schemas.Principal = Depends(head_or_admin)
 ):
     db_squad = db.query(models.Squad).filter(models.Squad.id == new_squad_id).first()
     if not db_squad:
@@ -313,7 +479,7 @@ def update_volunteer_type(
     volunteer_id: int,
     new_type_id: int,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(head_or_admin)
+    current_user: schemas.Principal = Depends(head_or_admin)
 ):
     db_type = db.query(models.VolunteerType).filter(models.VolunteerType.id == new_type_id).first()
     if not db_type:
@@ -330,7 +496,7 @@ def update_volunteer_jobtitle(
     volunteer_id: int,
     new_jobtitle_id: int,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(head_or_admin)
+    current_user: schemas.Principal = Depends(head_or_admin)
 ):
     db_jobtitle = db.query(models.JobTitle).filter(models.JobTitle.id == new_jobtitle_id).first()
     if not db_jobtitle:
@@ -347,7 +513,7 @@ def add_mentee_to_mentor(
     mentor_id: int,
     mentee_id: int,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(head_or_admin)
+    current_user: schemas.Principal = Depends(head_or_admin)
 ):
     updated_volunteer = crud.add_mentee_to_mentor(db, mentor_id, mentee_id)
     if updated_volunteer is None:
@@ -360,7 +526,7 @@ def remove_mentee_from_mentor(
     mentor_id: int,
     mentee_id: int,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(head_or_admin)
+    current_user: schemas.Principal = Depends(head_or_admin)
 ):
     updated_volunteer = crud.remove_mentee_from_mentor(db, mentor_id, mentee_id)
     if updated_volunteer is None:
@@ -368,28 +534,74 @@ def remove_mentee_from_mentor(
     return updated_volunteer
 
 
+@app.post("/volunteers/sync-apoiase", status_code=202, response_model=schemas.ApoiaseSyncStatus, summary="Sincronizar apoiadores do APOIA.se", description="Inicia em segundo plano a verificação de todos os voluntários no APOIA.se, em lotes e com concorrência limitada, atualizando quem é apoiador. Responde 409 se uma sincronização já estiver em andamento; o resultado fica em /volunteers/sync-apoiase/status. Apenas administradores.")
+async def sync_apoiase_supporters(
+    db: Session = Depends(get_db),
+    current_user: schemas.Principal = Depends(admin_only)
+):
+    if not integrations.apoiase_credentials_set():
+        raise HTTPException(status_code=400, detail="APOIA.se credentials not set")
+    # The sync outlives the request and opens its own short-lived sessions per batch on the same database
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
+    if not integrations.start_apoiase_sync(session_factory, client=integrations.get_apoiase_client()):
+        raise HTTPException(status_code=409, detail="An APOIA.se sync is already running")
+    return integrations.apoiase_sync_status()
+
+
+@app.get("/volunteers/sync-apoiase/status", response_model=schemas.ApoiaseSyncStatus, summary="Status da sincronização do APOIA.se", description="Informa se uma sincronização com o APOIA.se está em andamento e o relatório da última concluída. Apenas administradores.")
+def get_apoiase_sync_status(current_user: schemas.Principal = Depends(admin_only)):
+    return integrations.apoiase_sync_status()
+
+
+@app.post("/volunteers/import", response_model=schemas.VolunteerImportReport, summary="Importar voluntários em lote", description="Importa voluntários de um arquivo CSV (com cabeçalho) ou NDJSON, gravando em lotes. Emails já cadastrados ou repetidos no arquivo são ignorados e os emails de boas-vindas entram na fila de envio. Apenas administradores.")
+def import_volunteers(
+    file: UploadFile,
+    format: Optional[str] = Query(None, enum=list(bulk_import.FORMATS), description="Formato do arquivo; por padrão vem da extensão (.ndjson/.jsonl ou CSV)"),
+    send_welcome_email: bool = Query(True, description="Enfileirar o email de boas-vindas para os voluntários criados"),
+    db: Session = Depends(get_db),
+    current_user: schemas.Principal = Depends(admin_only)
+):
+    # The upload is spooled to disk by Starlette; rows are read and written a chunk at a time
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return bulk_import.import_volunteers(
+            db, lines, format or bulk_import.detect_format(file.filename), send_welcome_email=send_welcome_email
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        lines.detach()
+
+
 @app.post("/volunteers/{volunteer_id}/check-apoiase", response_model=schemas.Volunteer, summary="Verificar status do APOIA.se", description="Verifica se o voluntário é um apoiador ativo no APOIA.se e atualiza o status.")
 async def check_volunteer_apoiase(
     volunteer_id: int,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(head_or_admin)
+    current_user: schemas.Principal = Depends(head_or_admin)
 ):
-    volunteer = crud.get_volunteer_by_id(db, volunteer_id=volunteer_id)
+    volunteer = await concurrency.run_blocking(crud.get_volunteer_by_id, db, volunteer_id=volunteer_id)
     if not volunteer:
         raise HTTPException(status_code=404, detail="Volunteer not found")
-    
+
+    # The APOIA.se call is async; only the DB work goes to the blocking pool
     is_supporter = await integrations.check_apoiase_status(volunteer.email)
-    
+
     volunteer.is_apoiase_supporter = is_supporter
+    return await concurrency.run_blocking(save_apoiase_status, db, volunteer)
+
+
+def save_apoiase_status(db: Session, volunteer: models.Volunteer):
     db.commit()
-    db.refresh(volunteer)
-    
-    return volunteer
+    # Reload the profile the response serializes, so it is not lazy loaded on the loop
+    return crud.get_volunteer_by_id(db, volunteer_id=volunteer.id)
 
 
 @app.get("/volunteer-types/", response_model=list[schemas.VolunteerType])
-def get_volunteer_types(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_volunteer_types(db, skip=skip, limit=limit)
+def get_volunteer_types(request: Request, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    return cached_reference_response(
+        request, "volunteer_types", db, schemas.VolunteerType,
+        lambda: crud.get_volunteer_types(db, skip=skip, limit=limit), skip, limit,
+    )
 
 
 # Verticals
@@ -397,30 +609,50 @@ def get_volunteer_types(skip: int = 0, limit: int = 100, db: Session = Depends(g
 def create_vertical(
     vertical: schemas.VerticalCreate,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(head_or_admin)
+    current_user: schemas.Principal = Depends(head_or_admin)
 ):
     db_vertical = db.query(models.Vertical).filter(models.Vertical.name == vertical.name).first()
     if db_vertical:
         raise HTTPException(status_code=400, detail="Vertical with this name already exists")
     return crud.create_vertical(db=db, vertical=vertical)
 
-@app.get("/verticals/", response_model=list[schemas.VerticalWithVolunteers], summary="Listar Verticais", description="Retorna uma lista de todas as verticais com os voluntários associados.")
-def get_verticals(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_verticals(db, skip=skip, limit=limit)
+@app.get("/verticals/", response_model=list[schemas.VerticalWithCounts], summary="Listar Verticais", description="Retorna uma lista de todas as verticais com o número de voluntários ativos. Os voluntários ficam em /verticals/{vertical_id}/volunteers.")
+async def get_verticals(request: Request, skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
+    return await cached_reference_response_async(
+        request, "verticals", db, schemas.VerticalWithCounts,
+        lambda: crud_async.get_verticals(db, skip=skip, limit=limit), skip, limit,
+    )
 
-@app.get("/verticals/{vertical_id}", response_model=schemas.VerticalWithVolunteers, summary="Obter Vertical por ID", description="Retorna os detalhes de uma vertical específica com os voluntários associados.")
+@app.get("/verticals/{vertical_id}", response_model=schemas.VerticalWithCounts, summary="Obter Vertical por ID", description="Retorna os detalhes de uma vertical específica com o número de voluntários ativos.")
 def get_vertical(vertical_id: int, db: Session = Depends(get_db)):
     db_vertical = crud.get_vertical(db, vertical_id=vertical_id)
     if db_vertical is None:
         raise HTTPException(status_code=404, detail="Vertical not found")
     return db_vertical
 
+@app.get("/verticals/{vertical_id}/volunteers", response_model=list[schemas.VolunteerInSquad], summary="Listar voluntários da vertical", description="Lista os voluntários ativos de uma vertical com paginação por cursor (X-Next-Cursor).")
+async def get_vertical_volunteers(
+    vertical_id: int,
+    response: Response,
+    limit: int = 100,
+    order: str = Query("desc", enum=["asc", "desc"], description="Ordenação por data de criação"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado em X-Next-Cursor (paginação por keyset)"),
+    db: AsyncSession = Depends(get_async_db_readonly)
+):
+    if await db.get(models.Vertical, vertical_id) is None:
+        raise HTTPException(status_code=404, detail="Vertical not found")
+    volunteers = await crud_async.get_vertical_volunteers(db, vertical_id, limit=limit, order=order, cursor=cursor)
+    if volunteers and len(volunteers) == limit:
+        last = volunteers[-1]
+        response.headers["X-Next-Cursor"] = utils.encode_cursor(last.created_at, last.id)
+    return volunteers
+
 @app.put("/verticals/{vertical_id}", response_model=schemas.Vertical, summary="Atualizar Vertical", description="Atualiza uma vertical existente. Requer autenticação.")
 def update_vertical(
     vertical_id: int,
     vertical: schemas.VerticalUpdate,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(head_or_admin)
+    current_user: schemas.Principal = Depends(head_or_admin)
 ):
     updated_vertical = crud.update_vertical(db, vertical_id=vertical_id, vertical=vertical)
     if updated_vertical is None:
@@ -431,7 +663,7 @@ def update_vertical(
 def delete_vertical(
     vertical_id: int,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(admin_only)
+    current_user: schemas.Principal = Depends(admin_only)
 ):
     db_vertical = crud.delete_vertical(db, vertical_id=vertical_id)
     if db_vertical is None:
@@ -443,7 +675,7 @@ def update_volunteer_verticals(
     volunteer_id: int,
     vertical_ids: list[int],
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(get_current_active_user)
+    current_user: schemas.Principal = Depends(get_current_active_user)
 ):
     updated_volunteer = crud.update_volunteer_verticals(db, volunteer_id, vertical_ids)
     if updated_volunteer is None:
@@ -455,7 +687,7 @@ def update_volunteer_verticals(
 def create_volunteer_type(
     type_data: schemas.VolunteerTypeBase,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(get_current_active_user)
+    current_user: schemas.Principal = Depends(get_current_active_user)
 ):
     db_type = db.query(models.VolunteerType).filter(models.VolunteerType.name == type_data.name).first()
     if db_type:
@@ -464,18 +696,18 @@ def create_volunteer_type(
 
 
 @app.get("/jobtitles/", response_model=list[schemas.JobTitle])
-def get_jobtitles(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    db_jobtitles = crud.get_jobtitles(db)
-    if db_jobtitles is None:
-        raise HTTPException(status_code=404, detail="JobTitles not found")
-    return db_jobtitles
+def get_jobtitles(request: Request, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    return cached_reference_response(
+        request, "jobtitles", db, schemas.JobTitle,
+        lambda: crud.get_jobtitles(db), skip, limit,
+    )
 
 
 @app.post("/squads/", response_model=schemas.Squad)
 def create_squad(
     squad: schemas.SquadCreate,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(head_or_admin)
+    current_user: schemas.Principal = Depends(head_or_admin)
 ):
     db_squad = db.query(models.Squad).filter(models.Squad.name == squad.name).first()
     if db_squad:
@@ -483,9 +715,41 @@ def create_squad(
     return crud.create_squad(db=db, squad=squad)
 
 
-@app.get("/squads/", response_model=list[schemas.Squad])
-def get_squads(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_squads(db, skip=skip, limit=limit)
+@app.get("/squads/", response_model=Union[list[schemas.SquadList], list[schemas.Squad]], summary="Listar squads", description="Retorna os squads com seus projetos e o número de membros (members_count). Os membros ficam em /squads/{squad_id}/members, ou no campo volunteers com include_members.")
+async def get_squads(
+    skip: int = 0,
+    limit: int = 100,
+    include_members: bool = Query(False, description="Incluir os membros de cada squad no campo volunteers; sem ele, o campo não é enviado"),
+    db: AsyncSession = Depends(get_async_db_readonly)
+):
+    squads = await crud_async.get_squads(db, skip=skip, limit=limit, include_members=include_members)
+    adapter = TypeAdapter(list[schemas.Squad if include_members else schemas.SquadList])
+    return Response(adapter.dump_json(adapter.validate_python(squads, from_attributes=True)), media_type="application/json")
+
+
+@app.get("/squads/{squad_id}/members", response_model=list[schemas.VolunteerInSquad], summary="Listar membros do squad", description="Lista os membros de um squad com filtros e paginação por cursor (X-Next-Cursor).")
+async def get_squad_members(
+    squad_id: int,
+    response: Response,
+    limit: int = 100,
+    name: Optional[str] = None,
+    jobtitle_id: Optional[int] = None,
+    status_id: Optional[int] = None,
+    volunteer_type_id: Optional[int] = None,
+    order: str = Query("desc", enum=["asc", "desc"], description="Ordenação por data de criação"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado em X-Next-Cursor (paginação por keyset)"),
+    db: AsyncSession = Depends(get_async_db_readonly)
+):
+    if await db.get(models.Squad, squad_id) is None:
+        raise HTTPException(status_code=404, detail="Squad not found")
+    members = await crud_async.get_volunteers(
+        db, limit=limit, name=name, jobtitle_id=jobtitle_id, status_id=status_id, volunteer_type_id=volunteer_type_id,
+        squad_id=squad_id, order=order, cursor=cursor, loader_options=crud.member_summary_options()
+    )
+    if members and len(members) == limit:
+        last = members[-1]
+        response.headers["X-Next-Cursor"] = utils.encode_cursor(last.created_at, last.id)
+    return members
 
 
 @app.get("/squads/{squad_id}", response_model=schemas.Squad)
@@ -501,7 +765,7 @@ def update_squad(
     squad_id: int,
     squad: schemas.SquadUpdate,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(head_or_admin)
+    current_user: schemas.Principal = Depends(head_or_admin)
 ):
     updated_squad = crud.update_squad(db, squad_id=squad_id, squad=squad)
     if updated_squad is None:
@@ -513,7 +777,7 @@ def update_squad(
 def delete_squad(
     squad_id: int,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(admin_only)
+    current_user: schemas.Principal = Depends(admin_only)
 ):
     db_squad = crud.delete_squad(db, squad_id=squad_id)
     if db_squad is None:
@@ -525,7 +789,7 @@ def delete_squad(
 def create_volunteer_status(
     status: schemas.VolunteerStatusCreate,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(get_current_active_user) # Assuming status creation is restricted
+    current_user: schemas.Principal = Depends(get_current_active_user) # Assuming status creation is restricted
 ):
     db_status = db.query(models.VolunteerStatus).filter(models.VolunteerStatus.name == status.name).first()
     if db_status:
@@ -534,51 +798,18 @@ def create_volunteer_status(
 
 
 @app.get("/volunteer-statuses/", response_model=list[schemas.VolunteerStatus])
-def get_volunteer_statuses(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_volunteer_statuses(db, skip=skip, limit=limit)
+def get_volunteer_statuses(request: Request, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    return cached_reference_response(
+        request, "volunteer_statuses", db, schemas.VolunteerStatus,
+        lambda: crud.get_volunteer_statuses(db, skip=skip, limit=limit), skip, limit,
+    )
 
 
 @app.get("/dashboard/stats", response_model=schemas.DashboardStats, summary="Estatísticas do Dashboard", description="Retorna estatísticas para o dashboard, incluindo contagem de voluntários por status e cadastros realizados hoje.")
-def get_dashboard_stats(
-    db: Session = Depends(get_db)
+async def get_dashboard_stats(
+    db: AsyncSession = Depends(get_async_db_readonly)
 ):
-    return crud.get_dashboard_stats(db)
-
-
-def send_email(email, name):
-    if not os.getenv("BREVO_API_KEY"):
-        print("BREVO_API_KEY not set, skipping email.")
-        return
-
-    print(
-        "Email: ",
-    )
-    try:
-        configuration = sib_api_v3_sdk.Configuration()
-        configuration.api_key["api-key"] = os.getenv("BREVO_API_KEY")
-
-        api_instance = sib_api_v3_sdk.TransactionalEmailsApi(
-            sib_api_v3_sdk.ApiClient(configuration)
-        )
-
-        send_smtp_email = sib_api_v3_sdk.SendSmtpEmail(
-            to=[{"email": email, "name": name}],
-            template_id=9,
-            params={"name": name, "email": email, "contact": {"NAME": name}, "NOME": name},
-            headers={
-                "X-Mailin-custom": "custom_header_1:custom_value_1|custom_header_2:custom_value_2|custom_header_3:custom_value_3",
-                "charset": "iso-8859-1",
-            },
-        )  # SendSmtpEmail | Values to send a transactional email
-
-        print("Email: ", os.getenv("BREVO_API_KEY") )
-        api_response = api_instance.send_transac_email(send_smtp_email)
-        pprint(api_response)
-
-    except ApiException as e:
-        print("Exception when calling AccountApi->get_account: %s\n" % e)
-
-    return
+    return await crud_async.get_dashboard_stats(db)
 
 
 # Projects
@@ -586,15 +817,15 @@ def send_email(email, name):
 def create_project(
     project: schemas.ProjectCreate,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(head_or_admin)
+    current_user: schemas.Principal = Depends(head_or_admin)
 ):
     return crud.create_project(db=db, project=project)
 
-@app.get("/projects/", response_model=list[schemas.Project], summary="Listar projetos", description="Retorna uma lista de todos os projetos.")
+@app.get("/projects/", response_model=list[schemas.ProjectList], summary="Listar projetos", description="Retorna uma lista de todos os projetos com um resumo dos squads (sem os membros, apenas members_count).")
 def get_projects(
     skip: int = 0, 
     limit: int = 100, 
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_readonly)
 ):
     return crud.get_projects(db, skip=skip, limit=limit)
 
@@ -612,7 +843,7 @@ def get_project(
 def delete_project(
     project_id: int, 
     db: Session = Depends(get_db), 
-    current_user: schemas.User = Depends(admin_only)
+    current_user: schemas.Principal = Depends(admin_only)
 ):
     db_project = crud.delete_project(db, project_id=project_id)
     if db_project is None:
@@ -626,7 +857,7 @@ def create_feedback(
     volunteer_id: int, 
     feedback: schemas.FeedbackCreate, 
     db: Session = Depends(get_db), 
-    current_user: schemas.User = Depends(mentor_or_above)
+    current_user: schemas.Principal = Depends(mentor_or_above)
 ):
     # Check if volunteer exists
     db_volunteer = crud.get_volunteer_by_id(db, volunteer_id=volunteer_id)
@@ -652,7 +883,7 @@ def update_feedback(
     feedback_id: int, 
     feedback: schemas.FeedbackUpdate, 
     db: Session = Depends(get_db), 
-    current_user: schemas.User = Depends(mentor_or_above)
+    current_user: schemas.Principal = Depends(mentor_or_above)
 ):
     db_feedback = crud.get_feedback(db, feedback_id=feedback_id)
     if not db_feedback:
@@ -667,7 +898,7 @@ def update_feedback(
 def delete_feedback(
     feedback_id: int, 
     db: Session = Depends(get_db), 
-    current_user: schemas.User = Depends(mentor_or_above)
+    current_user: schemas.Principal = Depends(mentor_or_above)
 ):
     db_feedback = crud.get_feedback(db, feedback_id=feedback_id)
     if not db_feedback:
@@ -685,17 +916,17 @@ def delete_feedback(
 def create_job(
     job: schemas.JobOpeningCreate,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(head_or_admin)
+    current_user: schemas.Principal = Depends(head_or_admin)
 ):
     return crud.create_job_opening(db=db, job=job, user_id=current_user.id)
 
 
-@app.get("/jobs/", response_model=list[schemas.JobOpening], summary="Listar vagas", description="Lista todas as vagas (pode filtrar por ativas).")
+@app.get("/jobs/", response_model=list[schemas.JobOpeningList], summary="Listar vagas", description="Lista todas as vagas (pode filtrar por ativas) com o número de candidaturas. Os candidatos ficam em /jobs/{job_id}/applications.")
 def read_jobs(
     skip: int = 0, 
     limit: int = 100, 
     active_only: bool = False,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_readonly)
 ):
     return crud.get_job_openings(db, skip=skip, limit=limit, active_only=active_only)
 
@@ -716,7 +947,7 @@ def update_job(
     job_id: int, 
     job: schemas.JobOpeningCreate, 
     db: Session = Depends(get_db), 
-    current_user: schemas.User = Depends(head_or_admin)
+    current_user: schemas.Principal = Depends(head_or_admin)
 ):
     db_job = crud.update_job_opening(db, job_id=job_id, job=job)
     if db_job is None:
@@ -728,7 +959,7 @@ def update_job(
 def delete_job(
     job_id: int, 
     db: Session = Depends(get_db), 
-    current_user: schemas.User = Depends(admin_only)
+    current_user: schemas.Principal = Depends(admin_only)
 ):
     db_job = crud.delete_job_opening(db, job_id=job_id)
     if db_job is None:
@@ -759,13 +990,13 @@ def apply_for_job(
     return crud.create_job_application(db, application_data)
 
 
-@app.get("/jobs/{job_id}/applications", response_model=list[schemas.JobApplication], summary="Listar candidaturas", description="Lista candidaturas de uma vaga. Requer autenticação.")
+@app.get("/jobs/{job_id}/applications", response_model=list[schemas.JobApplication], summary="Listar candidaturas", description="Lista candidaturas de uma vaga, paginadas por skip/limit, com o perfil de cada candidato. Requer autenticação.")
 def read_job_applications(
     job_id: int,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(mentor_or_above)
+    current_user: schemas.Principal = Depends(mentor_or_above)
 ):
     return crud.get_job_applications(db, job_id=job_id, skip=skip, limit=limit)
 
@@ -776,7 +1007,7 @@ def create_certificate(
     volunteer_id: int,
     certificate: schemas.CertificateCreate,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(head_or_admin)
+    current_user: schemas.Principal = Depends(head_or_admin)
 ):
     if volunteer_id != certificate.volunteer_id:
         raise HTTPException(status_code=400, detail="Volunteer ID mismatch")
@@ -818,7 +1049,7 @@ def get_certificate(
 def cancel_certificate(
     certificate_id: int,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(head_or_admin)
+    current_user: schemas.Principal = Depends(head_or_admin)
 ):
     db_certificate = crud.get_certificate(db, certificate_id=certificate_id)
     if not db_certificate:
@@ -833,7 +1064,7 @@ def create_badge(
     volunteer_id: int,
     badge: schemas.BadgeCreate,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(mentor_or_above)
+    current_user: schemas.Principal = Depends(mentor_or_above)
 ):
     if volunteer_id != badge.volunteer_id:
         raise HTTPException(status_code=400, detail="Volunteer ID mismatch")
@@ -849,7 +1080,7 @@ def create_badge(
 def get_volunteer_badges(
     volunteer_id: int,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(get_current_active_user)
+    current_user: schemas.Principal = Depends(get_current_active_user)
 ):
     db_volunteer = crud.get_volunteer_by_id(db, volunteer_id=volunteer_id)
     if not db_volunteer:
@@ -862,7 +1093,7 @@ def get_volunteer_badges(
 def delete_badge(
     badge_id: int,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(mentor_or_above)
+    current_user: schemas.Principal = Depends(mentor_or_above)
 ):
     db_badge = db.query(models.Badge).filter(models.Badge.id == badge_id).first()
     if not db_badge:
@@ -1,6 +1,6 @@
 import enum
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Text, DateTime, Date, Table, Enum
-from sqlalchemy.orm import relationship, foreign, remote
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Text, DateTime, Date, Table, Enum, Index, DDL, event
+from sqlalchemy.orm import relationship, foreign, remote, column_property
 from sqlalchemy.sql import func
 from sqlalchemy.ext.hybrid import hybrid_property
 
@@ -21,6 +21,8 @@ class User(Base):
     role = Column(Enum(UserRole), default=UserRole.MENTOR, nullable=False)
     reset_token = Column(String(255), nullable=True, index=True)
     reset_token_expires_at = Column(DateTime, nullable=True)
+    # Bumped on role change and password reset; tokens carrying an older value are rejected
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     items = relationship("Item", back_populates="owner")
     feedbacks = relationship("Feedback", back_populates="author")
@@ -134,6 +136,10 @@ class VolunteerType(Base):
 
 class Volunteer(Base):
     __tablename__ = "volunteer"
+    __table_args__ = (
+        Index("ix_volunteer_created_at_id", "created_at", "id"),
+        Index("ix_volunteer_name_email_fulltext", "name", "email", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
 
     id = Column(Integer, primary_key=True)
     name = Column(String(255), index=True)
@@ -146,9 +152,11 @@ class Volunteer(Base):
     is_active = Column(Boolean, default=True)
     is_apoiase_supporter = Column(Boolean, default=False)
     jobtitle_id = Column(Integer, ForeignKey("jobtitle.id"))
-    status_id = Column(Integer, ForeignKey("volunteer_status.id"), nullable=True)
-    volunteer_type_id = Column(Integer, ForeignKey("volunteer_type.id"), nullable=True)
-    squad_id = Column(Integer, ForeignKey("squad.id"), nullable=True)
+    # active_history keeps the previous value around so app.stats can move the
+    # volunteer between counter buckets even when the row was expired
+    status_id = column_property(Column(Integer, ForeignKey("volunteer_status.id"), nullable=True), active_history=True)
+    volunteer_type_id = column_property(Column(Integer, ForeignKey("volunteer_type.id"), nullable=True), active_history=True)
+    squad_id = column_property(Column(Integer, ForeignKey("squad.id"), nullable=True), active_history=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     jobtitle = relationship("JobTitle", back_populates="volunteers")
@@ -188,6 +196,32 @@ class Volunteer(Base):
         return self.email # Or return None if preferred for invalid emails
 
 
+# SQLite has no FULLTEXT index, so tests and local runs get an FTS5 external-content
+# table over volunteer(name, email) kept in sync by triggers.
+for ddl in (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS volunteer_fts USING fts5("
+    "name, email, content='volunteer', content_rowid='id')",
+    "CREATE TRIGGER volunteer_fts_ai AFTER INSERT ON volunteer BEGIN "
+    "INSERT INTO volunteer_fts(rowid, name, email) VALUES (new.id, new.name, new.email); END",
+    "CREATE TRIGGER volunteer_fts_ad AFTER DELETE ON volunteer BEGIN "
+    "INSERT INTO volunteer_fts(volunteer_fts, rowid, name, email) VALUES ('delete', old.id, old.name, old.email); END",
+    "CREATE TRIGGER volunteer_fts_au AFTER UPDATE OF name, email ON volunteer BEGIN "
+    "INSERT INTO volunteer_fts(volunteer_fts, rowid, name, email) VALUES ('delete', old.id, old.name, old.email); "
+    "INSERT INTO volunteer_fts(rowid, name, email) VALUES (new.id, new.name, new.email); END",
+):
+    event.listen(Volunteer.__table__, "after_create", DDL(ddl).execute_if(dialect="sqlite"))
+event.listen(Volunteer.__table__, "before_drop", DDL("DROP TABLE IF EXISTS volunteer_fts").execute_if(dialect="sqlite"))
+
+
+class VolunteerStats(Base):
+    __tablename__ = "volunteer_stats"
+
+    # dimension is "total", "status", "squad" or "type"; key_id is the grouped id (0 = none)
+    dimension = Column(String(20), primary_key=True)
+    key_id = Column(Integer, primary_key=True, autoincrement=False)
+    count = Column(Integer, nullable=False, default=0)
+
+
 class VolunteerStatusHistory(Base):
     __tablename__ = "volunteer_status_history"
 
@@ -252,6 +286,11 @@ class JobApplication(Base):
     job = relationship("JobOpening", back_populates="applications")
     volunteer = relationship("Volunteer")
 
+    __table_args__ = (
+        # One application per volunteer and job; crud.create_job_application upserts against it
+        Index("ix_job_application_job_id_volunteer_id", "job_id", "volunteer_id", unique=True),
+    )
+
 
 class Certificate(Base):
     __tablename__ = "certificates"
@@ -286,3 +325,25 @@ class Badge(Base):
         if self.issuer and self.issuer.volunteer:
             return self.issuer.volunteer.name
         return "***"
+
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+
+    # Transactional emails are committed here and delivered by app.mailer
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(50), nullable=False)
+    recipient_email = Column(String(255), nullable=False)
+    recipient_name = Column(String(255), nullable=True)
+    params = Column(Text, nullable=True)  # JSON encoded template params
+    idempotency_key = Column(String(255), nullable=False, unique=True)
+    status = Column(String(20), nullable=False, default="pending")  # pending, sent or failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
@@ -93,6 +93,25 @@ class Squad(SquadBase):
         orm_mode = True
 
 
+# GET /squads/ without include_members: no volunteers field, so it cannot be read as
+# "no members"; members_count and /squads/{id}/members take its place
+class SquadList(SquadBase):
+    id: int
+    projects: list[ProjectInSquad] = []
+    members_count: int = 0
+    projects_count: int = 0
+
+    class Config:
+        orm_mode = True
+
+
+class SquadSummary(SquadBase):
+    id: int
+    members_count: int = 0
+
+    class Config:
+        orm_mode = True
+
 class SquadUpdate(BaseModel):
     name: Optional[str] = Field(None, max_length=50)
     description: Optional[str] = Field(None, max_length=255)
@@ -167,9 +186,10 @@ class Vertical(VerticalBase):
     class Config:
         orm_mode = True
 
-class VerticalWithVolunteers(VerticalBase):
+class VerticalWithCounts(VerticalBase):
     id: int
-    volunteers: list['VolunteerInSquad'] = []
+    # ACTIVE volunteers only; they are listed by GET /verticals/{id}/volunteers
+    active_volunteers_count: int = 0
 
     class Config:
         orm_mode = True
@@ -331,6 +351,15 @@ class TokenData(BaseModel):
     username: Union[str, None] = None
 
 
+class Principal(BaseModel):
+    """The authenticated user as resolved from the access token."""
+    id: int
+    email: str
+    role: UserRole
+    is_active: bool = True
+    token_version: int = 0
+
+
 class UserAuth(BaseModel):
     username: str
     email: str
@@ -364,6 +393,37 @@ class DashboardStats(BaseModel):
     total_volunteers: int
 
 
+class ApoiaseSyncReport(BaseModel):
+    checked: int
+    supporters: int
+    updated: int
+    errors: int
+    seconds: float
+    per_second: float
+
+
+class ApoiaseSyncStatus(BaseModel):
+    running: bool
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    report: Optional[ApoiaseSyncReport] = None
+    error: Optional[str] = None
+
+
+class VolunteerImportError(BaseModel):
+    line: int
+    email: Optional[str] = None
+    error: str
+
+
+class VolunteerImportReport(BaseModel):
+    received: int
+    created: int
+    duplicates: int
+    invalid: int
+    errors: list[VolunteerImportError] = []
+
+
 class VolunteerUpdateLinkRequest(BaseModel):
     email: str
 
@@ -402,6 +462,13 @@ class Project(ProjectBase):
     class Config:
         orm_mode = True
 
+class ProjectList(ProjectBase):
+    id: int
+    squads: list[SquadSummary] = []
+
+    class Config:
+        orm_mode = True
+
 User.model_rebuild()
 
 
@@ -465,6 +532,28 @@ class JobOpeningSummary(JobOpeningBase):
 
 
 
+class JobOpeningList(JobOpeningSummary):
+
+
+    # Applicants are listed by GET /jobs/{job_id}/applications
+    applications_count: int = 0
+
+
+
+
+
+    class Config:
+
+
+        orm_mode = True
+
+
+
+
+
+
+
+
 class JobApplicationBase(BaseModel):
 
 
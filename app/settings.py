@@ -7,14 +7,45 @@ class __Settings(BaseSettings):
     DB_HOST: str
     DB_PORT: int
     DB_DATABASE: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20 # extra connections opened under bursts, closed when returned
+    DB_ASYNC_POOL_SIZE: int = 4 # separate pool for the async routes, on top of DB_POOL_SIZE
+    DB_ASYNC_MAX_OVERFLOW: int = 8
+    DB_POOL_TIMEOUT_SECONDS: float = 30 # how long a request waits for a free connection
+    DB_POOL_RECYCLE_SECONDS: int = 1800 # -1 disables; keep below MySQL wait_timeout
+    DB_POOL_PRE_PING: bool = True
+    DB_REPLICA_HOST: str = "" # read replica for the listing/profile endpoints; empty sends every read to DB_HOST
+    DB_REPLICA_PORT: int = 0 # 0 uses DB_PORT
+    DB_REPLICA_STICKY_SECONDS: int = 10 # after a write, that client keeps reading from the primary this long
     JWT_SECRETE_KEY: str
     PASSWORD_HASH_ALGORITHM: str
     JWT_EXPIRE_MINUTES: int
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = 60 # how long a user's token_version is trusted without a DB read
     BREVO_API_KEY: str
     REGISTRATION_CODE: str = "changeme"
     BASE_FRONTEND_URL: str = "http://localhost:5173" # Default for local development
     APOIASE_API_KEY: str = ""
     APOIASE_API_SECRET: str = ""
+    APOIASE_TIMEOUT_SECONDS: float = 10
+    APOIASE_SYNC_BATCH_SIZE: int = 200 # volunteers checked and written per batch
+    APOIASE_SYNC_CONCURRENCY: int = 5 # simultaneous requests to APOIA.se
+    APOIASE_SYNC_RATE_PER_SECOND: float = 10 # 0 disables the rate limit
+    STATS_RECONCILE_INTERVAL_SECONDS: int = 3600 # 0 disables the periodic volunteer_stats reconcile
+    REFERENCE_CACHE_TTL_SECONDS: int = 300 # in-process cache for /jobtitles/, /verticals/ and other lookup lists
+    REFERENCE_CACHE_MAXSIZE: int = 256
+    REFERENCE_CACHE_MAX_AGE_SECONDS: int = 60 # Cache-Control max-age sent to browsers/CDNs
+    PROFILE_CACHE_TTL_SECONDS: int = 300 # in-process cache for /volunteers/{id}/public, dropped on any change to the volunteer
+    PROFILE_CACHE_MAXSIZE: int = 2000
+    BREVO_POOL_MAXSIZE: int = 10 # connections kept open to the Brevo API
+    BREVO_CONNECT_TIMEOUT_SECONDS: float = 3
+    BREVO_READ_TIMEOUT_SECONDS: float = 10
+    BULK_IMPORT_CHUNK_SIZE: int = 500 # volunteers validated, deduplicated and inserted per transaction
+    EXPORT_BATCH_SIZE: int = 1000 # rows fetched by each query and written per chunk of /volunteers/export
+    BLOCKING_EXECUTOR_WORKERS: int = 4 # threads for password hashing and sync DB calls made from async routes (app.concurrency)
+    MAILER_TRANSPORT: str = "brevo" # "fake" records emails instead of sending them
+    MAILER_POLL_INTERVAL_SECONDS: int = 5 # 0 disables the in-process worker (run python -m app.mailer instead)
+    MAILER_MAX_ATTEMPTS: int = 6
+    MAILER_BACKOFF_SECONDS: int = 30 # doubled after every failed attempt
 
     model_config = SettingsConfigDict(env_file=('../.env'), env_file_encoding='utf-8')
 
@@ -0,0 +1,150 @@
+"""
+Incrementally maintained volunteer counters behind /dashboard/stats.
+
+Every Volunteer insert, delete or change of status/squad/type moves the row
+between buckets of the volunteer_stats table inside the same flush, so the
+dashboard reads a handful of rows instead of grouping the volunteer table.
+Writes that bypass the ORM (bulk core statements) must adjust the counters
+themselves or rely on reconcile_volunteer_stats, which also runs periodically
+to correct any drift.
+
+Run a one-off reconcile with: python -m app.stats
+"""
+import asyncio
+import logging
+
+from sqlalchemy import event, func, inspect, update
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import Session
+
+from app import models
+
+logger = logging.getLogger(__name__)
+
+TOTAL = "total"
+# dashboard dimension -> Volunteer column it groups by
+DIMENSIONS = {
+    "status": "status_id",
+    "squad": "squad_id",
+    "type": "volunteer_type_id",
+}
+
+stats_table = models.VolunteerStats.__table__
+
+
+def bump(connection, dimension: str, key_id, delta: int):
+    key_id = key_id or 0
+    values = {"dimension": dimension, "key_id": key_id, "count": delta}
+    if connection.dialect.name == "mysql":
+        stmt = mysql.insert(stats_table).values(**values)
+        stmt = stmt.on_duplicate_key_update(count=stats_table.c.count + delta)
+    elif connection.dialect.name == "sqlite":
+        stmt = sqlite.insert(stats_table).values(**values).on_conflict_do_update(
+            index_elements=["dimension", "key_id"],
+            set_={"count": stats_table.c.count + delta},
+        )
+    else:
+        result = connection.execute(
+            update(stats_table)
+            .where(stats_table.c.dimension == dimension, stats_table.c.key_id == key_id)
+            .values(count=stats_table.c.count + delta)
+        )
+        if result.rowcount:
+            return
+        stmt = stats_table.insert().values(**values)
+    connection.execute(stmt)
+
+
+@event.listens_for(models.Volunteer, "after_insert")
+def _count_inserted_volunteer(mapper, connection, target):
+    bump(connection, TOTAL, 0, 1)
+    for dimension, attr in DIMENSIONS.items():
+        bump(connection, dimension, getattr(target, attr), 1)
+
+
+@event.listens_for(models.Volunteer, "after_delete")
+def _count_deleted_volunteer(mapper, connection, target):
+    bump(connection, TOTAL, 0, -1)
+    for dimension, attr in DIMENSIONS.items():
+        bump(connection, dimension, getattr(target, attr), -1)
+
+
+@event.listens_for(models.Volunteer, "after_update")
+def _count_updated_volunteer(mapper, connection, target):
+    state = inspect(target)
+    for dimension, attr in DIMENSIONS.items():
+        history = state.attrs[attr].history
+        if not history.has_changes():
+            continue
+        old = history.deleted[0] if history.deleted else None
+        new = history.added[0] if history.added else None
+        if (old or 0) != (new or 0):
+            bump(connection, dimension, old, -1)
+            bump(connection, dimension, new, 1)
+
+
+def get_volunteer_counts(db: Session):
+    """Returns {(dimension, key_id): count} from the summary table."""
+    return {
+        (row.dimension, row.key_id): row.count
+        for row in db.query(models.VolunteerStats).all()
+    }
+
+
+def count_volunteers(db: Session):
+    """Computes the volunteer_stats buckets straight from the volunteer table."""
+    expected = {(TOTAL, 0): db.query(func.count(models.Volunteer.id)).scalar()}
+    for dimension, attr in DIMENSIONS.items():
+        column = getattr(models.Volunteer, attr)
+        key = func.coalesce(column, 0)
+        for key_id, count in db.query(key, func.count(models.Volunteer.id)).group_by(key).all():
+            expected[(dimension, key_id)] = count
+    return expected
+
+
+def reconcile_volunteer_stats(db: Session) -> int:
+    """
+    Rebuilds volunteer_stats from the volunteer table and returns how many
+    buckets had drifted.
+    """
+    expected = count_volunteers(db)
+
+    current = get_volunteer_counts(db)
+    drifted = sum(
+        1 for bucket in set(current) | set(expected)
+        if current.get(bucket, 0) != expected.get(bucket, 0)
+    )
+
+    db.query(models.VolunteerStats).delete()
+    db.add_all([
+        models.VolunteerStats(dimension=dimension, key_id=key_id, count=count)
+        for (dimension, key_id), count in expected.items()
+    ])
+    db.commit()
+    if drifted:
+        logger.warning(f"volunteer_stats reconciled, {drifted} bucket(s) had drifted")
+    return drifted
+
+
+async def reconcile_periodically(session_factory, interval_seconds: int):
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(_reconcile_with_new_session, session_factory)
+        except Exception as e:
+            logger.error(f"volunteer_stats reconcile failed: {e}")
+
+
+def _reconcile_with_new_session(session_factory):
+    db = session_factory()
+    try:
+        return reconcile_volunteer_stats(db)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    drifted = _reconcile_with_new_session(SessionLocal)
+    print(f"volunteer_stats reconciled ({drifted} bucket(s) corrected)")
@@ -1,9 +1,11 @@
 from sqlalchemy.orm import Session, joinedload
-from app import models
+from app import models, mail_client
 import secrets
 import logging
 import os
-import sib_api_v3_sdk
+import base64
+import json
+from datetime import datetime
 from sib_api_v3_sdk.rest import ApiException
 from pprint import pprint
 
@@ -23,6 +25,72 @@ def get_users(db: Session, skip: int = 0, limit: int = 100):
 def generate_edit_token():
     return secrets.token_urlsafe(32)
 
+def encode_cursor(created_at: datetime, volunteer_id: int) -> str:
+    """
+    Builds the opaque keyset cursor pointing just after the given (created_at, id) row.
+    """
+    payload = json.dumps([created_at.isoformat() if created_at else None, volunteer_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    """
+    Reverses encode_cursor. Raises ValueError for anything that is not a cursor we issued.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, volunteer_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(created_at) if created_at else None), int(volunteer_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+WELCOME_TEMPLATE_ID = 9
+WELCOME_HEADERS = {
+    "X-Mailin-custom": "custom_header_1:custom_value_1|custom_header_2:custom_value_2|custom_header_3:custom_value_3",
+    "charset": "iso-8859-1",
+}
+
+def welcome_email_params(email: str, name: str):
+    return {"name": name, "email": email, "contact": {"NAME": name}, "NOME": name}
+
+def send_welcome_email(email: str, name: str):
+    """
+    Sends the signup confirmation email via Brevo using template 9.
+    """
+    if not os.getenv("BREVO_API_KEY"):
+        logger.warning("BREVO_API_KEY not set, skipping actual email sending.")
+        return True
+
+    try:
+        api_response = mail_client.send(
+            email, name, WELCOME_TEMPLATE_ID, welcome_email_params(email, name), headers=WELCOME_HEADERS
+        )
+        pprint(api_response)
+        return True
+
+    except ApiException as e:
+        logger.error(f"Exception when calling TransactionalEmailsApi->send_transac_email: {e}")
+        return False
+
+def send_welcome_emails(recipients: list[tuple[str, str]]):
+    """
+    Sends the signup confirmation to many (email, name) pairs in batched Brevo requests.
+    """
+    if not os.getenv("BREVO_API_KEY"):
+        logger.warning("BREVO_API_KEY not set, skipping actual email sending.")
+        return True
+
+    try:
+        mail_client.send_batch(
+            WELCOME_TEMPLATE_ID,
+            [{"email": email, "name": name, "params": welcome_email_params(email, name)} for email, name in recipients],
+            headers=WELCOME_HEADERS,
+        )
+        return True
+
+    except ApiException as e:
+        logger.error(f"Exception when calling TransactionalEmailsApi->send_transac_email: {e}")
+        return False
+
 def send_edit_link_email(email: str, name: str, link: str):
     """
     Sends an email with the edit link via Brevo.
@@ -39,23 +107,8 @@ def send_edit_link_email(email: str, name: str, link: str):
         return True
 
     try:
-        configuration = sib_api_v3_sdk.Configuration()
-        configuration.api_key["api-key"] = os.getenv("BREVO_API_KEY")
-
-        api_instance = sib_api_v3_sdk.TransactionalEmailsApi(
-            sib_api_v3_sdk.ApiClient(configuration)
-        )
-
-        send_smtp_email = sib_api_v3_sdk.SendSmtpEmail(
-            to=[{"email": email, "name": name}], # Pass name to 'to' field if template uses it
-            template_id=10,
-            params={"link_edit": link, "name": name},
-            headers={
-                "charset": "iso-8859-1",
-            },
-        )
-
-        api_response = api_instance.send_transac_email(send_smtp_email)
+        # Pass name to 'to' field if template uses it
+        api_response = mail_client.send(email, name, 10, {"link_edit": link, "name": name})
         pprint(api_response)
         return True
 
@@ -78,23 +131,7 @@ def send_password_reset_email(email: str, name: str, link: str):
         return True
 
     try:
-        configuration = sib_api_v3_sdk.Configuration()
-        configuration.api_key["api-key"] = os.getenv("BREVO_API_KEY")
-
-        api_instance = sib_api_v3_sdk.TransactionalEmailsApi(
-            sib_api_v3_sdk.ApiClient(configuration)
-        )
-
-        send_smtp_email = sib_api_v3_sdk.SendSmtpEmail(
-            to=[{"email": email, "name": name}],
-            template_id=12,
-            params={"reset_password": link},
-            headers={
-                "charset": "iso-8859-1",
-            },
-        )
-
-        api_instance.send_transac_email(send_smtp_email)
+        mail_client.send(email, name, 12, {"reset_password": link})
         return True
 
     except ApiException as e:
@@ -118,27 +155,10 @@ def send_discord_invite_email(email: str, name: str):
         return True
 
     try:
-        configuration = sib_api_v3_sdk.Configuration()
-        configuration.api_key["api-key"] = os.getenv("BREVO_API_KEY")
-
-        api_instance = sib_api_v3_sdk.TransactionalEmailsApi(
-            sib_api_v3_sdk.ApiClient(configuration)
-        )
-
         template_id = int(os.getenv("BREVO_DISCORD_TEMPLATE_ID", 11))
-
-        send_smtp_email = sib_api_v3_sdk.SendSmtpEmail(
-            to=[{"email": email, "name": name}],
-            template_id=template_id,
-            params={"discord_link": invite_link, "name": name},
-            headers={
-                "charset": "iso-8859-1",
-            },
-        )
-
-        api_response = api_instance.send_transac_email(send_smtp_email)
+        mail_client.send(email, name, template_id, {"discord_link": invite_link, "name": name})
         return True
 
     except ApiException as e:
         logger.error(f"Exception when calling TransactionalEmailsApi->send_transac_email: {e}")
-        return False
\ No newline at end of file
+        return False
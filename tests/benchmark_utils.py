@@ -0,0 +1,71 @@
+"""
+Helpers shared by the benchmark tests: a SQLite engine that counts the rows the
+driver actually hands back to SQLAlchemy, plus a small timer.
+"""
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine
+
+
+class FetchStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.rows = 0
+        self.queries = 0
+
+
+class _CountingCursor(sqlite3.Cursor):
+    def execute(self, *args, **kwargs):
+        self.connection.stats.queries += 1
+        return super().execute(*args, **kwargs)
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            self.connection.stats.rows += 1
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = super().fetchmany(*args, **kwargs)
+        self.connection.stats.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        self.connection.stats.rows += len(rows)
+        return rows
+
+
+class _CountingConnection(sqlite3.Connection):
+    stats = None
+
+    def cursor(self, factory=_CountingCursor):
+        return super().cursor(factory)
+
+
+def counting_sqlite_engine(path):
+    """Returns (engine, stats) for a SQLite file whose fetched rows are tallied in stats."""
+    stats = FetchStats()
+
+    def connect():
+        conn = sqlite3.connect(path, factory=_CountingConnection, check_same_thread=False)
+        conn.stats = stats
+        return conn
+
+    return create_engine("sqlite://", creator=connect), stats
+
+
+@contextmanager
+def measure(stats):
+    """Yields a dict filled with rows, queries and elapsed seconds for the block."""
+    result = {}
+    stats.reset()
+    start = time.perf_counter()
+    yield result
+    result["seconds"] = time.perf_counter() - start
+    result["rows"] = stats.rows
+    result["queries"] = stats.queries
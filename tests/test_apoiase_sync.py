@@ -0,0 +1,173 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database import Base, get_db
+from app.auth import admin_only
+from app.settings import settings
+from app import integrations, models, schemas
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_apoiase_sync.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+def override_admin_only():
+    return schemas.User(id=1, email="admin@example.com", is_active=True, items=[])
+
+client = TestClient(app)
+
+VOLUNTEERS = 25
+
+@pytest.fixture(scope="function", autouse=True)
+def setup_and_teardown_db(monkeypatch):
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setitem(app.dependency_overrides, admin_only, override_admin_only)
+    monkeypatch.setattr(settings, "APOIASE_API_KEY", "key")
+    monkeypatch.setattr(settings, "APOIASE_API_SECRET", "secret")
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    db.add(models.JobTitle(title="Developer", is_active=True))
+    db.add_all([
+        models.Volunteer(
+            name=f"Volunteer {i}", email=f"Volunteer{i}@example.com", linkedin="l", jobtitle_id=1,
+            # Volunteer 3 was a supporter and no longer is
+            is_apoiase_supporter=(i == 3),
+        )
+        for i in range(1, VOLUNTEERS + 1)
+    ])
+    db.commit()
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+class MockApoiase:
+    """Stands in for api.apoia.se: even-numbered volunteers are backers, volunteer 7 errors."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []
+
+    async def handler(self, request: httpx.Request):
+        self.requests.append(request)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.005)
+            email = request.url.path.rsplit("/", 1)[-1]
+            number = int(email.removeprefix("volunteer").split("@")[0])
+            if number == 7:
+                return httpx.Response(500, text="upstream error")
+            return httpx.Response(200, json={"isPaidThisMonth": False, "isBacker": number % 2 == 0})
+        finally:
+            self.in_flight -= 1
+
+    def client(self):
+        return integrations.new_apoiase_client(transport=httpx.MockTransport(self.handler))
+
+
+@pytest.fixture
+def update_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE volunteer "):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+def supporter_flags():
+    db = TestingSessionLocal()
+    flags = dict(db.query(models.Volunteer.id, models.Volunteer.is_apoiase_supporter).all())
+    db.close()
+    return flags
+
+def run_sync(mock, **kwargs):
+    async def main():
+        async with mock.client() as http_client:
+            return await integrations.sync_apoiase_supporters(TestingSessionLocal, client=http_client, **kwargs)
+    return asyncio.run(main())
+
+def test_sync_updates_flags_with_one_update_per_batch(update_statements):
+    mock = MockApoiase()
+    report = run_sync(mock, batch_size=10, concurrency=3, rate_per_second=0)
+
+    assert report["checked"] == VOLUNTEERS
+    assert report["supporters"] == 12
+    assert report["errors"] == 1
+    # 12 new backers plus volunteer 3 losing the flag
+    assert report["updated"] == 13
+    assert report["per_second"] > 0
+
+    flags = supporter_flags()
+    assert all(flags[i] is (i % 2 == 0) for i in flags if i != 7)
+    assert flags[7] is False
+    assert len(update_statements) == 3
+    assert mock.max_in_flight <= 3
+    assert mock.requests[0].headers["x-api-key"] == "key"
+    assert mock.requests[0].url.path == "/backers/charges/volunteer1@example.com"
+
+def test_failed_lookups_keep_the_current_flag():
+    db = TestingSessionLocal()
+    db.get(models.Volunteer, 7).is_apoiase_supporter = True
+    db.commit()
+    db.close()
+
+    run_sync(MockApoiase(), rate_per_second=0)
+    assert supporter_flags()[7] is True
+
+def test_rate_limit_spaces_out_requests():
+    started = time.perf_counter()
+    run_sync(MockApoiase(), concurrency=10, rate_per_second=100)
+    # 25 requests at 100/s need at least 24 intervals of 10 ms
+    assert time.perf_counter() - started >= 0.23
+
+def test_sync_endpoint_runs_in_the_background_one_at_a_time(monkeypatch):
+    mock = MockApoiase()
+    monkeypatch.setattr(integrations, "get_apoiase_client", mock.client)
+    monkeypatch.setattr(settings, "APOIASE_SYNC_RATE_PER_SECOND", 0)
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http_client:
+            started = await http_client.post("/volunteers/sync-apoiase")
+            # The retry of an admin who did not see the first answer
+            again = await http_client.post("/volunteers/sync-apoiase")
+            while (status := (await http_client.get("/volunteers/sync-apoiase/status")).json())["running"]:
+                await asyncio.sleep(0.01)
+            return started, again, status
+
+    started, again, status = asyncio.run(main())
+    assert started.status_code == 202
+    assert started.json()["running"] is True
+    assert again.status_code == 409
+    report = status["report"]
+    assert (report["checked"], report["updated"], report["errors"]) == (VOLUNTEERS, 13, 1)
+    assert status["finished_at"] is not None and status["error"] is None
+    assert len(mock.requests) == VOLUNTEERS
+    assert supporter_flags()[2] is True
+    # Finished, so the next request may start another one
+    assert not integrations._sync_lock.locked()
+
+def test_sync_endpoint_requires_credentials(monkeypatch):
+    monkeypatch.setattr(settings, "APOIASE_API_SECRET", "")
+    response = client.post("/volunteers/sync-apoiase")
+    assert response.status_code == 400
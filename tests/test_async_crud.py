@@ -0,0 +1,166 @@
+import asyncio
+import inspect
+
+import anyio.to_thread
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database import Base, get_db, get_async_db, get_async_engine
+from app.auth import mentor_or_above
+from app import crud, crud_async, models, schemas
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_async_crud.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+AsyncTestingSessionLocal = async_sessionmaker(get_async_engine(engine.url), expire_on_commit=False)
+
+async def override_get_async_db():
+    async with AsyncTestingSessionLocal() as db:
+        yield db
+
+def override_mentor_or_above():
+    return schemas.User(id=1, email="mentor@example.com", is_active=True, items=[])
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function", autouse=True)
+def setup_and_teardown_db(monkeypatch):
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setitem(app.dependency_overrides, get_async_db, override_get_async_db)
+    monkeypatch.setitem(app.dependency_overrides, mentor_or_above, override_mentor_or_above)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    seed()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def seed():
+    db = TestingSessionLocal()
+    job = models.JobTitle(title="Developer", is_active=True)
+    active = models.VolunteerStatus(name="ACTIVE")
+    inactive = models.VolunteerStatus(name="INACTIVE")
+    junior = models.VolunteerType(name="Junior")
+    project = models.Project(name="Stars")
+    squad = models.Squad(name="Alpha", projects=[project])
+    backend = models.Vertical(name="Backend")
+    db.add_all([job, active, inactive, junior, squad, backend])
+    db.flush()
+
+    volunteers = [
+        models.Volunteer(
+            name=f"Volunteer {i}", email=f"volunteer{i}@example.com", linkedin="l",
+            jobtitle=job, volunteer_type=junior, squad=squad if i < 3 else None,
+            status=active if i < 3 else inactive, verticals=[backend],
+        )
+        for i in range(1, 4)
+    ]
+    volunteers[0].mentors = [volunteers[1]]
+    db.add_all(volunteers)
+    db.flush()
+    db.add(models.VolunteerStatusHistory(volunteer_id=volunteers[0].id, status_id=active.id))
+    db.commit()
+    db.close()
+
+def run_async(read):
+    async def main():
+        async with AsyncTestingSessionLocal() as db:
+            return await read(db)
+    return asyncio.run(main())
+
+def dump(schema, rows):
+    return [schema.model_validate(row, from_attributes=True).model_dump() for row in rows]
+
+def test_hot_read_routes_run_on_the_event_loop():
+    routes = {route.path: route.endpoint for route in app.routes if "GET" in getattr(route, "methods", ())}
+    for path in ("/volunteers/", "/volunteers/{volunteer_id}", "/squads/", "/verticals/", "/dashboard/stats"):
+        assert inspect.iscoroutinefunction(routes[path]), path
+
+def test_async_routes_do_not_use_the_threadpool(monkeypatch):
+    hops = []
+    run_sync = anyio.to_thread.run_sync
+
+    async def counting_run_sync(func, *args, **kwargs):
+        hops.append(getattr(func, "__name__", func))
+        return await run_sync(func, *args, **kwargs)
+
+    monkeypatch.setattr(anyio.to_thread, "run_sync", counting_run_sync)
+    for path in ("/squads/", "/verticals/", "/dashboard/stats", "/verticals/1/volunteers"):
+        assert client.get(path).status_code == 200, path
+    # Sessions come from async dependencies, not from get_db run in a worker thread
+    assert hops == []
+
+def test_async_engine_follows_the_sync_database():
+    assert get_async_engine(engine.url).url.drivername == "sqlite+aiosqlite"
+    assert get_async_engine(engine.url) is get_async_engine(SQLALCHEMY_DATABASE_URL)
+    mysql = get_async_engine("mysql+mysqlconnector://user:pass@db:3306/stars")
+    assert (mysql.url.drivername, mysql.url.password) == ("mysql+aiomysql", "pass")
+    with pytest.raises(ValueError):
+        get_async_engine("oracle://user:pass@db/stars")
+
+def test_async_reads_match_sync_reads():
+    db = TestingSessionLocal()
+    try:
+        expected = {
+            "volunteers": dump(schemas.VolunteerList, crud.get_volunteers(db)),
+            "volunteer": dump(schemas.Volunteer, [crud.get_volunteer_by_id(db, 1)]),
+            "squads": dump(schemas.Squad, crud.get_squads(db, include_members=True)),
+            "verticals": dump(schemas.VerticalWithCounts, crud.get_verticals(db)),
+            "stats": crud.get_dashboard_stats(db),
+        }
+    finally:
+        db.close()
+
+    async def read_all(async_db):
+        return {
+            "volunteers": dump(schemas.VolunteerList, await crud_async.get_volunteers(async_db)),
+            "volunteer": dump(schemas.Volunteer, [await crud_async.get_volunteer_by_id(async_db, 1)]),
+            "squads": dump(schemas.Squad, await crud_async.get_squads(async_db, include_members=True)),
+            "verticals": dump(schemas.VerticalWithCounts, await crud_async.get_verticals(async_db)),
+            "stats": await crud_async.get_dashboard_stats(async_db),
+        }
+
+    assert run_async(read_all) == expected
+
+def test_volunteer_routes():
+    volunteers = client.get("/volunteers/?order=asc").json()
+    assert [v["name"] for v in volunteers] == ["Volunteer 1", "Volunteer 2", "Volunteer 3"]
+    assert [m["name"] for m in volunteers[0]["squad"]["volunteers"]] == ["Volunteer 1", "Volunteer 2"]
+    assert volunteers[0]["squad"]["projects"][0]["name"] == "Stars"
+
+    volunteer = client.get("/volunteers/1").json()
+    assert volunteer["mentors"][0]["name"] == "Volunteer 2"
+    assert volunteer["status_history"][0]["status"]["name"] == "ACTIVE"
+    assert volunteer["verticals"][0]["name"] == "Backend"
+    assert client.get("/volunteers/99").status_code == 404
+    assert client.get("/volunteers/?cursor=abc&q=vol").status_code == 400
+
+def test_squad_vertical_and_dashboard_routes():
+    squad = client.get("/squads/?include_members=true").json()[0]
+    assert (squad["members_count"], squad["projects_count"]) == (2, 1)
+    assert squad["volunteers"][0]["volunteer_type"]["name"] == "Junior"
+
+    vertical = client.get("/verticals/").json()[0]
+    # Only active volunteers are counted and listed under a vertical
+    assert vertical["active_volunteers_count"] == 2
+    volunteers = client.get(f"/verticals/{vertical['id']}/volunteers?order=asc").json()
+    assert [v["name"] for v in volunteers] == ["Volunteer 1", "Volunteer 2"]
+    assert volunteers[0]["status"]["name"] == "ACTIVE"
+
+    stats = client.get("/dashboard/stats").json()
+    assert stats["total_volunteers"] == 3
+    assert {"status": "INACTIVE", "count": 1} in stats["total_volunteers_by_status"]
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app import main, models
+from app.main import app
+from app.auth import get_password_hash
+from app.database import Base, get_db
+from app.settings import settings
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_blocking_executor.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False, "timeout": 30}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+PASSWORD = "burst-password"
+LOGINS = 3 * settings.BLOCKING_EXECUTOR_WORKERS
+
+@pytest.fixture(scope="function", autouse=True)
+def setup_and_teardown_db(monkeypatch):
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    db.add(models.User(email="burst@example.com", hashed_password=get_password_hash(PASSWORD)))
+    db.commit()
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def in_flight(monkeypatch):
+    """Wraps the login check to record the threads it runs on and how many run at once."""
+    seen = {"threads": set(), "running": 0, "peak": 0}
+    lock = threading.Lock()
+    authenticate_user = main.authenticate_user
+
+    def tracked(*args, **kwargs):
+        with lock:
+            seen["threads"].add(threading.current_thread().name)
+            seen["running"] += 1
+            seen["peak"] = max(seen["peak"], seen["running"])
+        try:
+            return authenticate_user(*args, **kwargs)
+        finally:
+            with lock:
+                seen["running"] -= 1
+
+    monkeypatch.setattr(main, "authenticate_user", tracked)
+    return seen
+
+def login_burst(in_flight):
+    """
+    Sends LOGINS logins at once and polls /health until they finish; returns the
+    login statuses and, per probe, whether a login was hashing when it completed.
+    """
+    async def main_():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            logins = asyncio.ensure_future(asyncio.gather(*[
+                client.post("/token", data={"username": "burst@example.com", "password": PASSWORD})
+                for _ in range(LOGINS)
+            ]))
+            overlapped = []
+            while not logins.done():
+                assert (await client.get("/health")).status_code == 200
+                overlapped.append(in_flight["running"] > 0)
+                await asyncio.sleep(0.01)
+            return [r.status_code for r in await logins], overlapped
+
+    return asyncio.run(main_())
+
+def test_health_is_served_while_logins_hash(in_flight):
+    statuses, overlapped = login_burst(in_flight)
+    assert statuses == [200] * LOGINS
+    # Hashing on the event loop would hold every probe until the hash was done
+    assert any(overlapped)
+
+def test_blocking_work_is_bounded_by_the_executor(in_flight):
+    statuses, _ = login_burst(in_flight)
+    assert statuses == [200] * LOGINS
+    assert all(name.startswith("blocking") for name in in_flight["threads"])
+    assert 1 < in_flight["peak"] <= settings.BLOCKING_EXECUTOR_WORKERS
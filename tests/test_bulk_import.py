@@ -0,0 +1,174 @@
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database import Base, get_db
+from app.auth import admin_only
+from app import bulk_import, models, schemas, stats
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_bulk_import.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+def override_admin_only():
+    return schemas.User(id=1, email="admin@example.com", is_active=True, items=[])
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function", autouse=True)
+def setup_and_teardown_db(monkeypatch):
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setitem(app.dependency_overrides, admin_only, override_admin_only)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    db.add_all([
+        models.JobTitle(title="Developer", is_active=True),
+        models.VolunteerStatus(name="INTERESTED"),
+        models.VolunteerType(name="Junior"),
+        models.VolunteerType(name="Senior"),
+        models.Vertical(name="Backend"),
+        models.Vertical(name="Frontend"),
+    ])
+    db.flush()
+    db.add(models.Volunteer(name="Existing", email="existing@example.com", linkedin="l", jobtitle_id=1))
+    db.commit()
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def insert_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO"):
+            statements.append((statement.split()[2], executemany))
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+CSV_ROWS = (
+    "name,email,linkedin,jobtitle_id,volunteer_type_id,vertical_ids\n"
+    "Ana,ana@example.com,https://linkedin.com/in/ana,1,,1;2\n"
+    "Bruno,bruno@example.com,https://linkedin.com/in/bruno,1,2,\n"
+    "Existing,existing@example.com,l,1,,\n"
+    "Ana again,ana@example.com,l,1,,\n"
+    "No job,nojob@example.com,l,,,\n"
+    "Carla,carla@example.com,l,1,,99\n"
+)
+
+def run_import(text, format=bulk_import.CSV, **kwargs):
+    db = TestingSessionLocal()
+    try:
+        return bulk_import.import_volunteers(db, io.StringIO(text), format, **kwargs)
+    finally:
+        db.close()
+
+def test_csv_import_validates_dedupes_and_creates(insert_statements):
+    report = run_import(CSV_ROWS, chunk_size=2)
+    assert (report["received"], report["created"], report["duplicates"], report["invalid"]) == (6, 3, 2, 1)
+    assert report["errors"] == [{"line": 6, "email": "nojob@example.com", "error": "jobtitle_id: Field required"}]
+
+    db = TestingSessionLocal()
+    ana = db.query(models.Volunteer).filter_by(email="ana@example.com").one()
+    assert ana.name == "Ana"
+    assert [v.name for v in ana.verticals] == ["Backend", "Frontend"]
+    assert [h.status.name for h in ana.status_history] == ["INTERESTED"]
+    assert ana.volunteer_type.name == "Junior"
+    bruno = db.query(models.Volunteer).filter_by(email="bruno@example.com").one()
+    assert bruno.volunteer_type.name == "Senior"
+    # Unknown vertical ids are dropped
+    assert db.query(models.Volunteer).filter_by(email="carla@example.com").one().verticals == []
+
+    # Welcome emails are queued, not sent
+    outbox = db.query(models.EmailOutbox).order_by(models.EmailOutbox.id).all()
+    assert [(m.kind, m.recipient_email, m.status) for m in outbox] == [
+        ("welcome", "ana@example.com", "pending"),
+        ("welcome", "bruno@example.com", "pending"),
+        ("welcome", "carla@example.com", "pending"),
+    ]
+    assert stats.get_volunteer_counts(db)[(stats.TOTAL, 0)] == 4
+    # The counters bumped by the import match a full recount
+    assert stats.reconcile_volunteer_stats(db) == 0
+    db.close()
+
+    # One INSERT per chunk, never one per volunteer: the first chunk is an executemany
+    volunteer_inserts = [many for table, many in insert_statements if table == "volunteer"]
+    assert volunteer_inserts == [True, False]
+
+def test_ndjson_import_reports_bad_lines():
+    lines = [
+        json.dumps({"name": "Dora", "email": "dora@example.com", "linkedin": "l", "jobtitle_id": 1, "vertical_ids": [2]}),
+        "",
+        "{not json",
+        json.dumps(["a list"]),
+        json.dumps({"name": "Eva", "email": "eva@example.com", "linkedin": "l", "jobtitle_id": 0}),
+    ]
+    report = run_import("\n".join(lines), bulk_import.NDJSON, send_welcome_email=False)
+    assert (report["received"], report["created"], report["invalid"]) == (4, 1, 3)
+    assert [e["line"] for e in report["errors"]] == [3, 4, 5]
+    assert report["errors"][2]["error"] == "We need jobtitle_id"
+
+    db = TestingSessionLocal()
+    assert db.query(models.EmailOutbox).count() == 0
+    assert [v.name for v in db.query(models.Volunteer).filter_by(email="dora@example.com").one().verticals] == ["Frontend"]
+    db.close()
+
+def test_reimporting_the_same_file_creates_nothing():
+    run_import(CSV_ROWS)
+    report = run_import(CSV_ROWS)
+    assert (report["created"], report["duplicates"]) == (0, 5)
+
+def test_duplicate_emails_ignore_case_and_spaces():
+    rows = (
+        "name,email,linkedin,jobtitle_id\n"
+        "Existing,EXISTING@Example.com,l,1\n"
+        "Gabi,gabi@example.com,l,1\n"
+        "Gabi again, Gabi@EXAMPLE.com ,l,1\n"
+    )
+    report = run_import(rows, send_welcome_email=False)
+    assert (report["created"], report["duplicates"]) == (1, 2)
+
+    db = TestingSessionLocal()
+    assert sorted(email for (email,) in db.query(models.Volunteer.email)) == ["existing@example.com", "gabi@example.com"]
+    db.close()
+
+def test_import_endpoint():
+    response = client.post(
+        "/volunteers/import",
+        files={"file": ("cohort.csv", CSV_ROWS.encode(), "text/csv")},
+    )
+    assert response.status_code == 200
+    assert response.json()["created"] == 3
+
+    ndjson = json.dumps({"name": "Fabio", "email": "fabio@example.com", "linkedin": "l", "jobtitle_id": 1})
+    response = client.post(
+        "/volunteers/import?send_welcome_email=false",
+        files={"file": ("cohort.jsonl", ndjson.encode(), "application/x-ndjson")},
+    )
+    assert response.json()["created"] == 1
+    assert client.get("/volunteers/5/public").json()["name"] == "Fabio"
+
+def test_import_needs_the_default_status():
+    db = TestingSessionLocal()
+    db.query(models.VolunteerStatus).delete()
+    db.commit()
+    db.close()
+    response = client.post("/volunteers/import", files={"file": ("cohort.csv", CSV_ROWS.encode(), "text/csv")})
+    assert response.status_code == 400
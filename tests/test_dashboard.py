@@ -1,10 +1,11 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime, timedelta, timezone
 from app.main import app, get_current_active_user
-from app.database import Base, get_db
+from app.database import Base, get_db, get_async_db, get_async_engine
 from app import models, schemas
 
 # Setup test database
@@ -21,6 +22,12 @@ def override_get_db():
     finally:
         db.close()
 
+AsyncTestingSessionLocal = async_sessionmaker(get_async_engine(engine.url), expire_on_commit=False)
+
+async def override_get_async_db():
+    async with AsyncTestingSessionLocal() as db:
+        yield db
+
 # Mock authenticated user
 def override_get_current_active_user():
     return schemas.User(
@@ -28,6 +35,7 @@ def override_get_current_active_user():
     )
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
 app.dependency_overrides[get_current_active_user] = override_get_current_active_user
 
 client = TestClient(app)
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.main import app
+from app.db_pool import TimedAsyncQueuePool, TimedQueuePool, pool_status
+from app.settings import settings
+from app import database
+
+client = TestClient(app)
+
+DB_PATH = "./test_db_pool.db"
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        f"sqlite:///{DB_PATH}",
+        connect_args={"check_same_thread": False},
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.2,
+        pool_pre_ping=True,
+    )
+    yield engine
+    engine.dispose()
+
+def test_gauges_follow_checkouts(engine):
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        status = pool_status(engine)
+        assert (status["pool_size"], status["max_overflow"], status["in_use"]) == (1, 0, 1)
+
+    status = pool_status(engine)
+    assert (status["in_use"], status["idle"]) == (0, 1)
+    assert status["checkout"]["checkouts"] == 1
+    assert status["checkout"]["timeouts"] == 0
+
+def test_waiting_and_timed_out_checkouts_are_recorded(engine):
+    holding = engine.connect()
+
+    def release_soon():
+        time.sleep(0.05)
+        holding.close()
+
+    # Pool exhausted: the first extra checkout times out, the second waits for the release
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+
+    threading.Thread(target=release_soon).start()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    checkout = pool_status(engine)["checkout"]
+    assert checkout["timeouts"] == 1
+    assert checkout["checkouts"] == 2
+    assert checkout["wait_seconds_max"] >= 0.2
+    assert sum(checkout["wait_histogram"].values()) == 3
+
+def test_metrics_survive_pool_recreation(engine):
+    with engine.connect():
+        pass
+    engine.dispose()
+    assert pool_status(engine)["checkout"]["checkouts"] == 1
+
+def test_async_pool_is_timed():
+    async def checkout_twice():
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{DB_PATH}", poolclass=TimedAsyncQueuePool, pool_size=1, max_overflow=0)
+        try:
+            for _ in range(2):
+                async with async_engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+            return pool_status(async_engine)
+        finally:
+            await async_engine.dispose()
+
+    status = asyncio.run(checkout_twice())
+    assert (status["pool_class"], status["pool_size"], status["in_use"]) == ("TimedAsyncQueuePool", 1, 0)
+    assert status["checkout"]["checkouts"] == 2
+
+def test_sync_and_async_pools_are_sized_separately():
+    sync_engine = database._create_pooled_engine(f"sqlite:///{DB_PATH}")
+    assert (sync_engine.pool.size(), sync_engine.pool._max_overflow) == (settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
+    async_engine = database.get_async_engine("mysql+mysqlconnector://user:pass@db:3306/stars")
+    assert isinstance(async_engine.sync_engine.pool, TimedAsyncQueuePool)
+    assert (async_engine.sync_engine.pool.size(), async_engine.sync_engine.pool._max_overflow) == (settings.DB_ASYNC_POOL_SIZE, settings.DB_ASYNC_MAX_OVERFLOW)
+
+def test_metrics_endpoint():
+    response = client.get("/metrics/db-pool")
+    assert response.status_code == 200
+    assert "pool_class" in response.json()
+    assert "pool_class" in response.json()["async"]
@@ -5,7 +5,6 @@ from sqlalchemy.orm import sessionmaker
 from app.main import app
 from app.database import Base, get_db
 from app import models, crud
-from unittest.mock import patch
 
 # Use a separate in-memory SQLite db
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test_discord.db"
@@ -69,20 +68,18 @@ def test_discord_invite_sent_only_once():
     db.refresh(volunteer)
     volunteer_id = volunteer.id
 
-    with patch("app.utils.send_discord_invite_email") as mock_send:
-        # 1. Transition to ACTIVE - should send email
-        crud.update_volunteer_status(db, volunteer_id, status_active.id)
-        assert mock_send.called is True
-        assert mock_send.call_count == 1
-        
-        # Reload volunteer to check flag
-        db.refresh(volunteer)
-        assert volunteer.discord_invite_sent is True
+    def queued_invites():
+        return db.query(models.EmailOutbox).filter_by(kind="discord_invite", recipient_email="discord@test.com").count()
 
-        # 2. Transition to INTERESTED and then to ACTIVE again - should NOT send email
-        crud.update_volunteer_status(db, volunteer_id, status_interested.id)
-        mock_send.reset_mock()
-        
-        crud.update_volunteer_status(db, volunteer_id, status_active.id)
-        assert mock_send.called is False
-        assert mock_send.call_count == 0
+    # 1. Transition to ACTIVE - should queue the invite email
+    crud.update_volunteer_status(db, volunteer_id, status_active.id)
+    assert queued_invites() == 1
+
+    # Reload volunteer to check flag
+    db.refresh(volunteer)
+    assert volunteer.discord_invite_sent is True
+
+    # 2. Transition to INTERESTED and then to ACTIVE again - should NOT queue another email
+    crud.update_volunteer_status(db, volunteer_id, status_interested.id)
+    crud.update_volunteer_status(db, volunteer_id, status_active.id)
+    assert queued_invites() == 1
@@ -0,0 +1,156 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database import Base, get_db
+from app.settings import settings
+from app import mailer, models
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_email_outbox.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function", autouse=True)
+def setup_and_teardown_db(monkeypatch):
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    db.add_all([
+        models.JobTitle(title="Developer", is_active=True),
+        models.VolunteerStatus(name="INTERESTED"),
+    ])
+    db.commit()
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def outbox():
+    db = TestingSessionLocal()
+    rows = db.query(models.EmailOutbox).order_by(models.EmailOutbox.id).all()
+    db.close()
+    return rows
+
+def deliver(transport):
+    db = TestingSessionLocal()
+    try:
+        return mailer.deliver_pending(db, transport)
+    finally:
+        db.close()
+
+def make_due(message_id):
+    db = TestingSessionLocal()
+    db.get(models.EmailOutbox, message_id).next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    db.close()
+
+def signup(email="ana@example.com"):
+    return client.post("/volunteer", json={
+        "name": "Ana", "email": email, "linkedin": "https://linkedin.com/in/ana", "jobtitle_id": 1,
+    })
+
+def test_signup_only_commits_an_outbox_row(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("email sent on the request path")
+    monkeypatch.setattr(mailer.utils, "send_welcome_email", fail)
+
+    assert signup().status_code == 200
+    [message] = outbox()
+    assert (message.kind, message.recipient_email, message.status) == ("welcome", "ana@example.com", "pending")
+
+def test_edit_link_request_is_queued_with_its_link():
+    signup()
+    response = client.post("/volunteers/request-edit-link", json={"email": "ana@example.com"})
+    assert response.status_code == 200
+
+    transport = mailer.FakeTransport()
+    assert deliver(transport) == 2
+    kind, email, params = transport.sent[1]
+    assert (kind, email) == ("edit_link", "ana@example.com")
+    assert params["link"].startswith(settings.BASE_FRONTEND_URL)
+    assert all(message.status == "sent" for message in outbox())
+
+def test_delivered_emails_are_not_sent_again():
+    signup()
+    transport = mailer.FakeTransport()
+    assert deliver(transport) == 1
+    assert deliver(transport) == 0
+    assert len(transport.sent) == 1
+
+def test_idempotency_key_deduplicates_enqueues():
+    db = TestingSessionLocal()
+    first = mailer.enqueue(db, "welcome", "ana@example.com", "Ana", idempotency_key="welcome:1")
+    db.commit()
+    second = mailer.enqueue(db, "welcome", "ana@example.com", "Ana", idempotency_key="welcome:1")
+    db.commit()
+    assert first.id == second.id
+    db.close()
+    assert len(outbox()) == 1
+
+def test_failures_are_retried_with_backoff():
+    signup()
+    transport = mailer.FakeTransport(fail_times=2)
+
+    assert deliver(transport) == 0
+    [message] = outbox()
+    assert (message.status, message.attempts) == ("pending", 1)
+    assert message.last_error == "fake transport failure"
+    first_delay = message.next_attempt_at - datetime.utcnow()
+    assert timedelta(seconds=settings.MAILER_BACKOFF_SECONDS - 5) < first_delay <= timedelta(seconds=settings.MAILER_BACKOFF_SECONDS)
+
+    # Not due yet, so nothing is attempted
+    assert deliver(transport) == 0
+    assert outbox()[0].attempts == 1
+
+    make_due(message.id)
+    assert deliver(transport) == 0
+    message = outbox()[0]
+    second_delay = message.next_attempt_at - datetime.utcnow()
+    assert second_delay > first_delay
+
+    make_due(message.id)
+    assert deliver(transport) == 1
+    message = outbox()[0]
+    assert (message.status, message.attempts, message.last_error) == ("sent", 3, None)
+    assert len(transport.sent) == 1
+
+def test_gives_up_after_max_attempts(monkeypatch):
+    monkeypatch.setattr(settings, "MAILER_MAX_ATTEMPTS", 2)
+    signup()
+    transport = mailer.FakeTransport(fail_times=10)
+
+    deliver(transport)
+    make_due(outbox()[0].id)
+    deliver(transport)
+
+    message = outbox()[0]
+    assert (message.status, message.attempts) == ("failed", 2)
+    make_due(message.id)
+    assert deliver(transport) == 0
+    assert outbox()[0].attempts == 2
+
+def test_batchable_kinds_go_out_in_one_request():
+    for i in range(3):
+        signup(f"volunteer{i}@example.com")
+    client.post("/volunteers/request-edit-link", json={"email": "volunteer0@example.com"})
+
+    transport = mailer.FakeTransport(batch_kinds=("welcome",))
+    assert deliver(transport) == 4
+    assert transport.batches == [("welcome", [f"volunteer{i}@example.com" for i in range(3)])]
+    assert [kind for kind, _, _ in transport.sent].count("edit_link") == 1
+    assert all(message.status == "sent" for message in outbox())
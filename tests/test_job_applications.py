@@ -0,0 +1,170 @@
+import importlib.util
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, inspect, insert, text
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database import Base, get_db
+from app import crud, models, schemas
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_job_applications.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False, "timeout": 30}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function", autouse=True)
+def setup_and_teardown_db(monkeypatch):
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(models.JobTitle), [{"id": 1, "title": "Developer", "is_active": True}])
+        conn.execute(insert(models.JobOpening), [{"id": 1, "title": "Backend", "description": "APIs", "is_active": True}])
+        conn.execute(insert(models.Volunteer), [
+            {"id": i, "name": f"Volunteer {i}", "email": f"volunteer{i}@example.com", "linkedin": "l", "jobtitle_id": 1}
+            for i in (1, 2)
+        ])
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def apply(email):
+    return client.post("/jobs/apply", params={"job_id": 1, "email": email})
+
+def test_applying_twice_returns_the_same_application():
+    first = apply("volunteer1@example.com")
+    assert first.status_code == 200
+    again = apply("volunteer1@example.com")
+    assert again.status_code == 200
+    assert again.json() == first.json()
+    assert apply("volunteer2@example.com").json()["id"] != first.json()["id"]
+
+    db = TestingSessionLocal()
+    assert db.query(models.JobApplication).count() == 2
+    db.close()
+
+def test_apply_is_a_single_write():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0])
+
+    db = TestingSessionLocal()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        created = crud.create_job_application(db, schemas.JobApplicationCreate(job_id=1, volunteer_id=1))
+        repeated = crud.create_job_application(db, schemas.JobApplicationCreate(job_id=1, volunteer_id=1))
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert repeated.id == created.id
+    assert repeated.created_at is not None
+    # Per call: the upsert, then the row read back by primary key for the response
+    assert statements == ["INSERT", "SELECT", "INSERT", "SELECT"]
+    db.close()
+
+def test_concurrent_clicks_create_one_application():
+    barrier = threading.Barrier(8)
+
+    def click(_):
+        barrier.wait()
+        db = TestingSessionLocal()
+        try:
+            return crud.create_job_application(db, schemas.JobApplicationCreate(job_id=1, volunteer_id=2)).id
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(8) as pool:
+        ids = set(pool.map(click, range(8)))
+    assert len(ids) == 1
+    db = TestingSessionLocal()
+    assert db.query(models.JobApplication).count() == 1
+    db.close()
+
+def test_migration_removes_duplicates_before_adding_the_index():
+    spec = importlib.util.spec_from_file_location(
+        "unique_job_application", "alembic/versions/3f8a1c6d2b97_unique_job_application_per_volunteer.py"
+    )
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_job_application_job_id_volunteer_id"))
+        conn.execute(insert(models.JobApplication), [
+            {"id": 1, "job_id": 1, "volunteer_id": 1},
+            {"id": 2, "job_id": 1, "volunteer_id": 1},
+            {"id": 3, "job_id": 1, "volunteer_id": 2},
+            {"id": 4, "job_id": 1, "volunteer_id": 1},
+        ])
+        with Operations.context(MigrationContext.configure(conn)):
+            migration.upgrade()
+
+    assert [row.id for row in TestingSessionLocal().query(models.JobApplication).order_by(models.JobApplication.id)] == [1, 3]
+    indexes = {index["name"]: index["unique"] for index in inspect(engine).get_indexes("job_application")}
+    assert indexes["ix_job_application_job_id_volunteer_id"]
+
+@pytest.fixture
+def query_count():
+    counter = {"queries": 0}
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        counter["queries"] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    yield counter
+    event.remove(engine, "before_cursor_execute", count)
+
+def seed_applicants(count):
+    with engine.begin() as conn:
+        conn.execute(insert(models.JobOpening), [{"id": 2, "title": "Frontend", "description": "UI", "is_active": False}])
+        conn.execute(insert(models.Volunteer), [
+            {"id": i, "name": f"Volunteer {i}", "email": f"volunteer{i}@example.com", "linkedin": "l", "jobtitle_id": 1}
+            for i in range(3, count + 1)
+        ])
+        conn.execute(insert(models.JobApplication), [{"job_id": 1, "volunteer_id": i} for i in range(1, count + 1)])
+        conn.execute(insert(models.JobApplication), [{"job_id": 2, "volunteer_id": 1}])
+
+def test_job_list_counts_applications_without_loading_them(query_count):
+    seed_applicants(30)
+    query_count["queries"] = 0
+    jobs = client.get("/jobs/").json()
+    assert query_count["queries"] == 1
+    assert {job["title"]: job["applications_count"] for job in jobs} == {"Backend": 30, "Frontend": 1}
+    assert "applications" not in jobs[0]
+
+    active = client.get("/jobs/?active_only=true").json()
+    assert [(job["title"], job["applications_count"]) for job in active] == [("Backend", 30)]
+
+def test_job_list_counts_jobs_without_applications():
+    assert client.get("/jobs/").json()[0]["applications_count"] == 0
+
+def test_applications_page_loads_profiles_in_constant_queries(query_count):
+    seed_applicants(30)
+
+    def page_queries(limit):
+        query_count["queries"] = 0
+        db = TestingSessionLocal()
+        page = [schemas.JobApplication.model_validate(a, from_attributes=True) for a in crud.get_job_applications(db, 1, limit=limit)]
+        db.close()
+        return page, query_count["queries"]
+
+    small, small_queries = page_queries(5)
+    large, large_queries = page_queries(30)
+    assert [a.volunteer.id for a in small] == [1, 2, 3, 4, 5]
+    assert len(large) == 30
+    # Serializing every applicant's profile triggers no lazy loads
+    assert large_queries == small_queries
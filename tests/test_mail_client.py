@@ -0,0 +1,63 @@
+import pytest
+import sib_api_v3_sdk
+from app import mail_client, utils
+from app.settings import settings
+
+
+@pytest.fixture(autouse=True)
+def fresh_client(monkeypatch):
+    monkeypatch.setenv("BREVO_API_KEY", "test-key")
+    mail_client.reset()
+    yield
+    mail_client.reset()
+
+
+def test_client_is_created_once_with_bounded_pool():
+    api = mail_client.get_emails_api()
+    assert mail_client.get_emails_api() is api
+    pool_kw = api.api_client.rest_client.pool_manager.connection_pool_kw
+    assert pool_kw["maxsize"] == settings.BREVO_POOL_MAXSIZE
+    assert api.api_client.configuration.api_key["api-key"] == "test-key"
+
+
+def test_all_senders_share_one_client_and_timeouts(monkeypatch):
+    calls, created = [], []
+    original_api_client = sib_api_v3_sdk.ApiClient
+
+    def counting_api_client(*args, **kwargs):
+        created.append(1)
+        return original_api_client(*args, **kwargs)
+
+    def send_transac_email(self, send_smtp_email, **kwargs):
+        calls.append((send_smtp_email, kwargs))
+        return {"messageId": "<1@brevo>"}
+
+    monkeypatch.setattr(sib_api_v3_sdk, "ApiClient", counting_api_client)
+    monkeypatch.setattr(sib_api_v3_sdk.TransactionalEmailsApi, "send_transac_email", send_transac_email)
+
+    assert utils.send_welcome_email("ana@example.com", "Ana")
+    assert utils.send_edit_link_email("ana@example.com", "Ana", "https://example.com/edit")
+    assert utils.send_password_reset_email("ana@example.com", "Ana", "https://example.com/reset")
+    assert utils.send_discord_invite_email("ana@example.com", "Ana")
+
+    assert len(created) == 1
+    assert [message.template_id for message, _ in calls] == [9, 10, 12, 11]
+    timeout = (settings.BREVO_CONNECT_TIMEOUT_SECONDS, settings.BREVO_READ_TIMEOUT_SECONDS)
+    assert all(kwargs["_request_timeout"] == timeout for _, kwargs in calls)
+
+
+def test_batch_send_uses_message_versions(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        sib_api_v3_sdk.TransactionalEmailsApi, "send_transac_email",
+        lambda self, send_smtp_email, **kwargs: calls.append(send_smtp_email),
+    )
+
+    recipients = [(f"volunteer{i}@example.com", f"Volunteer {i}") for i in range(2500)]
+    assert utils.send_welcome_emails(recipients)
+
+    assert [len(message.message_versions) for message in calls] == [1000, 1000, 500]
+    first = calls[0].message_versions[0]
+    assert first.to == [{"email": "volunteer0@example.com", "name": "Volunteer 0"}]
+    assert first.params["NOME"] == "Volunteer 0"
+    assert all(message.template_id == utils.WELCOME_TEMPLATE_ID and message.to is None for message in calls)
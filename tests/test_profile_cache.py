@@ -0,0 +1,156 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database import Base, get_db
+from app import cache, crud, integrations, models, schemas
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_profile_cache.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function", autouse=True)
+def setup_and_teardown_db(monkeypatch):
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    db.add_all([
+        models.User(email="mentor@example.com", hashed_password="x"),
+        models.JobTitle(title="Developer", is_active=True),
+        models.JobTitle(title="Designer", is_active=True),
+        models.VolunteerStatus(name="ACTIVE"),
+        models.VolunteerType(name="Junior"),
+        models.Squad(name="Alpha"),
+        models.Vertical(name="Backend"),
+    ])
+    db.flush()
+    db.add_all([
+        models.Volunteer(name=f"Volunteer {i}", email=f"volunteer{i}@example.com", linkedin="l", jobtitle_id=1)
+        for i in (1, 2)
+    ])
+    db.commit()
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def query_count():
+    counter = {"queries": 0}
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        counter["queries"] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    yield counter
+    event.remove(engine, "before_cursor_execute", count)
+
+def test_repeat_visits_get_304_without_queries(query_count):
+    first = client.get("/volunteers/1/public")
+    assert first.status_code == 200
+    assert first.json()["name"] == "Volunteer 1"
+    assert first.headers["Cache-Control"] == "public, no-cache"
+    etag = first.headers["ETag"]
+
+    query_count["queries"] = 0
+    second = client.get("/volunteers/1/public")
+    revisit = client.get("/volunteers/1/public", headers={"If-None-Match": etag})
+    assert second.content == first.content
+    assert revisit.status_code == 304
+    assert revisit.headers["ETag"] == etag
+    assert query_count["queries"] == 0
+
+    assert client.get("/volunteers/99/public").status_code == 404
+
+def set_status(db):
+    crud.update_volunteer_status(db, 1, 1)
+
+def set_squad(db):
+    crud.update_volunteer_squad(db, 1, 1)
+
+def set_type(db):
+    crud.update_volunteer_type(db, 1, 1)
+
+def set_jobtitle(db):
+    crud.update_volunteer_jobtitle(db, 1, 2)
+
+def set_verticals(db):
+    crud.update_volunteer_verticals(db, 1, [1])
+
+def add_feedback(db):
+    crud.create_feedback(db, schemas.FeedbackCreate(content="Great work"), user_id=1, volunteer_id=1)
+
+def add_badge(db):
+    crud.create_badge(db, schemas.BadgeCreate(title="Helper", volunteer_id=1), issuer_id=1)
+
+def add_certificate(db):
+    crud.create_certificate(db, schemas.CertificateCreate(volunteer_id=1, hours=10), issuer_id=1)
+
+def add_mentee(db):
+    # Volunteer 1 is the mentee: its profile lists the new mentor
+    crud.add_mentee_to_mentor(db, 2, 1)
+
+def edit_profile(db):
+    volunteer = db.get(models.Volunteer, 1)
+    volunteer.edit_token = "token"
+    volunteer.edit_token_expires_at = datetime.utcnow() + timedelta(hours=1)
+    db.commit()
+    crud.update_volunteer_profile_by_token(db, "token", schemas.VolunteerUpdateProfile(name="Renamed", linkedin="l"))
+
+@pytest.mark.parametrize("mutate", [
+    set_status, set_squad, set_type, set_jobtitle, set_verticals,
+    add_feedback, add_badge, add_certificate, add_mentee, edit_profile,
+])
+def test_mutations_invalidate_the_profile(mutate):
+    etag = client.get("/volunteers/1/public").headers["ETag"]
+    other_version = cache.volunteer_versions.get(2) if mutate is not add_mentee else None
+
+    db = TestingSessionLocal()
+    mutate(db)
+    db.close()
+
+    response = client.get("/volunteers/1/public", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    if other_version is not None:
+        assert cache.volunteer_versions.get(2) == other_version
+
+def test_mentorship_invalidates_both_profiles():
+    mentor_etag = client.get("/volunteers/2/public").headers["ETag"]
+    db = TestingSessionLocal()
+    crud.add_mentee_to_mentor(db, 2, 1)
+    db.close()
+    mentor = client.get("/volunteers/2/public", headers={"If-None-Match": mentor_etag})
+    assert mentor.status_code == 200
+    assert mentor.json()["mentees"][0]["name"] == "Volunteer 1"
+
+def test_rolled_back_changes_keep_the_version():
+    version = cache.volunteer_versions.get(1)
+    db = TestingSessionLocal()
+    db.get(models.Volunteer, 1).name = "Not saved"
+    db.flush()
+    db.rollback()
+    db.close()
+    assert cache.volunteer_versions.get(1) == version
+
+def test_apoiase_bulk_update_invalidates_the_profile():
+    etag = client.get("/volunteers/1/public").headers["ETag"]
+    integrations._write_batch(TestingSessionLocal, {1: True})
+    response = client.get("/volunteers/1/public", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["is_apoiase_supporter"] is True
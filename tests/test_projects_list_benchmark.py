@@ -0,0 +1,84 @@
+import os
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker, joinedload
+from app.database import Base
+from app import crud, models, schemas
+from tests.benchmark_utils import counting_sqlite_engine, measure
+
+DB_PATH = "./test_projects_list_benchmark.db"
+engine, stats = counting_sqlite_engine(DB_PATH)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+PROJECTS, SQUADS_PER_PROJECT, SQUADS, SQUAD_SIZE = 200, 20, 60, 15
+
+
+@pytest.fixture(scope="module")
+def linked_projects():
+    """Seeds PROJECTS projects, each linked to SQUADS_PER_PROJECT of SQUADS squads of SQUAD_SIZE members."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conn:
+        conn.execute(insert(models.JobTitle), [{"id": 1, "title": "Developer", "is_active": True}])
+        conn.execute(insert(models.VolunteerStatus), [{"id": 1, "name": "ACTIVE"}])
+        conn.execute(insert(models.VolunteerType), [{"id": 1, "name": "Junior"}])
+        conn.execute(insert(models.Squad), [{"id": i, "name": f"Squad {i}"} for i in range(1, SQUADS + 1)])
+        conn.execute(insert(models.Volunteer), [
+            {"id": i, "name": f"Volunteer {i}", "email": f"volunteer{i}@example.com", "linkedin": "l",
+             "jobtitle_id": 1, "status_id": 1, "volunteer_type_id": 1, "squad_id": (i - 1) // SQUAD_SIZE + 1}
+            for i in range(1, SQUADS * SQUAD_SIZE + 1)
+        ])
+        conn.execute(insert(models.Project), [{"id": i, "name": f"Project {i}"} for i in range(1, PROJECTS + 1)])
+        conn.execute(insert(models.project_squad_association), [
+            {"project_id": project_id, "squad_id": (project_id + n) % SQUADS + 1}
+            for project_id in range(1, PROJECTS + 1)
+            for n in range(SQUADS_PER_PROJECT)
+        ])
+
+    yield
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+    os.remove(DB_PATH)
+
+
+def list_projects(load, schema):
+    db = TestingSessionLocal()
+    try:
+        with measure(stats) as result:
+            # Serializing is part of the request, and any lazy load it triggers counts
+            result["projects"] = [schema.model_validate(p, from_attributes=True).model_dump() for p in load(db)]
+        return result
+    finally:
+        db.close()
+
+
+def test_project_list_loads_squad_summaries_in_constant_queries(linked_projects):
+    # GET /projects/ before: every squad serialized with its members, loaded lazily
+    before = list_projects(
+        lambda db: db.query(models.Project).options(joinedload(models.Project.squads)).order_by(models.Project.id).limit(PROJECTS).all(),
+        schemas.Project,
+    )
+    after = list_projects(lambda db: crud.get_projects(db, limit=PROJECTS), schemas.ProjectList)
+
+    print(
+        f"\nGET /projects/ with {PROJECTS} projects x {SQUADS_PER_PROJECT} squads of {SQUAD_SIZE} members\n"
+        f"  full squads: {before['rows']} rows, {before['queries']} queries, {before['seconds'] * 1000:.1f} ms\n"
+        f"  squad summaries: {after['rows']} rows, {after['queries']} queries, {after['seconds'] * 1000:.1f} ms"
+    )
+
+    assert len(after["projects"]) == PROJECTS
+    for old, new in zip(before["projects"], after["projects"]):
+        assert sorted((s["id"], s["name"]) for s in new["squads"]) == sorted((s["id"], s["name"]) for s in old["squads"])
+        assert all(s["members_count"] == SQUAD_SIZE for s in new["squads"])
+        assert "volunteers" not in new["squads"][0]
+    assert after["queries"] == 3
+    assert before["queries"] > SQUADS
+
+
+def test_project_list_query_count_does_not_grow(linked_projects):
+    assert list_projects(lambda db: crud.get_projects(db, limit=5), schemas.ProjectList)["queries"] == 3
+    db = TestingSessionLocal()
+    assert crud.set_squad_member_counts(db, []) == []
+    db.close()
@@ -0,0 +1,156 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database import Base, get_db, get_replica_db, get_async_db, get_async_replica_db, get_async_engine, READ_PRIMARY_COOKIE
+from app.auth import head_or_admin, mentor_or_above
+from app import cache, models, schemas
+from app.settings import settings
+
+# Two SQLite files stand in for the primary and a replica that has not caught up yet
+primary_engine = create_engine("sqlite:///./test_read_replica_primary.db", connect_args={"check_same_thread": False})
+replica_engine = create_engine("sqlite:///./test_read_replica_replica.db", connect_args={"check_same_thread": False})
+PrimarySessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=primary_engine)
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+AsyncPrimarySessionLocal = async_sessionmaker(get_async_engine(primary_engine.url), expire_on_commit=False)
+AsyncReplicaSessionLocal = async_sessionmaker(get_async_engine(replica_engine.url), expire_on_commit=False)
+
+def override_get_db():
+    try:
+        db = PrimarySessionLocal()
+        yield db
+    finally:
+        db.close()
+
+def override_get_replica_db():
+    try:
+        db = ReplicaSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+async def override_get_async_db():
+    async with AsyncPrimarySessionLocal() as db:
+        yield db
+
+async def override_get_async_replica_db():
+    async with AsyncReplicaSessionLocal() as db:
+        yield db
+
+def override_user():
+    return schemas.User(id=1, email="admin@example.com", is_active=True, items=[])
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function", autouse=True)
+def setup_and_teardown_db(monkeypatch):
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setitem(app.dependency_overrides, get_replica_db, override_get_replica_db)
+    monkeypatch.setitem(app.dependency_overrides, get_async_db, override_get_async_db)
+    monkeypatch.setitem(app.dependency_overrides, get_async_replica_db, override_get_async_replica_db)
+    monkeypatch.setitem(app.dependency_overrides, head_or_admin, override_user)
+    monkeypatch.setitem(app.dependency_overrides, mentor_or_above, override_user)
+    client.cookies.clear()
+    for engine in (primary_engine, replica_engine):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+    seed(PrimarySessionLocal, ["Stars", "Website"])
+    seed(ReplicaSessionLocal, ["Stars"])
+    yield
+    for engine in (primary_engine, replica_engine):
+        Base.metadata.drop_all(bind=engine)
+
+def seed(session_factory, names):
+    db = session_factory()
+    db.add(models.JobTitle(title="Developer", is_active=True))
+    db.add_all([models.Project(name=name) for name in names])
+    db.add_all([models.Squad(name=f"Squad {name}") for name in names])
+    db.add_all([
+        models.Volunteer(name=f"Volunteer {name}", email=f"{name.lower()}@example.com", linkedin="l", jobtitle_id=1)
+        for name in names
+    ])
+    db.commit()
+    db.close()
+
+def project_names():
+    return [p["name"] for p in client.get("/projects/").json()]
+
+def test_listings_read_from_the_replica():
+    assert project_names() == ["Stars"]
+    assert len(client.get("/squads/").json()) == 1
+    assert len(client.get("/volunteers/").json()) == 1
+    assert len(client.get("/volunteer/search").json()) == 1
+    assert client.get("/volunteers/2/public").status_code == 404
+    assert client.get("/dashboard/stats").json()["total_volunteers"] == 1
+    assert client.get("/jobs/").status_code == 200
+    assert client.get("/verticals/").status_code == 200
+
+def test_dashboard_on_a_replica_without_counters_does_not_write():
+    db = ReplicaSessionLocal()
+    db.query(models.VolunteerStats).delete()
+    db.commit()
+
+    assert client.get("/dashboard/stats").json()["total_volunteers"] == 1
+    assert db.query(models.VolunteerStats).count() == 0
+    db.close()
+
+def test_writer_reads_its_own_writes():
+    response = client.post("/projects/", json={"name": "Mentoring"})
+    assert response.status_code == 200
+    assert READ_PRIMARY_COOKIE in response.cookies
+
+    assert project_names() == ["Stars", "Website", "Mentoring"]
+    assert client.get("/volunteers/2/public").status_code == 200
+
+    # Other clients (and this one once the window closes) go back to the replica
+    assert [p["name"] for p in TestClient(app).get("/projects/").json()] == ["Stars"]
+    client.cookies.set(READ_PRIMARY_COOKIE, str(time.time() - 1))
+    assert project_names() == ["Stars"]
+
+def test_failed_writes_do_not_pin_the_client():
+    response = client.post("/projects/", json={})
+    assert response.status_code == 422
+    assert READ_PRIMARY_COOKIE not in response.cookies
+    assert project_names() == ["Stars"]
+
+def test_without_a_replica_everything_reads_from_the_primary(monkeypatch):
+    monkeypatch.delitem(app.dependency_overrides, get_replica_db)
+    monkeypatch.delitem(app.dependency_overrides, get_async_replica_db)
+    assert project_names() == ["Stars", "Website"]
+    assert len(client.get("/squads/").json()) == 2
+
+def test_reference_lists_are_not_cached_from_the_replica():
+    assert client.get("/verticals/").json() == []
+    db = PrimarySessionLocal()
+    db.add(models.Vertical(name="Backend"))
+    db.commit()
+    db.close()
+    cache.reference_cache.invalidate("verticals")
+
+    # The first reader after the invalidation refills the cache, so it must not see the lagging replica
+    assert [v["name"] for v in TestClient(app).get("/verticals/").json()] == ["Backend"]
+    assert [v["name"] for v in client.get("/verticals/").json()] == ["Backend"]
+
+def test_profiles_from_a_lagging_replica_are_not_cached(monkeypatch):
+    monkeypatch.setattr(settings, "DB_REPLICA_STICKY_SECONDS", 60)
+    db = PrimarySessionLocal()
+    db.get(models.Volunteer, 1).name = "Renamed"
+    db.commit()
+    db.close()
+
+    # Another visitor reads the replica before it has the change
+    assert TestClient(app).get("/volunteers/1/public").json()["name"] == "Volunteer Stars"
+    # Replication applies the row change without going through this process's Session
+    with replica_engine.begin() as conn:
+        conn.execute(update(models.Volunteer).where(models.Volunteer.id == 1).values(name="Renamed"))
+    assert TestClient(app).get("/volunteers/1/public").json()["name"] == "Renamed"
+    assert len(cache.profile_cache) == 0
+
+    # Past the lag window the replica's answer is cached again
+    monkeypatch.setattr(settings, "DB_REPLICA_STICKY_SECONDS", 0)
+    TestClient(app).get("/volunteers/1/public")
+    assert len(cache.profile_cache) == 1
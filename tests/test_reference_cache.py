@@ -0,0 +1,143 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database import Base, get_db, get_async_db, get_async_engine
+from app.auth import admin_only, head_or_admin, get_current_active_user
+from app import cache, models, schemas
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_reference_cache.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+AsyncTestingSessionLocal = async_sessionmaker(get_async_engine(engine.url), expire_on_commit=False)
+
+async def override_get_async_db():
+    async with AsyncTestingSessionLocal() as db:
+        yield db
+
+def override_current_user():
+    return schemas.User(id=1, email="admin@example.com", is_active=True, items=[])
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function", autouse=True)
+def setup_and_teardown_db(monkeypatch):
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setitem(app.dependency_overrides, get_async_db, override_get_async_db)
+    monkeypatch.setitem(app.dependency_overrides, admin_only, override_current_user)
+    monkeypatch.setitem(app.dependency_overrides, head_or_admin, override_current_user)
+    monkeypatch.setitem(app.dependency_overrides, get_current_active_user, override_current_user)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def query_count():
+    counter = {"queries": 0}
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        counter["queries"] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    yield counter
+    event.remove(engine, "before_cursor_execute", count)
+
+def seed_reference_data():
+    db = TestingSessionLocal()
+    db.add_all([
+        models.JobTitle(title="Developer", is_active=True),
+        models.VolunteerStatus(name="ACTIVE"),
+        models.VolunteerType(name="Junior"),
+        models.Vertical(name="Backend"),
+    ])
+    db.commit()
+    db.close()
+
+@pytest.mark.parametrize("url", ["/jobtitles/", "/volunteer-statuses/", "/volunteer-types/", "/verticals/"])
+def test_reference_lists_are_served_from_cache(url, query_count):
+    seed_reference_data()
+    first = client.get(url)
+    assert first.status_code == 200
+    assert len(first.json()) == 1
+    assert first.headers["ETag"]
+    assert "max-age" in first.headers["Cache-Control"]
+
+    query_count["queries"] = 0
+    second = client.get(url)
+    assert second.json() == first.json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert query_count["queries"] == 0
+
+def test_matching_etag_returns_304():
+    seed_reference_data()
+    etag = client.get("/jobtitles/").headers["ETag"]
+
+    response = client.get("/jobtitles/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    response = client.get("/jobtitles/", headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200
+
+def test_vertical_writes_invalidate_the_cache():
+    seed_reference_data()
+    before = client.get("/verticals/")
+
+    created = client.post("/verticals/", json={"name": "Frontend"})
+    assert created.status_code == 200
+    after_create = client.get("/verticals/")
+    assert after_create.headers["ETag"] != before.headers["ETag"]
+    assert [v["name"] for v in after_create.json()] == ["Backend", "Frontend"]
+
+    vertical_id = created.json()["id"]
+    client.put(f"/verticals/{vertical_id}", json={"name": "Mobile"})
+    assert [v["name"] for v in client.get("/verticals/").json()] == ["Backend", "Mobile"]
+
+    assert client.delete(f"/verticals/{vertical_id}").status_code == 200
+    assert [v["name"] for v in client.get("/verticals/").json()] == ["Backend"]
+
+def test_status_and_type_writes_invalidate_the_cache():
+    seed_reference_data()
+    client.get("/volunteer-statuses/")
+    client.get("/volunteer-types/")
+
+    client.post("/volunteer-statuses/", json={"name": "INACTIVE"})
+    client.post("/volunteer-types/", json={"name": "Senior"})
+
+    assert [s["name"] for s in client.get("/volunteer-statuses/").json()] == ["ACTIVE", "INACTIVE"]
+    assert [t["name"] for t in client.get("/volunteer-types/").json()] == ["Junior", "Senior"]
+
+def test_ttl_cache_expires_and_evicts(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    ttl_cache = cache.TTLCache(maxsize=2, ttl=10)
+
+    ttl_cache.set(("a", 1), "first")
+    ttl_cache.set(("a", 2), "second")
+    ttl_cache.get(("a", 1))
+    ttl_cache.set(("b", 1), "third")
+    # ("a", 2) was the least recently used entry
+    assert ttl_cache.get(("a", 2)) is None
+    assert ttl_cache.get(("a", 1)) == "first"
+
+    ttl_cache.invalidate("a")
+    assert ttl_cache.get(("a", 1)) is None
+    assert ttl_cache.get(("b", 1)) == "third"
+
+    now[0] += 11
+    assert ttl_cache.get(("b", 1)) is None
@@ -0,0 +1,166 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app import cache, crud, mailer, models, schemas
+
+SIGNUPS, WORKERS = 60, 4
+
+# Point STARS_BENCH_MYSQL_URL at a scratch MySQL database to benchmark it too
+DATABASES = {
+    "sqlite": "sqlite:///./test_signup_benchmark.db",
+    "mysql": os.getenv("STARS_BENCH_MYSQL_URL"),
+}
+
+
+# create_volunteer before signup became a single unit of work
+def legacy_create_volunteer(db, volunteer: schemas.VolunteerCreate, jobtitle_id: int):
+    volunteer.volunteer_type_id = volunteer.volunteer_type_id or cache.well_known_ids.type_id(db, "Junior")
+    vertical_ids = volunteer.vertical_ids or []
+    db_volunteer = models.Volunteer(**volunteer.dict(exclude_unset=True, exclude={'vertical_ids'}))
+    db_volunteer.status_id = cache.well_known_ids.status_id(db, "INTERESTED")
+    db.add(db_volunteer)
+    db.commit()
+    db.refresh(db_volunteer)
+    if vertical_ids:
+        db_volunteer.verticals = db.query(models.Vertical).filter(models.Vertical.id.in_(vertical_ids)).all()
+        db.commit()
+        db.refresh(db_volunteer)
+    db.add(models.VolunteerStatusHistory(volunteer_id=db_volunteer.id, status_id=db_volunteer.status_id))
+    db.commit()
+    db.refresh(db_volunteer)
+    return db_volunteer
+
+
+def new_create_volunteer(db, volunteer, jobtitle_id):
+    return crud.create_volunteer(db, volunteer, jobtitle_id, send_welcome_email=True)
+
+
+@pytest.fixture(params=DATABASES, scope="module")
+def database(request):
+    url = DATABASES[request.param]
+    if not url:
+        pytest.skip("STARS_BENCH_MYSQL_URL is not set")
+    connect_args = {"check_same_thread": False, "timeout": 30} if url.startswith("sqlite") else {}
+    engine = create_engine(url, connect_args=connect_args, pool_size=WORKERS)
+    counter = {"statements": 0, "commits": 0}
+    lock = threading.Lock()
+
+    def count_statement(*args):
+        with lock:
+            counter["statements"] += 1
+
+    def count_commit(conn):
+        with lock:
+            counter["commits"] += 1
+
+    if engine.dialect.name == "sqlite":
+        # Concurrent writers must take the write lock up front: a deferred
+        # transaction that reads first fails with "database is locked"
+        @event.listens_for(engine, "connect")
+        def disable_pysqlite_begin(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine, "begin")
+        def begin_immediate(conn):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    event.listen(engine, "commit", count_commit)
+    yield engine, counter
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+    if url.startswith("sqlite"):
+        os.remove(url.removeprefix("sqlite:///"))
+
+
+def reset(engine):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    cache.well_known_ids.invalidate()
+    with engine.begin() as conn:
+        conn.execute(insert(models.JobTitle), [{"id": 1, "title": "Developer", "is_active": True}])
+        conn.execute(insert(models.VolunteerStatus), [{"id": 1, "name": "INTERESTED"}])
+        conn.execute(insert(models.VolunteerType), [{"id": 1, "name": "Junior"}])
+        conn.execute(insert(models.Vertical), [{"id": i, "name": f"Vertical {i}"} for i in (1, 2)])
+
+
+def run_signups(engine, counter, create):
+    reset(engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def signup(n):
+        db = session_factory()
+        try:
+            volunteer = create(db, schemas.VolunteerCreate(
+                name=f"Volunteer {n}", email=f"volunteer{n}@example.com", linkedin="l",
+                jobtitle_id=1, vertical_ids=[1, 2],
+            ), 1)
+            # The response reads it back, as POST /volunteer does
+            return schemas.Volunteer.model_validate(volunteer, from_attributes=True)
+        finally:
+            db.close()
+
+    counter.update(statements=0, commits=0)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(WORKERS) as pool:
+        created = list(pool.map(signup, range(SIGNUPS)))
+    elapsed = time.perf_counter() - start
+    return {
+        "created": created,
+        "signups_per_second": SIGNUPS / elapsed,
+        "statements": counter["statements"] / SIGNUPS,
+        "commits": counter["commits"] / SIGNUPS,
+    }
+
+
+def test_single_transaction_signup_throughput(database):
+    engine, counter = database
+    before = run_signups(engine, counter, legacy_create_volunteer)
+    after = run_signups(engine, counter, new_create_volunteer)
+
+    print(
+        f"\n{SIGNUPS} signups on {engine.dialect.name} with {WORKERS} workers\n"
+        f"  three commits: {before['signups_per_second']:.0f}/s, {before['statements']:.1f} statements, {before['commits']:.0f} commits per signup\n"
+        f"  one commit: {after['signups_per_second']:.0f}/s, {after['statements']:.1f} statements, {after['commits']:.0f} commits per signup"
+    )
+
+    assert before["commits"] == 3
+    assert after["commits"] == 1
+    # Even with the welcome email now queued in the same transaction
+    assert after["statements"] < before["statements"]
+
+    db = sessionmaker(bind=engine)()
+    assert db.query(models.Volunteer).count() == SIGNUPS
+    assert db.query(models.VolunteerStatusHistory).count() == SIGNUPS
+    assert db.query(models.EmailOutbox).count() == SIGNUPS
+    db.close()
+    assert all(
+        [v.name for v in volunteer.verticals] == ["Vertical 1", "Vertical 2"] and len(volunteer.status_history) == 1
+        for volunteer in after["created"]
+    )
+
+
+def test_failed_signup_leaves_nothing_behind(database, monkeypatch):
+    engine, _ = database
+    reset(engine)
+
+    def broken_enqueue(*args, **kwargs):
+        raise RuntimeError("outbox unavailable")
+
+    # Fails after the volunteer, vertical and history rows were flushed
+    monkeypatch.setattr(mailer, "enqueue", broken_enqueue)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    volunteer = schemas.VolunteerCreate(name="Broken", email="broken@example.com", linkedin="l", jobtitle_id=1, vertical_ids=[1])
+    with pytest.raises(RuntimeError):
+        crud.create_volunteer(db, volunteer, 1, send_welcome_email=True)
+    db.rollback()
+    assert db.query(models.Volunteer).count() == 0
+    assert db.query(models.VolunteerStatusHistory).count() == 0
+    assert db.query(models.volunteer_vertical_association).count() == 0
+    db.close()
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database import Base, get_db, get_async_db, get_async_engine
+from app import models
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_squad_members.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+AsyncTestingSessionLocal = async_sessionmaker(get_async_engine(engine.url), expire_on_commit=False)
+
+async def override_get_async_db():
+    async with AsyncTestingSessionLocal() as db:
+        yield db
+
+client = TestClient(app)
+
+MEMBERS = 40
+
+@pytest.fixture(scope="function", autouse=True)
+def setup_and_teardown_db(monkeypatch):
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setitem(app.dependency_overrides, get_async_db, override_get_async_db)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(models.JobTitle), [{"id": 1, "title": "Developer", "is_active": True}, {"id": 2, "title": "Designer", "is_active": True}])
+        conn.execute(insert(models.VolunteerStatus), [{"id": 1, "name": "ACTIVE"}])
+        conn.execute(insert(models.VolunteerType), [{"id": 1, "name": "Junior"}])
+        conn.execute(insert(models.Squad), [{"id": i, "name": f"Squad {i}"} for i in (1, 2, 3)])
+        conn.execute(insert(models.Project), [{"id": i, "name": f"Project {i}"} for i in (1, 2)])
+        conn.execute(insert(models.project_squad_association), [
+            {"project_id": 1, "squad_id": 1}, {"project_id": 2, "squad_id": 1}, {"project_id": 1, "squad_id": 2},
+        ])
+        conn.execute(insert(models.Volunteer), [
+            {"id": i, "name": f"Volunteer {i}", "email": f"volunteer{i}@example.com", "linkedin": "l",
+             "jobtitle_id": 1 if i % 2 else 2, "status_id": 1, "volunteer_type_id": 1,
+             "squad_id": 1 if i <= MEMBERS else (2 if i <= MEMBERS + 3 else None),
+             "created_at": base + timedelta(seconds=i)}
+            for i in range(1, MEMBERS + 6)
+        ])
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def query_count():
+    counter = {"queries": 0}
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        counter["queries"] += 1
+
+    # /squads/ runs on the async engine behind override_get_async_db
+    async_engine = get_async_engine(engine.url).sync_engine
+    event.listen(async_engine, "before_cursor_execute", count)
+    yield counter
+    event.remove(async_engine, "before_cursor_execute", count)
+
+def test_squad_list_counts_without_loading_members(query_count):
+    squads = client.get("/squads/").json()
+    assert [(s["name"], s["members_count"], s["projects_count"]) for s in squads] == [
+        ("Squad 1", MEMBERS, 2), ("Squad 2", 3, 1), ("Squad 3", 0, 0),
+    ]
+    # Members were not loaded, so the field is left out rather than sent empty
+    assert all("volunteers" not in s for s in squads)
+    assert [p["name"] for p in squads[0]["projects"]] == ["Project 1", "Project 2"]
+    # The counted squads, then their projects
+    assert query_count["queries"] == 2
+
+def test_include_members_keeps_the_full_listing(query_count):
+    squads = client.get("/squads/?include_members=true").json()
+    assert len(squads[0]["volunteers"]) == MEMBERS
+    assert squads[0]["volunteers"][0]["jobtitle"]["title"] == "Developer"
+    assert squads[0]["members_count"] == MEMBERS
+    assert query_count["queries"] == 3
+
+def test_members_are_paginated_by_cursor():
+    first = client.get("/squads/1/members?limit=15&order=asc")
+    assert first.status_code == 200
+    assert [m["id"] for m in first.json()] == list(range(1, 16))
+    assert first.json()[0]["status"]["name"] == "ACTIVE"
+
+    seen = [m["id"] for m in first.json()]
+    cursor = first.headers["X-Next-Cursor"]
+    while cursor:
+        page = client.get(f"/squads/1/members?limit=15&order=asc&cursor={cursor}")
+        seen += [m["id"] for m in page.json()]
+        cursor = page.headers.get("X-Next-Cursor")
+    assert seen == list(range(1, MEMBERS + 1))
+
+def test_members_filters():
+    designers = client.get("/squads/1/members?jobtitle_id=2").json()
+    assert len(designers) == MEMBERS // 2
+    assert all(m["jobtitle"]["title"] == "Designer" for m in designers)
+    assert [m["name"] for m in client.get("/squads/2/members?name=Volunteer 42").json()] == ["Volunteer 42"]
+    assert client.get("/squads/3/members").json() == []
+    assert client.get("/squads/99/members").status_code == 404
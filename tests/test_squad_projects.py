@@ -1,9 +1,10 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_db, get_async_db, get_async_engine
 from app import models, schemas
 
 # Configuração do banco de dados de teste em memória
@@ -20,7 +21,14 @@ def override_get_db():
     finally:
         db.close()
 
+AsyncTestingSessionLocal = async_sessionmaker(get_async_engine(engine.url), expire_on_commit=False)
+
+async def override_get_async_db():
+    async with AsyncTestingSessionLocal() as db:
+        yield db
+
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
 
 client = TestClient(app)
 
@@ -0,0 +1,148 @@
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database import Base, get_db, get_async_db, get_async_engine
+from app.auth import get_password_hash, create_access_token, admin_only, head_or_admin, mentor_or_above, get_current_user, get_current_active_user
+from app.settings import settings
+from app import models, schemas
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_stateless_auth.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+AsyncTestingSessionLocal = async_sessionmaker(get_async_engine(engine.url), expire_on_commit=False)
+
+async def override_get_async_db():
+    async with AsyncTestingSessionLocal() as db:
+        yield db
+
+client = TestClient(app)
+
+USERS_QUERY = re.compile(r"\bFROM users\b")
+PASSWORD = "secret-password"
+
+@pytest.fixture(scope="module")
+def hashed_password():
+    return get_password_hash(PASSWORD)
+
+@pytest.fixture(scope="function", autouse=True)
+def setup_and_teardown_db(monkeypatch, hashed_password):
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setitem(app.dependency_overrides, get_async_db, override_get_async_db)
+    # This module exercises the real auth dependencies
+    for dependency in (admin_only, head_or_admin, mentor_or_above, get_current_user, get_current_active_user):
+        monkeypatch.delitem(app.dependency_overrides, dependency, raising=False)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    db.add_all([
+        models.User(email="admin@example.com", hashed_password=hashed_password, role=models.UserRole.ADMIN),
+        models.User(email="mentor@example.com", hashed_password=hashed_password, role=models.UserRole.MENTOR),
+    ])
+    db.commit()
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def users_queries():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if USERS_QUERY.search(statement):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+def login(email):
+    response = client.post("/token", data={"username": email, "password": PASSWORD})
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+def auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+def test_token_carries_id_role_and_version():
+    claims = jwt.decode(login("mentor@example.com"), settings.JWT_SECRETE_KEY, algorithms=[settings.PASSWORD_HASH_ALGORITHM])
+    assert claims["sub"] == "mentor@example.com"
+    assert claims["uid"] == 2
+    assert claims["role"] == "MENTOR"
+    assert claims["tv"] == 0
+
+def test_role_checks_skip_the_users_table(users_queries):
+    token = login("mentor@example.com")
+    assert client.get("/volunteers/", headers=auth(token)).status_code == 200
+
+    users_queries.clear()
+    for _ in range(3):
+        assert client.get("/volunteers/", headers=auth(token)).status_code == 200
+    assert client.get("/users/", headers=auth(token)).status_code == 403
+    assert users_queries == []
+
+def test_role_change_revokes_existing_tokens():
+    admin = login("admin@example.com")
+    mentor = login("mentor@example.com")
+    assert client.get("/volunteers/", headers=auth(mentor)).status_code == 200
+
+    response = client.patch("/users/2/role?role=HEAD", headers=auth(admin))
+    assert response.status_code == 200
+    assert client.get("/volunteers/", headers=auth(mentor)).status_code == 401
+
+    fresh = login("mentor@example.com")
+    claims = jwt.decode(fresh, settings.JWT_SECRETE_KEY, algorithms=[settings.PASSWORD_HASH_ALGORITHM])
+    assert (claims["role"], claims["tv"]) == ("HEAD", 1)
+    assert client.get("/volunteers/", headers=auth(fresh)).status_code == 200
+
+def test_password_reset_revokes_existing_tokens():
+    token = login("mentor@example.com")
+    assert client.get("/users/me/", headers=auth(token)).status_code == 200
+
+    db = TestingSessionLocal()
+    user = db.get(models.User, 2)
+    user.reset_token = "reset-token"
+    user.reset_token_expires_at = datetime.utcnow() + timedelta(hours=1)
+    db.commit()
+    db.close()
+    response = client.post("/reset-password", json={"token": "reset-token", "new_password": PASSWORD})
+    assert response.status_code == 200
+
+    assert client.get("/users/me/", headers=auth(token)).status_code == 401
+
+def test_users_me_returns_the_full_user():
+    response = client.get("/users/me/", headers=auth(login("admin@example.com")))
+    assert response.status_code == 200
+    assert response.json()["email"] == "admin@example.com"
+    assert response.json()["role"] == "ADMIN"
+
+def test_tokens_without_version_claims_still_work():
+    legacy = create_access_token(data={"sub": "admin@example.com"})
+    assert client.get("/users/", headers=auth(legacy)).status_code == 200
+
+def test_legacy_and_current_tokens_resolve_to_a_principal():
+    db = TestingSessionLocal()
+    try:
+        for token in (login("admin@example.com"), create_access_token(data={"sub": "admin@example.com"})):
+            principal = get_current_user(token=token, db=db)
+            assert isinstance(principal, schemas.Principal)
+            assert principal.email == "admin@example.com"
+    finally:
+        db.close()
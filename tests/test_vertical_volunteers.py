@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database import Base, get_db, get_async_db, get_async_engine
+from app import cache, crud, models
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_vertical_volunteers.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+AsyncTestingSessionLocal = async_sessionmaker(get_async_engine(engine.url), expire_on_commit=False)
+
+async def override_get_async_db():
+    async with AsyncTestingSessionLocal() as db:
+        yield db
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function", autouse=True)
+def setup_and_teardown_db(monkeypatch):
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setitem(app.dependency_overrides, get_async_db, override_get_async_db)
+    cache.reference_cache.clear()
+    cache.well_known_ids.invalidate()
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(models.JobTitle), [{"id": 1, "title": "Developer", "is_active": True}])
+        conn.execute(insert(models.VolunteerStatus), [{"id": 1, "name": "ACTIVE"}, {"id": 2, "name": "INACTIVE"}])
+        conn.execute(insert(models.Vertical), [{"id": i, "name": f"Vertical {i}"} for i in (1, 2, 3)])
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def seed(members):
+    """Adds members volunteers to vertical 1 (every third one inactive) and a few to vertical 2."""
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(models.Volunteer), [
+            {"id": i, "name": f"Volunteer {i}", "email": f"volunteer{i}@example.com", "linkedin": "l",
+             "jobtitle_id": 1, "status_id": 2 if i % 3 == 0 else 1, "created_at": base + timedelta(seconds=i)}
+            for i in range(1, members + 1)
+        ])
+        conn.execute(insert(models.volunteer_vertical_association), [{"volunteer_id": i, "vertical_id": 1} for i in range(1, members + 1)])
+        conn.execute(insert(models.volunteer_vertical_association), [{"volunteer_id": i, "vertical_id": 2} for i in (1, 2, 3)])
+
+def active_in_vertical_1(members):
+    return [i for i in range(1, members + 1) if i % 3]
+
+@pytest.fixture
+def query_count():
+    counter = {"queries": 0}
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        counter["queries"] += 1
+
+    # The vertical routes run on the async engine behind override_get_async_db
+    async_engine = get_async_engine(engine.url).sync_engine
+    event.listen(async_engine, "before_cursor_execute", count)
+    yield counter
+    event.remove(async_engine, "before_cursor_execute", count)
+
+@pytest.mark.parametrize("members", [10, 300])
+def test_vertical_list_size_does_not_depend_on_membership(members, query_count):
+    seed(members)
+    response = client.get("/verticals/")
+    assert [(v["name"], v["active_volunteers_count"]) for v in response.json()] == [
+        ("Vertical 1", len(active_in_vertical_1(members))), ("Vertical 2", 2), ("Vertical 3", 0),
+    ]
+    assert "volunteers" not in response.json()[0]
+    # The registry loading statuses and types on first use, then the counted verticals
+    assert query_count["queries"] == 3
+    assert len(response.content) < 300
+
+def test_vertical_detail_counts_active_volunteers():
+    seed(9)
+    assert client.get("/verticals/1").json()["active_volunteers_count"] == 6
+    assert client.get("/verticals/99").status_code == 404
+
+def test_active_volunteers_are_paginated_by_cursor():
+    seed(50)
+    seen, cursor = [], ""
+    while cursor is not None:
+        page = client.get(f"/verticals/1/volunteers?limit=10&order=asc&cursor={cursor}" if cursor else "/verticals/1/volunteers?limit=10&order=asc")
+        assert page.status_code == 200
+        seen += [v["id"] for v in page.json()]
+        cursor = page.headers.get("X-Next-Cursor")
+    assert seen == active_in_vertical_1(50)
+
+    newest = client.get("/verticals/1/volunteers?limit=2").json()
+    assert [v["name"] for v in newest] == ["Volunteer 50", "Volunteer 49"]
+    assert newest[0]["jobtitle"]["title"] == "Developer"
+    assert client.get("/verticals/3/volunteers").json() == []
+    assert client.get("/verticals/99/volunteers").status_code == 404
+
+def test_status_changes_refresh_the_counts():
+    seed(3)
+    assert client.get("/verticals/").json()[1]["active_volunteers_count"] == 2
+    db = TestingSessionLocal()
+    crud.update_volunteer_status(db, 3, 1)
+    db.close()
+    assert client.get("/verticals/").json()[1]["active_volunteers_count"] == 3
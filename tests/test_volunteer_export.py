@@ -0,0 +1,147 @@
+import csv
+import io
+import json
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database import Base, get_db
+from app.auth import admin_only
+from app import bulk_export, bulk_import, models, schemas
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_volunteer_export.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+def override_admin_only():
+    return schemas.User(id=1, email="admin@example.com", is_active=True, items=[])
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function", autouse=True)
+def setup_and_teardown_db(monkeypatch):
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setitem(app.dependency_overrides, admin_only, override_admin_only)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(models.JobTitle), [{"id": 1, "title": "Developer", "is_active": True}, {"id": 2, "title": "Designer", "is_active": True}])
+        conn.execute(insert(models.VolunteerStatus), [{"id": 1, "name": "INTERESTED"}])
+        conn.execute(insert(models.VolunteerType), [{"id": 1, "name": "Junior"}])
+        conn.execute(insert(models.Squad), [{"id": 1, "name": "Alpha"}])
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def seed(count, first=1):
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(models.Volunteer), [
+            {"id": i, "name": f"Volunteer {i}", "email": f"volunteer{i}@example.com", "linkedin": "l",
+             "jobtitle_id": 1 if i % 2 else 2, "status_id": 1, "volunteer_type_id": 1,
+             "squad_id": 1 if i % 3 == 0 else None, "created_at": base + timedelta(seconds=i)}
+            for i in range(first, first + count)
+        ])
+
+def test_csv_export_streams_every_volunteer():
+    seed(5)
+    response = client.get("/volunteers/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="volunteers.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["id"] for row in rows] == ["5", "4", "3", "2", "1"]
+    assert rows[2] == {
+        "id": "3", "name": "Volunteer 3", "email": "volunteer3@example.com", "phone": "", "linkedin": "l",
+        "github": "", "discord": "", "jobtitle_id": "1", "jobtitle": "Developer", "status_id": "1",
+        "status": "INTERESTED", "volunteer_type_id": "1", "volunteer_type": "Junior", "squad_id": "1",
+        "squad": "Alpha", "is_active": "True", "is_apoiase_supporter": "False", "created_at": "2025-01-01T00:00:03",
+    }
+
+def test_ndjson_export_applies_the_list_filters():
+    seed(6)
+    response = client.get("/volunteers/export?format=ndjson&jobtitle_id=1&order=asc")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [1, 3, 5]
+    assert rows[1]["squad"] == "Alpha" and rows[0]["squad"] is None
+
+    assert [r["id"] for r in map(json.loads, client.get("/volunteers/export?format=ndjson&squad_id=1").text.splitlines())] == [6, 3]
+    assert len(client.get("/volunteers/export?format=ndjson&name=Volunteer 4").text.splitlines()) == 1
+    assert len(client.get("/volunteers/export?format=ndjson&q=volunteer2").text.splitlines()) == 1
+    assert client.get("/volunteers/export?format=xml").status_code == 400
+
+def test_export_can_be_imported_back():
+    seed(3)
+    exported = client.get("/volunteers/export").text
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(models.JobTitle), [{"id": i, "title": f"Job {i}", "is_active": True} for i in (1, 2)])
+        conn.execute(insert(models.VolunteerStatus), [{"id": 1, "name": "INTERESTED"}])
+    db = TestingSessionLocal()
+    report = bulk_import.import_volunteers(db, io.StringIO(exported), send_welcome_email=False)
+    db.close()
+    assert (report["created"], report["invalid"]) == (3, 0)
+
+def test_export_fetches_in_batches():
+    seed(25)
+    fetches = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM volunteer" in statement:
+            fetches.append((context.execution_options.get("stream_results", False), "LIMIT" in statement))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        chunks = list(bulk_export.export_volunteers(TestingSessionLocal, bulk_export.NDJSON, batch_size=10))
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    # One bounded query per batch, none relying on a server-side cursor
+    assert fetches == [(False, True)] * 3
+    assert [chunk.count(b"\n") for chunk in chunks] == [10, 10, 5]
+    assert [json.loads(line)["id"] for chunk in chunks for line in chunk.splitlines()] == list(range(25, 0, -1))
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_export_batches_continue_past_tied_timestamps(order):
+    # No created_at given: the database stamps every row with the same second
+    with engine.begin() as conn:
+        conn.execute(insert(models.Volunteer), [
+            {"name": f"Volunteer {i}", "email": f"volunteer{i}@example.com", "linkedin": "l", "jobtitle_id": 1}
+            for i in range(1, 8)
+        ])
+    chunks = list(bulk_export.export_volunteers(TestingSessionLocal, bulk_export.NDJSON, batch_size=3, order=order))
+    ids = [json.loads(line)["id"] for chunk in chunks for line in chunk.splitlines()]
+    assert ids == (list(range(1, 8)) if order == "asc" else list(range(7, 0, -1)))
+
+def peak_memory(format):
+    tracemalloc.start()
+    try:
+        for _ in bulk_export.export_volunteers(TestingSessionLocal, format, batch_size=500):
+            pass
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+@pytest.mark.parametrize("format", bulk_export.FORMATS)
+def test_export_memory_stays_flat(format):
+    seed(1000)
+    small = peak_memory(format)
+    seed(9000, first=1001)
+    large = peak_memory(format)
+    print(f"\n{format} export peak memory: 1k volunteers {small / 1024:.0f} KiB, 10k volunteers {large / 1024:.0f} KiB")
+    # Ten times the volunteers, about the same peak: only one batch is ever held
+    assert large < small * 1.5
@@ -0,0 +1,100 @@
+import os
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker, joinedload
+from app.database import Base
+from app import crud, models, schemas
+from tests.benchmark_utils import counting_sqlite_engine, measure
+
+DB_PATH = "./test_volunteer_profile_benchmark.db"
+engine, stats = counting_sqlite_engine(DB_PATH)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+FEEDBACKS, BADGES, CERTIFICATES, HISTORY, VERTICALS, MENTORSHIPS, SQUAD_SIZE = 10, 10, 5, 8, 2, 1, 20
+
+
+# The single-statement loader get_volunteer_by_id used before the selectin split
+def legacy_profile_options():
+    return [
+        joinedload(models.Volunteer.jobtitle),
+        joinedload(models.Volunteer.status),
+        joinedload(models.Volunteer.volunteer_type),
+        joinedload(models.Volunteer.squad),
+        joinedload(models.Volunteer.verticals),
+        joinedload(models.Volunteer.status_history).joinedload(models.VolunteerStatusHistory.status),
+        joinedload(models.Volunteer.feedbacks).joinedload(models.Feedback.author).joinedload(models.User.volunteer),
+        joinedload(models.Volunteer.certificates),
+        joinedload(models.Volunteer.badges).joinedload(models.Badge.issuer).joinedload(models.User.volunteer),
+        joinedload(models.Volunteer.mentees),
+        joinedload(models.Volunteer.mentors)
+    ]
+
+
+@pytest.fixture(scope="module")
+def decorated_volunteer():
+    """Seeds volunteer 1 with every collection its profile shows, at realistic sizes."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conn:
+        conn.execute(insert(models.User), [{"id": i, "email": f"user{i}@example.com", "hashed_password": "x"} for i in (1, 2)])
+        conn.execute(insert(models.JobTitle), [{"id": 1, "title": "Developer", "is_active": True}])
+        conn.execute(insert(models.VolunteerStatus), [{"id": i, "name": f"STATUS_{i}"} for i in range(1, 4)])
+        conn.execute(insert(models.Squad), [{"id": 1, "name": "Alpha"}])
+        conn.execute(insert(models.Project), [{"id": i, "name": f"Project {i}"} for i in (1, 2)])
+        conn.execute(insert(models.project_squad_association), [{"project_id": i, "squad_id": 1} for i in (1, 2)])
+        conn.execute(insert(models.Vertical), [{"id": i, "name": f"Vertical {i}"} for i in range(1, VERTICALS + 1)])
+        conn.execute(insert(models.Volunteer), [
+            {"id": i, "name": f"Volunteer {i}", "email": f"volunteer{i}@example.com", "linkedin": "l",
+             "jobtitle_id": 1, "status_id": 1, "squad_id": 1 if i <= SQUAD_SIZE else None}
+            for i in range(1, SQUAD_SIZE + 2 * MENTORSHIPS + 1)
+        ])
+        conn.execute(insert(models.volunteer_vertical_association), [{"volunteer_id": 1, "vertical_id": i} for i in range(1, VERTICALS + 1)])
+        conn.execute(insert(models.VolunteerStatusHistory), [{"volunteer_id": 1, "status_id": i % 3 + 1} for i in range(HISTORY)])
+        conn.execute(insert(models.Feedback), [{"volunteer_id": 1, "user_id": i % 2 + 1, "content": f"Feedback {i}"} for i in range(FEEDBACKS)])
+        conn.execute(insert(models.Badge), [{"volunteer_id": 1, "issuer_id": i % 2 + 1, "title": f"Badge {i}"} for i in range(BADGES)])
+        conn.execute(insert(models.Certificate), [{"volunteer_id": 1, "issuer_id": 1, "hours": 10} for _ in range(CERTIFICATES)])
+        others = range(SQUAD_SIZE + 1, SQUAD_SIZE + 2 * MENTORSHIPS + 1)
+        conn.execute(insert(models.mentor_mentee_association), [
+            {"mentor_id": 1, "mentee_id": other} if n < MENTORSHIPS else {"mentor_id": other, "mentee_id": 1}
+            for n, other in enumerate(others)
+        ])
+
+    yield
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+    os.remove(DB_PATH)
+
+
+def load_profile(load):
+    db = TestingSessionLocal()
+    try:
+        with measure(stats) as result:
+            # Serializing is part of the request, and any lazy load it triggers counts
+            result["profile"] = schemas.Volunteer.model_validate(load(db), from_attributes=True).model_dump()
+        return result
+    finally:
+        db.close()
+
+
+def test_profile_selectin_fetches_fewer_rows(decorated_volunteer):
+    before = load_profile(
+        lambda db: db.query(models.Volunteer).options(*legacy_profile_options()).filter(models.Volunteer.id == 1).first()
+    )
+    after = load_profile(lambda db: crud.get_volunteer_by_id(db, 1))
+
+    print(
+        f"\nget_volunteer_by_id with {FEEDBACKS} feedbacks, {BADGES} badges, {CERTIFICATES} certificates, {HISTORY} status changes\n"
+        f"  joinedload collections: {before['rows']} rows, {before['queries']} queries, {before['seconds'] * 1000:.1f} ms\n"
+        f"  selectinload collections: {after['rows']} rows, {after['queries']} queries, {after['seconds'] * 1000:.1f} ms"
+    )
+
+    assert after["profile"] == before["profile"]
+    assert len(after["profile"]["feedbacks"]) == FEEDBACKS
+    assert len(after["profile"]["squad"]["volunteers"]) == SQUAD_SIZE
+    # One query per collection, whatever their sizes
+    assert after["queries"] <= 12
+    # The joined statement alone returns FEEDBACKS x BADGES x CERTIFICATES x HISTORY x ... rows
+    assert before["rows"] >= FEEDBACKS * BADGES * CERTIFICATES * HISTORY
+    assert after["rows"] < 100
@@ -0,0 +1,119 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database import Base, get_db
+from app import models
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_volunteer_search_query_count.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function", autouse=True)
+def setup_and_teardown_db(monkeypatch):
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.count += 1
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *args):
+        event.remove(engine, "before_cursor_execute", self)
+
+
+def seed_decorated_volunteers(total):
+    db = TestingSessionLocal()
+    job = models.JobTitle(title="Dev", is_active=True)
+    status = models.VolunteerStatus(name="ACTIVE")
+    vtype = models.VolunteerType(name="Junior")
+    project = models.Project(name="Stars")
+    squad = models.Squad(name="Alpha", projects=[project])
+    vertical = models.Vertical(name="Backend")
+    db.add_all([job, status, vtype, project, squad, vertical])
+    db.commit()
+
+    issuer = models.User(email="issuer@example.com", hashed_password="pw")
+    db.add(issuer)
+    db.add(models.Volunteer(name="Issuer", email="issuer@example.com", linkedin="l", jobtitle_id=job.id))
+    db.commit()
+
+    previous = None
+    for i in range(total):
+        volunteer = models.Volunteer(
+            name=f"Volunteer {i}",
+            email=f"volunteer{i}@example.com",
+            linkedin=f"https://linkedin.com/in/volunteer{i}",
+            jobtitle_id=job.id,
+            status_id=status.id,
+            volunteer_type_id=vtype.id,
+            squad_id=squad.id,
+            verticals=[vertical],
+        )
+        if previous is not None:
+            volunteer.mentors = [previous]
+        db.add(volunteer)
+        db.flush()
+        db.add_all([
+            models.VolunteerStatusHistory(volunteer_id=volunteer.id, status_id=status.id),
+            models.Feedback(content="Great", user_id=issuer.id, volunteer_id=volunteer.id),
+            models.Badge(title="Star", volunteer_id=volunteer.id, issuer_id=issuer.id),
+            models.Certificate(volunteer_id=volunteer.id, hours=10, issuer_id=issuer.id),
+        ])
+        previous = volunteer
+    db.commit()
+    db.close()
+
+
+def count_search_queries(limit):
+    with QueryCounter() as counter:
+        response = client.get(f"/volunteer/search?limit={limit}")
+    assert response.status_code == 200
+    assert len(response.json()) == limit
+    return counter.count, response.json()
+
+
+def test_public_search_query_count_is_constant():
+    seed_decorated_volunteers(20)
+
+    small_count, _ = count_search_queries(2)
+    large_count, data = count_search_queries(20)
+
+    assert small_count == large_count
+    assert large_count <= 12
+
+    volunteer = next(v for v in data if v["name"] == "Volunteer 5")
+    assert volunteer["feedbacks"][0]["author_name"] == "Issuer"
+    assert volunteer["badges"][0]["issuer_name"] == "Issuer"
+    assert len(volunteer["certificates"]) == 1
+    assert volunteer["verticals"][0]["name"] == "Backend"
+    assert volunteer["status_history"][0]["status"]["name"] == "ACTIVE"
+    assert volunteer["mentors"][0]["name"] == "Volunteer 4"
+    assert volunteer["mentees"][0]["name"] == "Volunteer 6"
+    assert volunteer["squad"]["projects"][0]["name"] == "Stars"
+    assert len(volunteer["squad"]["volunteers"]) == 20
@@ -0,0 +1,117 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database import Base, get_db, get_async_db, get_async_engine
+from app import crud, models, schemas, stats
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_volunteer_stats.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+AsyncTestingSessionLocal = async_sessionmaker(get_async_engine(engine.url), expire_on_commit=False)
+
+async def override_get_async_db():
+    async with AsyncTestingSessionLocal() as db:
+        yield db
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function", autouse=True)
+def setup_and_teardown_db(monkeypatch):
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setitem(app.dependency_overrides, get_async_db, override_get_async_db)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def seed_reference_data(db):
+    job = models.JobTitle(title="Dev", is_active=True)
+    interested = models.VolunteerStatus(name="INTERESTED")
+    active = models.VolunteerStatus(name="ACTIVE")
+    junior = models.VolunteerType(name="Junior")
+    senior = models.VolunteerType(name="Senior")
+    alpha = models.Squad(name="Alpha")
+    beta = models.Squad(name="Beta")
+    db.add_all([job, interested, active, junior, senior, alpha, beta])
+    db.commit()
+    return job, interested, active, junior, senior, alpha, beta
+
+def signup(db, job, n):
+    return crud.create_volunteer(db, schemas.VolunteerCreate(
+        name=f"Volunteer {n}", email=f"v{n}@example.com", linkedin="l", jobtitle_id=job.id
+    ), jobtitle_id=job.id)
+
+def dashboard():
+    response = client.get("/dashboard/stats")
+    assert response.status_code == 200
+    data = response.json()
+    return (
+        {item["status"]: item["count"] for item in data["total_volunteers_by_status"]},
+        {item["squad"]: item["count"] for item in data["total_volunteers_by_squad"]},
+        {item["volunteer_type"]: item["count"] for item in data["total_volunteers_by_type"]},
+        data["total_volunteers"],
+    )
+
+def test_counters_follow_volunteer_writes():
+    db = TestingSessionLocal()
+    job, interested, active, junior, senior, alpha, beta = seed_reference_data(db)
+
+    volunteers = [signup(db, job, n) for n in range(3)]
+    assert dashboard() == ({"INTERESTED": 3}, {}, {"Junior": 3}, 3)
+
+    crud.update_volunteer_status(db, volunteers[0].id, active.id)
+    crud.update_volunteer_squad(db, volunteers[0].id, alpha.id)
+    crud.update_volunteer_squad(db, volunteers[1].id, alpha.id)
+    crud.update_volunteer_squad(db, volunteers[2].id, beta.id)
+    crud.update_volunteer_type(db, volunteers[1].id, senior.id)
+    assert dashboard() == (
+        {"INTERESTED": 2, "ACTIVE": 1}, {"Alpha": 2, "Beta": 1}, {"Junior": 2, "Senior": 1}, 3
+    )
+
+    crud.delete_squad(db, alpha.id)
+    assert dashboard() == (
+        {"INTERESTED": 2, "ACTIVE": 1}, {"Beta": 1}, {"Junior": 2, "Senior": 1}, 3
+    )
+    assert stats.get_volunteer_counts(db)[("squad", 0)] == 2
+
+    # The incremental counters match a full recount
+    assert stats.reconcile_volunteer_stats(db) == 0
+    db.close()
+
+def test_reconcile_corrects_drift():
+    db = TestingSessionLocal()
+    job, interested, *_ = seed_reference_data(db)
+    signup(db, job, 1)
+    signup(db, job, 2)
+
+    db.query(models.VolunteerStats).filter(models.VolunteerStats.dimension == stats.TOTAL).update({"count": 40})
+    db.query(models.VolunteerStats).filter(models.VolunteerStats.dimension == "status").delete()
+    db.commit()
+
+    assert stats.reconcile_volunteer_stats(db) == 2
+    assert dashboard() == ({"INTERESTED": 2}, {}, {"Junior": 2}, 2)
+    db.close()
+
+def test_empty_summary_is_built_on_first_read():
+    db = TestingSessionLocal()
+    job, *_ = seed_reference_data(db)
+    signup(db, job, 1)
+    db.query(models.VolunteerStats).delete()
+    db.commit()
+    db.close()
+
+    assert dashboard()[3] == 1
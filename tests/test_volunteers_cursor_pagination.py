@@ -0,0 +1,141 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from datetime import datetime, timedelta, timezone
+from app.main import app
+from app.database import Base, get_db, get_async_db, get_async_engine
+from app.auth import mentor_or_above
+from app import models, schemas
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_volunteers_cursor_pagination.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+AsyncTestingSessionLocal = async_sessionmaker(get_async_engine(engine.url), expire_on_commit=False)
+
+async def override_get_async_db():
+    async with AsyncTestingSessionLocal() as db:
+        yield db
+
+def override_mentor_or_above():
+    return schemas.User(id=1, email="mentor@example.com", is_active=True, items=[])
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function", autouse=True)
+def setup_and_teardown_db(monkeypatch):
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setitem(app.dependency_overrides, get_async_db, override_get_async_db)
+    monkeypatch.setitem(app.dependency_overrides, mentor_or_above, override_mentor_or_above)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def seed_volunteers():
+    db = TestingSessionLocal()
+    job = models.JobTitle(title="Developer", is_active=True)
+    squad = models.Squad(name="Alpha")
+    db.add_all([job, squad])
+    db.commit()
+
+    # Pairs of volunteers share the same created_at so the id tie-breaker matters
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(11):
+        db.add(models.Volunteer(
+            name=f"Volunteer {i}",
+            email=f"volunteer{i}@example.com",
+            linkedin=f"https://linkedin.com/in/volunteer{i}",
+            jobtitle_id=job.id,
+            squad_id=squad.id if i % 2 == 0 else None,
+            created_at=base + timedelta(minutes=i // 2),
+        ))
+    db.commit()
+    squad_id = squad.id
+    db.close()
+    return squad_id
+
+def walk_pages(query):
+    names, cursor, pages = [], None, 0
+    while True:
+        url = f"/volunteers/?{query}" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(url)
+        assert response.status_code == 200
+        names.extend(v["name"] for v in response.json())
+        pages += 1
+        # A cursor that does not move past its own row would page forever
+        assert pages <= 20
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return names, pages
+
+def test_cursor_walks_every_volunteer_once_desc():
+    seed_volunteers()
+    names, pages = walk_pages("limit=3")
+    assert names == [f"Volunteer {i}" for i in reversed(range(11))]
+    assert pages == 4
+
+def test_cursor_walks_every_volunteer_once_asc():
+    seed_volunteers()
+    names, _ = walk_pages("limit=4&order=asc")
+    assert names == [f"Volunteer {i}" for i in range(11)]
+
+def test_cursor_respects_filters():
+    squad_id = seed_volunteers()
+    names, _ = walk_pages(f"limit=2&squad_id={squad_id}&order=asc")
+    assert names == [f"Volunteer {i}" for i in range(0, 11, 2)]
+
+def test_cursor_is_stable_under_concurrent_inserts():
+    seed_volunteers()
+    first = client.get("/volunteers/?limit=3")
+    cursor = first.headers["X-Next-Cursor"]
+
+    # A newer signup must not shift the rows of the following page
+    db = TestingSessionLocal()
+    db.add(models.Volunteer(
+        name="Newcomer", email="new@example.com", linkedin="l",
+        jobtitle_id=1, created_at=datetime(2026, 2, 1, tzinfo=timezone.utc),
+    ))
+    db.commit()
+    db.close()
+
+    second = client.get(f"/volunteers/?limit=3&cursor={cursor}")
+    assert [v["name"] for v in second.json()] == ["Volunteer 7", "Volunteer 6", "Volunteer 5"]
+
+def test_invalid_cursor_returns_400():
+    response = client.get("/volunteers/?cursor=not-a-cursor")
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+def test_cursor_walks_server_default_timestamps_in_the_same_second():
+    # Without an explicit created_at the database stamps the rows itself, at second
+    # precision on SQLite, so every one of them ties with the cursor's timestamp
+    db = TestingSessionLocal()
+    job = models.JobTitle(title="Developer", is_active=True)
+    db.add(job)
+    db.commit()
+    db.execute(insert(models.Volunteer), [
+        {"name": f"Volunteer {i}", "email": f"volunteer{i}@example.com", "linkedin": "l", "jobtitle_id": job.id}
+        for i in range(7)
+    ])
+    db.commit()
+    db.close()
+
+    names, pages = walk_pages("limit=2&order=asc")
+    assert names == [f"Volunteer {i}" for i in range(7)]
+    assert pages == 4
+    names, pages = walk_pages("limit=3")
+    assert names == [f"Volunteer {i}" for i in reversed(range(7))]
+    assert pages == 3
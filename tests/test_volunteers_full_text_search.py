@@ -0,0 +1,101 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database import Base, get_db, get_async_db, get_async_engine
+from app.auth import mentor_or_above
+from app import models, schemas
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_volunteers_full_text_search.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+AsyncTestingSessionLocal = async_sessionmaker(get_async_engine(engine.url), expire_on_commit=False)
+
+async def override_get_async_db():
+    async with AsyncTestingSessionLocal() as db:
+        yield db
+
+def override_mentor_or_above():
+    return schemas.User(id=1, email="mentor@example.com", is_active=True, items=[])
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function", autouse=True)
+def setup_and_teardown_db(monkeypatch):
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setitem(app.dependency_overrides, get_async_db, override_get_async_db)
+    monkeypatch.setitem(app.dependency_overrides, mentor_or_above, override_mentor_or_above)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    seed_volunteers()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def seed_volunteers():
+    db = TestingSessionLocal()
+    job = models.JobTitle(title="Dev", is_active=True)
+    db.add(job)
+    db.commit()
+    for name, email in [
+        ("Ana Lima", "lima@example.com"),
+        ("Ana Souza", "ana.souza@example.com"),
+        ("Mariana Costa", "mariana@example.com"),
+        ("Carlos Silva", "carlos@soujunior.tech"),
+    ]:
+        db.add(models.Volunteer(name=name, email=email, linkedin="l", jobtitle_id=job.id))
+    db.commit()
+    db.close()
+
+def names(response):
+    assert response.status_code == 200
+    return [v["name"] for v in response.json()]
+
+def test_search_matches_word_prefixes_in_name_and_email():
+    assert names(client.get("/volunteers/?q=sou")) == ["Ana Souza", "Carlos Silva"]
+    assert names(client.get("/volunteers/?q=mari")) == ["Mariana Costa"]
+    assert names(client.get("/volunteers/?q=ana sou")) == ["Ana Souza"]
+
+def test_search_orders_by_relevance():
+    # "Ana Souza" matches in both name and email, "Ana Lima" only in name,
+    # and "Mariana" does not start with "ana"
+    assert names(client.get("/volunteers/?q=ana")) == ["Ana Souza", "Ana Lima"]
+
+def test_search_on_public_endpoint():
+    assert names(client.get("/volunteer/search?q=carl")) == ["Carlos Silva"]
+
+def test_search_index_follows_updates_and_deletes():
+    db = TestingSessionLocal()
+    volunteer = db.query(models.Volunteer).filter(models.Volunteer.name == "Carlos Silva").first()
+    volunteer.name = "Roberto Silva"
+    db.commit()
+    db.close()
+
+    assert names(client.get("/volunteers/?q=carl")) == ["Roberto Silva"]  # email still matches
+    assert names(client.get("/volunteers/?q=rob")) == ["Roberto Silva"]
+
+    db = TestingSessionLocal()
+    db.query(models.Volunteer).filter(models.Volunteer.name == "Roberto Silva").delete()
+    db.commit()
+    db.close()
+
+    assert names(client.get("/volunteers/?q=rob")) == []
+
+def test_search_combines_with_filters():
+    assert names(client.get("/volunteers/?q=ana&email=lima")) == ["Ana Lima"]
+
+def test_search_rejects_cursor():
+    response = client.get("/volunteers/?q=ana&cursor=abc")
+    assert response.status_code == 400
@@ -0,0 +1,103 @@
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker, joinedload
+from app.database import Base
+from app import crud, models
+from tests.benchmark_utils import counting_sqlite_engine, measure
+
+# A few hundred volunteers keep the default run fast; set STARS_BENCH_VOLUNTEERS=50000 to benchmark at scale
+VOLUNTEERS = int(os.getenv("STARS_BENCH_VOLUNTEERS", "400"))
+PAGE_SIZE = 100
+
+DB_PATH = "./test_volunteers_list_benchmark.db"
+engine, stats = counting_sqlite_engine(DB_PATH)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+# The loader strategy get_volunteers used before collections moved to selectinload
+def legacy_list_options():
+    return [
+        joinedload(models.Volunteer.jobtitle),
+        joinedload(models.Volunteer.status),
+        joinedload(models.Volunteer.volunteer_type),
+        joinedload(models.Volunteer.squad),
+        joinedload(models.Volunteer.verticals),
+        joinedload(models.Volunteer.status_history).joinedload(models.VolunteerStatusHistory.status)
+    ]
+
+
+@pytest.fixture(scope="module")
+def seeded_volunteers():
+    """Seeds VOLUNTEERS volunteers with 0-4 verticals and 1-6 status changes each."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    with engine.begin() as conn:
+        conn.execute(insert(models.JobTitle), [{"id": i, "title": f"Job {i}", "is_active": True} for i in range(1, 11)])
+        conn.execute(insert(models.VolunteerStatus), [{"id": i, "name": f"STATUS_{i}"} for i in range(1, 7)])
+        conn.execute(insert(models.VolunteerType), [{"id": i, "name": f"Type {i}"} for i in range(1, 4)])
+        conn.execute(insert(models.Squad), [{"id": i, "name": f"Squad {i}"} for i in range(1, 21)])
+        conn.execute(insert(models.Vertical), [{"id": i, "name": f"Vertical {i}"} for i in range(1, 9)])
+
+        volunteers, verticals, history = [], [], []
+        for volunteer_id in range(1, VOLUNTEERS + 1):
+            volunteers.append({
+                "id": volunteer_id,
+                "name": f"Volunteer {volunteer_id}",
+                "email": f"volunteer{volunteer_id}@example.com",
+                "linkedin": f"https://linkedin.com/in/volunteer{volunteer_id}",
+                "jobtitle_id": rng.randint(1, 10),
+                "status_id": rng.randint(1, 6),
+                "volunteer_type_id": rng.randint(1, 3),
+                "squad_id": rng.choice([None, rng.randint(1, 20)]),
+                "created_at": base + timedelta(seconds=volunteer_id),
+            })
+            for vertical_id in rng.sample(range(1, 9), rng.randint(0, 4)):
+                verticals.append({"volunteer_id": volunteer_id, "vertical_id": vertical_id})
+            for _ in range(rng.randint(1, 6)):
+                history.append({"volunteer_id": volunteer_id, "status_id": rng.randint(1, 6)})
+        conn.execute(insert(models.Volunteer), volunteers)
+        conn.execute(insert(models.volunteer_vertical_association), verticals)
+        conn.execute(insert(models.VolunteerStatusHistory), history)
+
+    yield
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+    os.remove(DB_PATH)
+
+
+def run_page(loader_options, skip):
+    db = TestingSessionLocal()
+    try:
+        with measure(stats) as result:
+            volunteers = crud.get_volunteers(db, skip=skip, limit=PAGE_SIZE, loader_options=loader_options)
+            # Touch the collections the list endpoint serializes
+            for volunteer in volunteers:
+                len(volunteer.verticals)
+                len(volunteer.status_history)
+        result["volunteers"] = len(volunteers)
+        return result
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("skip", [0, VOLUNTEERS // 2])
+def test_list_page_selectin_fetches_fewer_rows(seeded_volunteers, skip):
+    before = run_page(legacy_list_options(), skip)
+    after = run_page(crud.volunteer_list_options(), skip)
+
+    print(
+        f"\nget_volunteers over {VOLUNTEERS} volunteers, skip={skip}, limit={PAGE_SIZE}\n"
+        f"  joinedload collections: {before['rows']} rows, {before['queries']} queries, {before['seconds'] * 1000:.1f} ms\n"
+        f"  selectinload collections: {after['rows']} rows, {after['queries']} queries, {after['seconds'] * 1000:.1f} ms"
+    )
+
+    assert before["volunteers"] == after["volunteers"] == PAGE_SIZE
+    assert after["queries"] == 3
+    assert after["rows"] < before["rows"]
@@ -0,0 +1,92 @@
+import re
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app import cache, crud, models, schemas
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_well_known_ids.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+LOOKUP_QUERY = re.compile(r"FROM (volunteer_status|volunteer_type)\b(?!_)")
+
+@pytest.fixture(scope="function", autouse=True)
+def setup_and_teardown_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    db.add_all([
+        models.JobTitle(title="Developer", is_active=True),
+        models.VolunteerStatus(name="INTERESTED"),
+        models.VolunteerStatus(name="ACTIVE"),
+        models.VolunteerType(name="Junior"),
+        models.Vertical(name="Backend"),
+    ])
+    db.commit()
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def lookup_queries():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if LOOKUP_QUERY.search(statement):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+def signup(db, i):
+    volunteer = schemas.VolunteerCreate(
+        name=f"Volunteer {i}", email=f"volunteer{i}@example.com",
+        linkedin=f"https://linkedin.com/in/volunteer{i}", jobtitle_id=1,
+    )
+    return crud.create_volunteer(db, volunteer, jobtitle_id=1)
+
+def test_signups_and_status_changes_reuse_the_registry(lookup_queries):
+    db = TestingSessionLocal()
+    first = signup(db, 1)
+    loaded = len(lookup_queries)
+    assert first.status.name == "INTERESTED"
+    assert first.volunteer_type.name == "Junior"
+
+    lookup_queries.clear()
+    second = signup(db, 2)
+    crud.update_volunteer_status(db, second.id, cache.well_known_ids.status_id(db, "ACTIVE"))
+    assert second.discord_invite_sent is True
+    db.close()
+
+    # One query per table on first use, none afterwards
+    assert loaded == 2
+    assert lookup_queries == []
+
+def test_verticals_filter_active_volunteers_by_id(lookup_queries):
+    db = TestingSessionLocal()
+    volunteer = signup(db, 1)
+    crud.update_volunteer_verticals(db, volunteer.id, [1])
+    assert crud.get_verticals(db)[0].active_volunteers_count == 0
+
+    active_id = cache.well_known_ids.status_id(db, "ACTIVE")
+    crud.update_volunteer_status(db, volunteer.id, active_id)
+    lookup_queries.clear()
+    verticals = crud.get_verticals(db)
+    db.close()
+
+    assert verticals[0].active_volunteers_count == 1
+    assert lookup_queries == []
+
+def test_new_status_refreshes_the_registry():
+    db = TestingSessionLocal()
+    assert cache.well_known_ids.status_id(db, "ARCHIVED") is None
+
+    created = crud.create_volunteer_status(db, schemas.VolunteerStatusCreate(name="ARCHIVED"))
+    assert cache.well_known_ids.status_id(db, "ARCHIVED") == created.id
+    db.close()